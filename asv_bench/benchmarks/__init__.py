@@ -0,0 +1,62 @@
+"""
+Benchmarks for xugrid, run with airspeed velocity (asv).
+
+The meshes are generated with :func:`xugrid.data.synthetic.generate_disk`
+(triangles) and :meth:`xugrid.Ugrid2d.from_structured_bounds` (quadrilaterals)
+at several sizes. Generating the largest meshes takes a while, so the arrays
+are cached per process.
+"""
+import functools
+
+import numpy as np
+import xarray as xr
+
+import xugrid
+from xugrid.data.synthetic import generate_disk
+
+# Approximate number of faces of the benchmark meshes.
+SIZES = [10_000, 100_000, 1_000_000]
+KINDS = ["disk", "structured"]
+
+
+@functools.lru_cache(maxsize=None)
+def mesh_arrays(kind: str, n_face: int):
+    """
+    Return node_x, node_y, and face_node_connectivity of a mesh with
+    approximately n_face faces.
+    """
+    if kind == "disk":
+        # generate_disk creates partitions * depth**2 triangles.
+        depth = max(1, round(np.sqrt(n_face / 6)))
+        vertices, triangles = generate_disk(6, depth)
+        return vertices[:, 0], vertices[:, 1], triangles
+    elif kind == "structured":
+        n = max(1, round(np.sqrt(n_face)))
+        bounds = np.column_stack([np.arange(n), np.arange(1, n + 1)]) / n
+        grid = xugrid.Ugrid2d.from_structured_bounds(bounds, bounds)
+        return grid.node_x, grid.node_y, grid.face_node_connectivity
+    else:
+        raise ValueError(f"Unknown mesh kind: {kind}")
+
+
+def mesh(kind: str, n_face: int) -> xugrid.Ugrid2d:
+    """A new Ugrid2d instance, without any derived properties computed yet."""
+    node_x, node_y, faces = mesh_arrays(kind, n_face)
+    return xugrid.Ugrid2d(node_x, node_y, -1, faces)
+
+
+def face_data(grid: xugrid.Ugrid2d) -> xugrid.UgridDataArray:
+    """A smooth field on the faces of the grid."""
+    x, y = grid.centroids.T
+    values = np.sin(2 * np.pi * x) * np.cos(2 * np.pi * y)
+    return xugrid.UgridDataArray(
+        xr.DataArray(values, dims=[grid.face_dimension], name="z"), grid
+    )
+
+
+def requires(module: str):
+    """Skip the benchmark if an optional dependency is missing."""
+    try:
+        __import__(module)
+    except ImportError:
+        raise NotImplementedError(f"{module} is not installed")
@@ -0,0 +1,41 @@
+import numpy as np
+
+import xugrid
+
+from . import SIZES, mesh, requires
+
+
+def parcels(n: int):
+    """A GeoDataFrame with n * n square polygons covering the unit square."""
+    import geopandas as gpd
+    import shapely
+
+    x = np.arange(n) / n
+    xmin, ymin = (a.ravel() for a in np.meshgrid(x, x))
+    polygons = shapely.box(xmin, ymin, xmin + 1.0 / n, ymin + 1.0 / n)
+    values = np.arange(n * n, dtype=float)
+    return gpd.GeoDataFrame({"values": values}, geometry=polygons)
+
+
+class Burn:
+    params = [SIZES, [1_000, 100_000]]
+    param_names = ["n_face", "n_polygon"]
+
+    def setup(self, n_face, n_polygon):
+        requires("geopandas")
+        requires("mapbox_earcut")
+        self.grid = mesh("structured", n_face)
+        self.grid.celltree
+        self.grid.centroids
+        self.gdf = parcels(round(np.sqrt(n_polygon)))
+
+    def time_burn_polygons(self, n_face, n_polygon):
+        xugrid.burn_vector_geometry(self.gdf, self.grid, column="values")
+
+    def time_burn_polygons_all_touched(self, n_face, n_polygon):
+        xugrid.burn_vector_geometry(
+            self.gdf, self.grid, column="values", all_touched=True
+        )
+
+    def time_polygon_coverage(self, n_face, n_polygon):
+        xugrid.polygon_coverage(self.gdf, self.grid, column="values")
@@ -0,0 +1,35 @@
+import numpy as np
+
+from . import SIZES, face_data, mesh
+
+
+class LaplaceInterpolate:
+    params = [SIZES, [0.5, 0.9], ["ilu", "amg"]]
+    param_names = ["n_face", "missing_fraction", "solver"]
+
+    def setup(self, n_face, missing_fraction, solver):
+        uda = face_data(mesh("disk", n_face))
+        rng = np.random.default_rng(0)
+        missing = rng.random(uda.size) < missing_fraction
+        self.uda = uda.where(~missing)
+        self.uda.ugrid.grid.face_face_connectivity
+
+    def time_laplace_interpolate(self, n_face, missing_fraction, solver):
+        self.uda.ugrid.laplace_interpolate(solver=solver)
+
+
+class LaplaceInterpolateBatch:
+    # Twelve time steps sharing the same nodata faces.
+    params = [SIZES[:2]]
+    param_names = ["n_face"]
+
+    def setup(self, n_face):
+        uda = face_data(mesh("disk", n_face))
+        rng = np.random.default_rng(0)
+        missing = rng.random(uda.size) < 0.5
+        uda = uda.where(~missing)
+        self.uda = uda.expand_dims(time=12) * np.arange(1.0, 13.0)[:, np.newaxis]
+        self.uda.ugrid.grid.face_face_connectivity
+
+    def time_laplace_interpolate_batch(self, n_face):
+        self.uda.ugrid.laplace_interpolate(solver="amg")
@@ -0,0 +1,34 @@
+import xugrid
+
+from . import SIZES, face_data, mesh, requires
+
+
+class MergePartitions:
+    params = [SIZES, [4, 16]]
+    param_names = ["n_face", "n_part"]
+
+    def setup(self, n_face, n_part):
+        self.uda = face_data(mesh("disk", n_face))
+        self.labels = self.uda.ugrid.grid.label_partitions(n_part, method="rcb")
+        self.partitions = self.uda.ugrid.partition_by_label(self.labels)
+
+    def time_partition_by_label(self, n_face, n_part):
+        self.uda.ugrid.partition_by_label(self.labels)
+
+    def time_merge_partitions(self, n_face, n_part):
+        xugrid.merge_partitions(self.partitions)
+
+
+class LabelPartitions:
+    params = [SIZES, [4, 16], ["metis", "hilbert", "morton", "rcb"]]
+    param_names = ["n_face", "n_part", "method"]
+
+    def setup(self, n_face, n_part, method):
+        if method == "metis":
+            requires("pymetis")
+        self.grid = mesh("disk", n_face)
+        self.grid.face_face_connectivity
+        self.grid.centroids
+
+    def time_label_partitions(self, n_face, n_part, method):
+        self.grid.label_partitions(n_part, method=method)
@@ -0,0 +1,25 @@
+from . import SIZES, face_data, mesh, requires
+
+
+class Plot:
+    params = [SIZES]
+    param_names = ["n_face"]
+
+    def setup(self, n_face):
+        requires("matplotlib")
+        import matplotlib
+
+        matplotlib.use("Agg")
+        self.uda = face_data(mesh("disk", n_face))
+        self.uda.ugrid.grid.triangulation
+
+    def teardown(self, n_face):
+        import matplotlib.pyplot as plt
+
+        plt.close("all")
+
+    def time_plot_faces(self, n_face):
+        self.uda.ugrid.plot()
+
+    def time_plot_edges(self, n_face):
+        self.uda.ugrid.grid.plot()
@@ -0,0 +1,51 @@
+import numpy as np
+
+import xugrid
+
+from . import SIZES, face_data, mesh
+
+
+class OverlapRegrid:
+    params = [SIZES, ["mean", "max_overlap"]]
+    param_names = ["n_face", "method"]
+
+    def setup(self, n_face, method):
+        # Regrid from a triangular to a structured mesh of similar size.
+        self.source = face_data(mesh("disk", n_face))
+        self.source.ugrid.grid.celltree
+        self.target = mesh("structured", n_face)
+        self.regridder = xugrid.OverlapRegridder(
+            self.source, self.target, method=method
+        )
+        self.layered = self.source.expand_dims(layer=np.arange(10))
+        self.values = self.source.to_numpy()
+        self.out = np.empty(self.target.n_face)
+
+    def time_weights(self, n_face, method):
+        xugrid.OverlapRegridder(self.source, self.target, method=method)
+
+    def time_regrid(self, n_face, method):
+        self.regridder.regrid(self.source)
+
+    def time_regrid_layered(self, n_face, method):
+        self.regridder.regrid(self.layered)
+
+    def time_regrid_into(self, n_face, method):
+        self.regridder.regrid_into(self.values, out=self.out)
+
+
+class BarycentricInterpolate:
+    params = [SIZES]
+    param_names = ["n_face"]
+
+    def setup(self, n_face):
+        self.source = face_data(mesh("disk", n_face))
+        self.source.ugrid.grid.celltree
+        self.target = mesh("structured", n_face)
+        self.regridder = xugrid.BarycentricInterpolator(self.source, self.target)
+
+    def time_weights(self, n_face):
+        xugrid.BarycentricInterpolator(self.source, self.target)
+
+    def time_regrid(self, n_face):
+        self.regridder.regrid(self.source)
@@ -0,0 +1,98 @@
+import numpy as np
+import xarray as xr
+
+import xugrid
+from xugrid.ugrid import connectivity
+
+from . import KINDS, SIZES, mesh, mesh_arrays
+
+
+class Topology:
+    params = [KINDS, SIZES]
+    param_names = ["kind", "n_face"]
+
+    def setup(self, kind, n_face):
+        self.node_x, self.node_y, self.faces = mesh_arrays(kind, n_face)
+        self.grid = mesh(kind, n_face)
+        # Compute the derived properties used by the queries.
+        self.grid.celltree
+        self.grid.edge_node_connectivity
+        self.subset = np.arange(0, self.grid.n_face, 2)
+        self.grid.face_face_connectivity
+        self.seeds = np.zeros(self.grid.n_face, dtype=bool)
+        self.seeds[:: max(1, self.grid.n_face // 100)] = True
+        rng = np.random.default_rng(0)
+        xmin, ymin, xmax, ymax = self.grid.bounds
+        self.points = np.column_stack(
+            [rng.uniform(xmin, xmax, 100_000), rng.uniform(ymin, ymax, 100_000)]
+        )
+        self.raster_x = np.linspace(xmin, xmax, 1000)
+        self.raster_y = np.linspace(ymax, ymin, 1000)
+        self.uda = xugrid.UgridDataArray(
+            xr.DataArray(np.ones(self.grid.n_face), dims=[self.grid.face_dimension]),
+            self.grid,
+        )
+        self.like = xr.DataArray(
+            np.empty((1000, 1000)),
+            coords={"y": self.raster_y, "x": self.raster_x},
+            dims=("y", "x"),
+        )
+
+    def time_init(self, kind, n_face):
+        xugrid.Ugrid2d(self.node_x, self.node_y, -1, self.faces)
+
+    def time_edge_connectivity(self, kind, n_face):
+        connectivity.edge_connectivity(self.faces, -1)
+
+    def time_centroids(self, kind, n_face):
+        connectivity.centroids(self.faces, -1, self.node_x, self.node_y)
+
+    def time_area(self, kind, n_face):
+        connectivity.area(self.faces, -1, self.node_x, self.node_y)
+
+    def time_celltree(self, kind, n_face):
+        mesh(kind, n_face).celltree
+
+    def time_build_celltree(self, kind, n_face):
+        mesh(kind, n_face).build_celltree()
+
+    def time_locate_points(self, kind, n_face):
+        self.grid.locate_points(self.points)
+
+    def time_rasterize_like(self, kind, n_face):
+        self.grid.rasterize_like(self.raster_x, self.raster_y)
+
+    def time_rasterize_tiled(self, kind, n_face):
+        self.uda.ugrid.rasterize_like(self.like, tile_size=250).compute()
+
+    def time_topology_subset(self, kind, n_face):
+        self.grid.topology_subset(self.subset)
+
+    def time_binary_dilation(self, kind, n_face):
+        connectivity.binary_dilation(
+            self.grid.face_face_connectivity, self.seeds, iterations=100
+        )
+
+    def peakmem_init(self, kind, n_face):
+        xugrid.Ugrid2d(self.node_x, self.node_y, -1, self.faces)
+
+
+class StructuredTopology:
+    params = [SIZES]
+    param_names = ["n_face"]
+
+    def setup(self, n_face):
+        n = max(1, round(np.sqrt(n_face)))
+        self.bounds = np.column_stack([np.arange(n), np.arange(1, n + 1)]) / n
+        self.grid = xugrid.Ugrid2d.from_structured_bounds(self.bounds, self.bounds)
+        rng = np.random.default_rng(0)
+        self.points = rng.uniform(0.0, 1.0, (100_000, 2))
+
+    def time_from_structured_bounds(self, n_face):
+        xugrid.Ugrid2d.from_structured_bounds(self.bounds, self.bounds)
+
+    def time_locate_points(self, n_face):
+        self.grid.locate_points(self.points)
+
+    def peakmem_from_structured_bounds(self, n_face):
+        xugrid.Ugrid2d.from_structured_bounds(self.bounds, self.bounds).centroids
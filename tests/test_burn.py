@@ -172,6 +172,59 @@ def test_burn_polygons(grid, polygons_and_values):
     assert np.allclose(output, expected)
 
 
+def test_triangulate_polygons():
+    polygons = gpd.GeoSeries(
+        [
+            shapely.box(0.0, 0.0, 1.0, 1.0),
+            shapely.Polygon(),
+            shapely.Polygon(
+                shell=[(0.0, 0.0), (3.0, 0.0), (3.0, 3.0), (0.0, 3.0)],
+                holes=[[(1.0, 1.0), (2.0, 1.0), (2.0, 2.0), (1.0, 2.0)]],
+            ),
+        ]
+    )
+    vertices, triangles, polygon_index = burn._triangulate_polygons(polygons)
+    assert vertices.shape == (15, 2)
+    assert triangles.shape == (10, 3)
+    assert np.array_equal(polygon_index, [0, 0] + [2] * 8)
+    # The triangles of the polygon with a hole refer to its own vertices.
+    assert (triangles[2:] >= 5).all()
+    area = shapely.area(shapely.polygons(vertices[triangles]))
+    assert np.isclose(area[:2].sum(), 1.0)
+    assert np.isclose(area[2:].sum(), 8.0)
+
+    vertices, triangles, polygon_index = burn._triangulate_polygons(
+        gpd.GeoSeries([shapely.Polygon()])
+    )
+    assert triangles.shape == (0, 3)
+    assert polygon_index.shape == (0,)
+
+
+@pytest.mark.parametrize("all_touched", [False, True])
+def test_burn_polygons_overlap(grid, all_touched):
+    # The last polygon takes precedence where polygons overlap.
+    polygons = gpd.GeoSeries(
+        [
+            shapely.box(0.0, 0.0, 3.0, 3.0),
+            shapely.box(0.1, 0.1, 1.9, 1.9),
+            shapely.Polygon(
+                shell=[(0.0, 0.0), (3.0, 0.0), (3.0, 3.0), (0.0, 3.0)],
+                holes=[[(0.9, 0.9), (2.1, 0.9), (2.1, 2.1), (0.9, 2.1)]],
+            ),
+        ]
+    )
+    values = np.array([1.0, 2.0, 3.0])
+    output = np.full(grid.n_face, np.nan)
+    burn._burn_polygons(polygons, grid, values, all_touched=all_touched, output=output)
+
+    expected = np.full(grid.n_face, np.nan)
+    for polygon, value in zip(polygons, values):
+        exterior = shapely.get_coordinates(polygon.exterior)
+        interiors = [shapely.get_coordinates(ring) for ring in polygon.interiors]
+        expected[burn._locate_polygon(grid, exterior, interiors, all_touched)] = value
+    assert np.array_equal(output, expected, equal_nan=True)
+
+
 def test_burn_points(grid, points_and_values):
     points, values = points_and_values
     output = np.full(grid.n_face, -1.0)
@@ -244,3 +297,47 @@ def test_burn_vector_geometry(
     # All touched should give the same answer for this specific example.
     actual = xu.burn_vector_geometry(gdf, grid, column="values", all_touched=True)
     assert np.allclose(actual.to_numpy(), expected)
+
+
+def test_polygon_coverage(grid):
+    polygons = gpd.GeoSeries(
+        [
+            shapely.box(0.0, 0.0, 1.5, 1.5),
+            # Clockwise, with a hole.
+            shapely.Polygon(
+                shell=[(1.5, 1.5), (1.5, 3.0), (3.0, 3.0), (3.0, 1.5)],
+                holes=[[(2.25, 2.25), (2.75, 2.25), (2.75, 2.75), (2.25, 2.75)]],
+            ),
+        ]
+    )
+    gdf = gpd.GeoDataFrame({"values": [1.0, 3.0]}, geometry=polygons)
+
+    actual = xu.polygon_coverage(gdf, grid)
+    assert isinstance(actual, xu.UgridDataArray)
+    assert actual.name == "coverage"
+    expected = np.array([1.0, 0.5, 0.0, 0.5, 0.5, 0.5, 0.0, 0.5, 0.75])
+    assert np.allclose(actual.to_numpy(), expected)
+
+    # Compare with shapely.
+    faces = grid.to_shapely(grid.face_dimension)
+    expected = np.zeros(grid.n_face)
+    for polygon in polygons:
+        expected += shapely.area(shapely.intersection(faces, polygon))
+    assert np.allclose(actual.to_numpy(), expected / grid.area)
+
+    actual = xu.polygon_coverage(gdf, grid, column="values")
+    expected = np.array([1.0, 1.0, np.nan, 1.0, 2.0, 3.0, np.nan, 3.0, 3.0])
+    assert np.allclose(actual.to_numpy(), expected, equal_nan=True)
+    actual = xu.polygon_coverage(gdf, grid, column="values", fill=-1.0)
+    assert (actual.to_numpy()[[2, 6]] == -1.0).all()
+
+
+def test_polygon_coverage_errors(grid, points_and_values):
+    points, values = points_and_values
+    with pytest.raises(TypeError, match="gdf must be GeoDataFrame"):
+        xu.polygon_coverage(points, grid)
+    gdf = gpd.GeoDataFrame({"values": values}, geometry=points)
+    with pytest.raises(TypeError, match="Like must be Ugrid2d"):
+        xu.polygon_coverage(gdf, gdf)
+    with pytest.raises(TypeError, match="Can only compute"):
+        xu.polygon_coverage(gdf, grid)
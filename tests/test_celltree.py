@@ -0,0 +1,151 @@
+import numba_celltree
+import numpy as np
+import pytest
+
+import xugrid
+from xugrid.ugrid.celltree import (
+    PartitionedCellTree,
+    load_celltree,
+    save_celltree,
+)
+from xugrid.ugrid.partitioning import labels_to_indices, rcb_labels
+
+
+@pytest.fixture(scope="function")
+def grid():
+    return xugrid.data.disk().ugrid.grid
+
+
+@pytest.fixture(scope="function")
+def partitioned(grid):
+    indices = labels_to_indices(rcb_labels(grid.centroids, 5))
+    return PartitionedCellTree(
+        grid.node_coordinates, grid.face_node_connectivity, grid.fill_value, indices
+    )
+
+
+def test_partitioned_init_errors(grid):
+    with pytest.raises(ValueError, match="exactly one partition"):
+        PartitionedCellTree(
+            grid.node_coordinates,
+            grid.face_node_connectivity,
+            grid.fill_value,
+            [np.arange(10)],
+        )
+
+
+def test_partitioned_locate_points(grid, partitioned):
+    assert partitioned.n_partition == 5
+    points = np.concatenate([grid.centroids, [[1000.0, 1000.0]]])
+    actual = partitioned.locate_points(points)
+    assert np.array_equal(actual[:-1], np.arange(grid.n_face))
+    assert actual[-1] == -1
+
+
+def test_partitioned_barycentric_weights(grid, partitioned):
+    points = np.concatenate([grid.centroids, [[1000.0, 1000.0]]])
+    expected_index, expected_weights = grid.celltree.compute_barycentric_weights(points)
+    actual_index, actual_weights = partitioned.compute_barycentric_weights(points)
+    assert np.array_equal(actual_index, expected_index)
+    assert np.allclose(actual_weights, expected_weights)
+
+
+def test_partitioned_intersect_edges(grid, partitioned):
+    edges = np.array(
+        [
+            [[-5.0, -5.0], [5.0, 5.0]],
+            [[-5.0, 5.0], [5.0, -5.0]],
+        ]
+    )
+    expected = grid.celltree.intersect_edges(edges)
+    actual = partitioned.intersect_edges(edges)
+    order_expected = np.lexsort((expected[1], expected[0]))
+    order_actual = np.lexsort((actual[1], actual[0]))
+    for a, b in zip(actual, expected):
+        assert np.allclose(a[order_actual], b[order_expected])
+
+
+def test_partitioned_intersect_faces(grid, partitioned):
+    other = xugrid.Ugrid2d.from_structured_bounds(
+        np.column_stack([np.arange(-5.0, 5.0), np.arange(-4.0, 6.0)]),
+        np.column_stack([np.arange(-5.0, 5.0), np.arange(-4.0, 6.0)]),
+    )
+    args = (other.node_coordinates, other.face_node_connectivity, other.fill_value)
+    expected = grid.celltree.intersect_faces(*args)
+    actual = partitioned.intersect_faces(*args)
+    # Sorted by the first index.
+    assert (np.diff(actual[0]) >= 0).all()
+    order_expected = np.lexsort((expected[1], expected[0]))
+    order_actual = np.lexsort((actual[1], actual[0]))
+    for a, b in zip(actual, expected):
+        assert np.allclose(a[order_actual], b[order_expected])
+
+    i, j = partitioned._locate_faces(*args[:2])
+    assert (np.diff(i) >= 0).all()
+    assert np.isin(j, expected[1]).all()
+
+    boxes = np.array([[-1.0, 1.0, -1.0, 1.0]])
+    expected = grid.celltree.locate_boxes(boxes)
+    actual = partitioned.locate_boxes(boxes)
+    assert np.array_equal(np.sort(actual[1]), np.sort(expected[1]))
+    expected_area = grid.celltree.intersect_boxes(boxes)[2].sum()
+    assert np.isclose(partitioned.intersect_boxes(boxes)[2].sum(), expected_area)
+
+
+def test_save_load_celltree(tmp_path, grid, partitioned):
+    path = tmp_path / "tree.npz"
+    save_celltree(grid.celltree, path)
+    tree = load_celltree(path)
+    assert isinstance(tree, numba_celltree.CellTree2d)
+    assert np.array_equal(
+        tree.locate_points(grid.centroids), grid.celltree.locate_points(grid.centroids)
+    )
+
+    save_celltree(partitioned, path)
+    tree = load_celltree(path)
+    assert isinstance(tree, PartitionedCellTree)
+    assert tree.n_partition == partitioned.n_partition
+    assert np.array_equal(tree.locate_points(grid.centroids), np.arange(grid.n_face))
+
+    with pytest.raises(TypeError):
+        save_celltree(1, path)
+
+
+def test_ugrid2d_build_celltree(tmp_path, grid):
+    tree = grid.build_celltree(n_part=3, n_threads=2)
+    assert isinstance(tree, PartitionedCellTree)
+    assert grid.celltree is tree
+    assert np.array_equal(grid.locate_points(grid.centroids), np.arange(grid.n_face))
+
+    labels = np.arange(grid.n_face) % 4
+    tree = grid.build_celltree(labels=labels)
+    assert tree.n_partition == 4
+    assert np.array_equal(grid.locate_points(grid.centroids), np.arange(grid.n_face))
+
+    with pytest.raises(ValueError, match="either n_part or labels"):
+        grid.build_celltree(n_part=2, labels=labels)
+    with pytest.raises(ValueError, match="Expected labels of shape"):
+        grid.build_celltree(labels=labels[:10])
+
+    path = tmp_path / "tree.npz"
+    grid.save_celltree(path)
+    new = xugrid.data.disk().ugrid.grid
+    new.load_celltree(path)
+    assert isinstance(new.celltree, PartitionedCellTree)
+    assert np.array_equal(new.locate_points(grid.centroids), np.arange(grid.n_face))
+
+    other = grid.topology_subset(np.arange(10))
+    with pytest.raises(ValueError, match="does not match"):
+        other.load_celltree(path)
+
+
+def test_regrid_partitioned_celltree(grid):
+    uda = xugrid.data.disk()["face_z"]
+    target = xugrid.Ugrid2d.from_structured_bounds(
+        np.column_stack([np.arange(-5.0, 5.0), np.arange(-4.0, 6.0)]),
+        np.column_stack([np.arange(-5.0, 5.0), np.arange(-4.0, 6.0)]),
+    )
+    expected = xugrid.OverlapRegridder(uda, target).regrid(uda)
+    uda.ugrid.grid.build_celltree(n_part=4)
+    actual = xugrid.OverlapRegridder(uda, target).regrid(uda)
+    assert np.allclose(actual.values, expected.values, equal_nan=True)
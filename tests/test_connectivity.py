@@ -354,6 +354,48 @@ def test_edge_connectivity(mixed_mesh):
     assert np.array_equal(face_edges, expected_face_edges)
 
 
+@pytest.mark.parametrize("parallel", [False, True])
+def test_unique_edges(parallel):
+    rng = np.random.default_rng(0)
+    edges = np.sort(rng.integers(0, 50, size=(1000, 2)), axis=1)
+    # Add a node with many edges, to exceed the insertion sort bucket size.
+    edges[:100, 0] = 0
+    expected_unique, expected_inverse = np.unique(edges, axis=0, return_inverse=True)
+    unique, inverse = connectivity.unique_edges(edges, parallel=parallel)
+    assert np.array_equal(unique, expected_unique)
+    assert np.array_equal(inverse, expected_inverse)
+
+    unique, inverse = connectivity.unique_edges(
+        np.empty((0, 2), dtype=int), parallel=parallel
+    )
+    assert unique.shape == (0, 2)
+    assert inverse.shape == (0,)
+
+
+def test_edge_connectivity_parallel(mixed_mesh):
+    faces, fill_value = mixed_mesh
+    expected = connectivity.edge_connectivity(faces, fill_value, parallel=False)
+    actual = connectivity.edge_connectivity(faces, fill_value, parallel=True)
+    assert np.array_equal(actual[0], expected[0])
+    assert np.array_equal(actual[1], expected[1])
+
+
+def test_edge_connectivity_prior(mixed_mesh):
+    faces, fill_value = mixed_mesh
+    edge_nodes, face_edges = connectivity.edge_connectivity(faces, fill_value)
+    prior = edge_nodes[::-1, ::-1]
+    actual_edges, actual_face_edges = connectivity.edge_connectivity(
+        faces, fill_value, prior
+    )
+    assert actual_edges is prior
+    n_edge = len(edge_nodes)
+    expected = np.where(face_edges == fill_value, fill_value, n_edge - 1 - face_edges)
+    assert np.array_equal(actual_face_edges, expected)
+
+    with pytest.raises(ValueError, match="Invalid edge_node_connectivity"):
+        connectivity.edge_connectivity(faces, fill_value, prior[1:])
+
+
 def test_validate_edge_connectivity(mixed_mesh):
     faces, fill_value = mixed_mesh
     edges = np.array([[0, 1]])
@@ -627,6 +669,71 @@ def test_binary_dilation():
     assert np.array_equal(actual, expected)
 
 
+def test_binary_iterations():
+    i = np.array([0, 1, 1, 2, 2, 3, 3])
+    j = np.array([1, 0, 2, 1, 3, 2, 4])
+    coo_content = (j, (i, j))
+    con = sparse.coo_matrix(coo_content).tocsr()
+
+    a = np.array([True, False, False, False, False])
+    actual, flipped = connectivity.binary_dilation(
+        con, a, iterations=2, return_iterations=True
+    )
+    assert np.array_equal(actual, [True, True, True, False, False])
+    assert np.array_equal(flipped, [0, 1, 2, -1, -1])
+
+    # Iterate until the result no longer changes.
+    actual, flipped = connectivity.binary_dilation(
+        con, a, iterations=0, return_iterations=True
+    )
+    assert actual.all()
+    assert np.array_equal(flipped, [0, 1, 2, 3, 4])
+
+    mask = np.array([False, False, True, False, False])
+    actual, flipped = connectivity.binary_dilation(
+        con, a, iterations=0, mask=mask, return_iterations=True
+    )
+    assert np.array_equal(actual, [True, True, False, False, False])
+    assert np.array_equal(flipped, [0, 1, -1, -1, -1])
+
+    # Number of faces from the exterior.
+    a = np.full(5, True)
+    exterior = np.array([0, 4])
+    actual, flipped = connectivity.binary_erosion(
+        con, a, iterations=0, exterior=exterior, return_iterations=True
+    )
+    assert (~actual).all()
+    assert np.array_equal(flipped, [1, 2, 3, 2, 1])
+
+
+def test_graph_distance():
+    # 0 - 1 - 2 - 3 - 4    5
+    i = np.array([0, 1, 1, 2, 2, 3, 3, 4])
+    j = np.array([1, 0, 2, 1, 3, 2, 4, 3])
+    con = sparse.coo_matrix((np.ones(i.size), (i, j)), shape=(6, 6)).tocsr()
+    sources = np.array([True, False, False, False, True, False])
+
+    distance, nearest = connectivity.graph_distance(con, sources)
+    assert np.array_equal(distance, [0.0, 1.0, 2.0, 1.0, 0.0, np.inf])
+    assert np.array_equal(nearest[[0, 1, 3, 4, 5]], [0, 0, 4, 4, -1])
+    assert nearest[2] in (0, 4)
+
+    # Connections towards node 3 and 4 are long.
+    weights = np.where(con.indices >= 3, 10.0, 1.0)
+    distance, nearest = connectivity.graph_distance(con, sources, weights)
+    assert np.array_equal(distance, [0.0, 1.0, 2.0, 10.0, 0.0, np.inf])
+    assert np.array_equal(nearest, [0, 0, 0, 4, 4, -1])
+
+    with pytest.raises(TypeError, match="sources dtype should be bool"):
+        connectivity.graph_distance(con, sources.astype(int))
+    with pytest.raises(ValueError, match="expected sources of shape"):
+        connectivity.graph_distance(con, sources[:-1])
+    with pytest.raises(ValueError, match="expected weights of shape"):
+        connectivity.graph_distance(con, sources, weights[:-1])
+    with pytest.raises(ValueError, match="weights must be non-negative"):
+        connectivity.graph_distance(con, sources, -weights)
+
+
 @pytest.fixture(scope="function")
 def dag() -> sparse.csr_matrix:
     #
@@ -21,3 +21,87 @@ def test_laplace_interpolate():
 
     actual = interpolate.laplace_interpolate(con, data, direct_solve=False)
     assert np.allclose(actual, expected)
+
+
+@pytest.mark.parametrize("solver", ["direct", "ilu", "jacobi", "amg"])
+def test_laplace_interpolate_solvers(solver):
+    i = np.array([0, 1, 1, 2, 2, 3, 3, 4])
+    j = np.array([1, 0, 2, 1, 3, 2, 4, 3])
+    con = sparse.coo_matrix((np.ones(i.size), (i, j)), shape=(5, 5)).tocsr()
+    data = np.array([1.0, np.nan, np.nan, np.nan, 5.0])
+    expected = np.arange(1.0, 6.0)
+    actual, info = interpolate.laplace_interpolate(
+        con, data, solver=solver, return_info=True
+    )
+    assert np.allclose(actual, expected)
+    assert isinstance(info, interpolate.SolverInfo)
+    assert info.converged
+    assert info.residual < 1.0e-5
+
+    # Warm start from the solution.
+    actual, info = interpolate.laplace_interpolate(
+        con, data, solver=solver, x0=expected, return_info=True
+    )
+    assert np.allclose(actual, expected)
+    if solver != "direct":
+        assert info.n_iter == 0
+
+
+def test_laplace_interpolate_custom_solver():
+    i = np.array([0, 1, 1, 2, 2, 3, 3, 4])
+    j = np.array([1, 0, 2, 1, 3, 2, 4, 3])
+    con = sparse.coo_matrix((np.ones(i.size), (i, j)), shape=(5, 5)).tocsr()
+    data = np.array([1.0, np.nan, np.nan, np.nan, 5.0])
+
+    def solver(A, rhs, x0):
+        assert A.shape == (3, 3)
+        assert x0 is None
+        return np.linalg.solve(A.toarray(), rhs)
+
+    actual, info = interpolate.laplace_interpolate(
+        con, data, solver=solver, return_info=True
+    )
+    assert np.allclose(actual, np.arange(1.0, 6.0))
+    assert info.converged
+    assert info.n_iter is None
+
+
+def test_laplace_interpolate_errors():
+    con = sparse.eye(3, format="csr")
+    data = np.array([1.0, np.nan, np.nan])
+    with pytest.raises(ValueError, match="solver should be one of"):
+        interpolate.laplace_interpolate(con, data, solver="abc")
+    with pytest.raises(ValueError, match="direct_solve is True, but solver is"):
+        interpolate.laplace_interpolate(con, data, direct_solve=True, solver="amg")
+    with pytest.raises(ValueError, match="expected x0 of shape"):
+        interpolate.laplace_interpolate(con, data, x0=np.zeros(2))
+
+
+@pytest.mark.parametrize("solver", ["direct", "amg"])
+def test_laplace_interpolate_batch(solver):
+    i = np.array([0, 1, 1, 2, 2, 3, 3, 4])
+    j = np.array([1, 0, 2, 1, 3, 2, 4, 3])
+    con = sparse.coo_matrix((np.ones(i.size), (i, j)), shape=(5, 5)).tocsr()
+    data = np.array(
+        [
+            [1.0, np.nan, np.nan, np.nan, 5.0],
+            [2.0, np.nan, np.nan, np.nan, 10.0],
+            [1.0, np.nan, 3.0, np.nan, 1.0],
+            [1.0, 2.0, 3.0, 4.0, 5.0],
+        ]
+    ).reshape((2, 2, 5))
+    actual, info = interpolate.laplace_interpolate(
+        con, data, solver=solver, return_info=True
+    )
+    assert actual.shape == (2, 2, 5)
+    assert len(info) == 4
+    assert all(member_info.converged for member_info in info)
+    for index in np.ndindex(2, 2):
+        expected = interpolate.laplace_interpolate(con, data[index], solver=solver)
+        assert np.allclose(actual[index], expected)
+    assert np.allclose(actual[0, 1], np.arange(2.0, 12.0, 2.0))
+    assert np.allclose(actual[1, 0], [1.0, 2.0, 3.0, 2.0, 1.0])
+
+    with pytest.raises(ValueError, match="data is fully nodata"):
+        data[1, 1] = np.nan
+        interpolate.laplace_interpolate(con, data)
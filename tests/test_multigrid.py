@@ -0,0 +1,114 @@
+import numpy as np
+import scipy.sparse
+import scipy.sparse.linalg
+
+from xugrid.ugrid import multigrid
+
+
+def poisson2d(n):
+    # Five point Laplacian with Dirichlet boundaries.
+    T = scipy.sparse.diags([-1.0, 2.0, -1.0], [-1, 0, 1], shape=(n, n))
+    eye = scipy.sparse.eye(n)
+    return (scipy.sparse.kron(T, eye) + scipy.sparse.kron(eye, T)).tocsr()
+
+
+def test_aggregate():
+    A = poisson2d(10)
+    labels, n_aggregate = multigrid.aggregate(A)
+    assert labels.shape == (100,)
+    assert (labels >= 0).all()
+    assert np.array_equal(np.unique(labels), np.arange(n_aggregate))
+    assert 10 < n_aggregate < 50
+
+
+def test_smoothed_aggregation():
+    A = poisson2d(64)
+    ml = multigrid.SmoothedAggregation(A, max_coarse=50)
+    assert len(ml.levels) > 1
+    assert ml.shape == A.shape
+    assert 1.0 < ml.operator_complexity < 2.0
+
+    # The V-cycle is a symmetric operator.
+    rng = np.random.default_rng(0)
+    u = rng.random(A.shape[0])
+    v = rng.random(A.shape[0])
+    assert np.isclose(u @ ml.vcycle(v), v @ ml.vcycle(u))
+
+    b = np.ones(A.shape[0])
+    n_iter = 0
+
+    def count(_):
+        nonlocal n_iter
+        n_iter += 1
+
+    x, info = scipy.sparse.linalg.cg(
+        A, b, M=ml.aspreconditioner(), tol=1.0e-8, callback=count, atol="legacy"
+    )
+    assert info == 0
+    assert np.allclose(A @ x, b)
+    assert n_iter < 25
+
+
+def test_smoothed_aggregation_small():
+    # No coarsening required: a single direct solve.
+    A = poisson2d(4)
+    ml = multigrid.SmoothedAggregation(A)
+    assert len(ml.levels) == 0
+    b = np.ones(A.shape[0])
+    assert np.allclose(A @ ml.vcycle(b), b)
+
+
+def test_aggregate_isolated():
+    # Unknown 2 has no neighbors: it is not aggregated.
+    A = scipy.sparse.csr_matrix(
+        np.array([[2.0, -1.0, 0.0], [-1.0, 2.0, 0.0], [0.0, 0.0, 1.0]])
+    )
+    labels, n_aggregate = multigrid.aggregate(A)
+    assert np.array_equal(labels, [0, 0, -1])
+    assert n_aggregate == 1
+
+
+def test_smoothed_aggregation_scattered():
+    # Scattered single unknowns, e.g. single cells without data: most unknowns
+    # have no neighbors.
+    rng = np.random.default_rng(0)
+    variable = rng.random(100 * 100) < 0.1
+    A = poisson2d(100)[variable][:, variable].tocsr()
+    ml = multigrid.SmoothedAggregation(A, max_coarse=50)
+    sizes = ml.level_sizes
+    assert sizes[0] == variable.sum()
+    assert len(sizes) > 1
+    for fine, coarse in zip(sizes[:-1], sizes[1:]):
+        assert coarse <= multigrid.MAX_COARSENING_RATIO * fine
+    assert sizes[-1] <= 50
+
+    rng = np.random.default_rng(0)
+    u = rng.random(A.shape[0])
+    v = rng.random(A.shape[0])
+    assert np.isclose(u @ ml.vcycle(v), v @ ml.vcycle(u))
+
+    b = rng.random(A.shape[0])
+    n_iter = 0
+
+    def count(_):
+        nonlocal n_iter
+        n_iter += 1
+
+    x, info = scipy.sparse.linalg.cg(
+        A, b, M=ml.aspreconditioner(), tol=1.0e-8, callback=count, atol="legacy"
+    )
+    assert info == 0
+    assert np.allclose(A @ x, b)
+    assert n_iter < 10
+
+
+def test_smoothed_aggregation_singular():
+    # A graph Laplacian without Dirichlet boundary is singular: the coarsest
+    # level cannot be factorized, and is smoothed instead.
+    T = scipy.sparse.diags([-1.0, 2.0, -1.0], [-1, 0, 1], shape=(20, 20)).tolil()
+    T[0, 0] = 1.0
+    T[-1, -1] = 1.0
+    ml = multigrid.SmoothedAggregation(T.tocsr())
+    assert len(ml.levels) == 0
+    b = np.ones(20)
+    assert np.isfinite(ml.vcycle(b)).all()
@@ -1,3 +1,4 @@
+import dask.array
 import numpy as np
 import pytest
 import xarray as xr
@@ -24,6 +25,61 @@ def generate_mesh_2d(nx, ny, name="mesh2d"):
     return xu.Ugrid2d(*np.array(points).T, -1, np.array(connectivity), name=name)
 
 
+def test_add_halo():
+    grid = generate_mesh_2d(3, 3)
+    adjacency = grid.face_face_connectivity
+    actual = pt.add_halo(adjacency, np.array([4]), 0)
+    assert np.array_equal(actual, [4])
+    actual = pt.add_halo(adjacency, np.array([4]), 1)
+    assert np.array_equal(actual, [1, 3, 4, 5, 7])
+    actual = pt.add_halo(adjacency, np.array([0]), 2)
+    assert np.array_equal(actual, [0, 1, 2, 3, 4, 6])
+    actual = pt.add_halo(adjacency, np.array([4]), 10)
+    assert np.array_equal(actual, np.arange(9))
+
+
+@pytest.mark.parametrize("method", ["hilbert", "morton"])
+def test_curve_labels(method):
+    rng = np.random.default_rng(0)
+    xy = rng.random((1000, 2))
+    weights = rng.random(1000)
+    # Compare with an exact sort of the curve keys.
+    keys = pt.CURVES[method](xy)
+    order = np.argsort(keys, kind="stable")
+    for w in (None, weights):
+        labels = pt.curve_labels(xy, 7, method, w)
+        w = np.ones(1000) if w is None else w
+        midpoint = np.cumsum(w[order]) - 0.5 * w[order]
+        expected = np.empty(1000, dtype=int)
+        expected[order] = np.searchsorted(w.sum() * np.arange(1, 7) / 7, midpoint)
+        assert np.array_equal(labels, expected)
+
+    # Many duplicate points in the same bin.
+    xy = np.zeros((100, 2))
+    labels = pt.curve_labels(xy, 4, method)
+    assert np.array_equal(np.bincount(labels), [25, 25, 25, 25])
+    assert pt.curve_labels(np.empty((0, 2)), 4, method).size == 0
+
+
+def test_rcb_labels():
+    rng = np.random.default_rng(0)
+    xy = rng.random((1000, 2)) * [4.0, 1.0]
+    labels = pt.rcb_labels(xy, 4)
+    assert np.array_equal(np.bincount(labels), [250, 250, 250, 250])
+    # x has the largest extent: split along x first, and then again.
+    for label in range(3):
+        assert xy[labels == label, 0].max() <= xy[labels == label + 1, 0].min()
+
+    weights = rng.random(1000)
+    labels = pt.rcb_labels(xy, 5, weights)
+    total = np.bincount(labels, weights)
+    assert np.allclose(total, weights.sum() / 5, rtol=0.02)
+
+    xy = np.zeros((10, 2))
+    labels = pt.rcb_labels(xy, 3)
+    assert np.array_equal(np.bincount(labels), [3, 3, 4])
+
+
 def test_labels_to_indices():
     labels = np.array([0, 1, 0, 2, 2])
     indices = pt.labels_to_indices(labels)
@@ -59,6 +115,37 @@ class TestGridPartitioning:
         for part in parts:
             assert isinstance(part, xu.Ugrid2d)
 
+    @pytest.mark.parametrize("method", ["hilbert", "morton", "rcb"])
+    def test_label_partition_spatial(self, method):
+        labels = self.grid.label_partitions(n_part=3, method=method)
+        assert isinstance(labels, xu.UgridDataArray)
+        assert np.array_equal(np.bincount(labels.values), [5, 5, 5])
+
+        weights = np.ones(self.grid.n_face)
+        weights[:5] = 3.0
+        labels = self.grid.label_partitions(n_part=3, method=method, weights=weights)
+        # Balanced up to the weight of a single face.
+        assert np.allclose(np.bincount(labels.values, weights), 25.0 / 3, atol=3.0)
+
+        parts = self.grid.partition(n_part=3, method=method)
+        assert [part.n_face for part in parts] == [5, 5, 5]
+
+    def test_label_partition_errors(self):
+        with pytest.raises(ValueError, match="n_part should be larger than 0"):
+            self.grid.label_partitions(n_part=0)
+        with pytest.raises(ValueError, match="method should be one of"):
+            self.grid.label_partitions(n_part=2, method="abc")
+        with pytest.raises(TypeError, match="METIS requires integer weights"):
+            self.grid.label_partitions(n_part=2, weights=np.ones(15))
+        with pytest.raises(ValueError, match="Expected weights of shape"):
+            self.grid.label_partitions(n_part=2, method="rcb", weights=np.ones(3))
+        with pytest.raises(ValueError, match="weights must be non-negative"):
+            self.grid.label_partitions(n_part=2, method="hilbert", weights=-np.ones(15))
+
+    def test_label_partition_metis_weights(self):
+        labels = self.grid.label_partitions(n_part=3, weights=np.ones(15, dtype=int))
+        assert np.allclose(np.unique(labels.values), [0, 1, 2])
+
 
 class TestDatasetPartition:
     @pytest.fixture(autouse=True)
@@ -116,6 +203,63 @@ class TestDatasetPartition:
             assert isinstance(partition, xu.UgridDataArray)
             assert partition.name == "face_z"
 
+    def test_partition_by_labels__halo(self):
+        with pytest.raises(ValueError, match="n_halo must be a non-negative"):
+            pt.partition_by_label(self.grid, self.obj, self.labels, n_halo=-1)
+
+        partitions = pt.partition_by_label(self.grid, self.obj, self.labels, n_halo=1)
+        n_face = [p.ugrid.grid.n_face for p in partitions]
+        assert n_face == [10, 15, 10]
+        for i, partition in enumerate(partitions):
+            owned = partition["mesh2d_owned"]
+            assert owned.dims == ("mesh2d_nFaces",)
+            assert owned.sum() == 5
+            assert (partition["face_z"].values[owned.values] // 5 == i).all()
+
+        partitions = pt.partition_by_label(self.grid, self.obj, self.labels, n_halo=2)
+        assert [p.ugrid.grid.n_face for p in partitions] == [15, 15, 15]
+
+    def test_partition_by_labels__halo_ugrid1d(self):
+        grid = xu.Ugrid1d(
+            node_x=np.arange(6.0),
+            node_y=np.zeros(6),
+            fill_value=-1,
+            edge_node_connectivity=np.column_stack((np.arange(5), np.arange(1, 6))),
+        )
+        obj = xr.DataArray(np.arange(6.0), dims=[grid.node_dimension])
+        labels = xu.UgridDataArray(
+            xr.DataArray([0, 0, 0, 1, 1, 1], dims=[grid.node_dimension]), grid
+        )
+        with pytest.raises(NotImplementedError, match="only supported for Ugrid2d"):
+            pt.partition_by_label(grid, obj, labels, n_halo=1)
+
+    def test_merge_partitions__halo(self):
+        def neighbor_sum(grid, values):
+            adjacency = grid.face_face_connectivity.copy()
+            adjacency.data[:] = 1
+            return adjacency @ values
+
+        expected = neighbor_sum(self.grid, self.uds["face_z"].values)
+        partitions = self.uds.ugrid.partition_by_label(self.labels, n_halo=1)
+        for partition in partitions:
+            grid = partition.ugrid.grid
+            partition["sum"] = (
+                grid.face_dimension,
+                neighbor_sum(grid, partition["face_z"].values),
+            )
+
+        merged = pt.merge_partitions(partitions)
+        assert "mesh2d_owned" not in merged.coords
+        assert merged.ugrid.grid.n_face == self.grid.n_face
+        order = np.argsort(merged["face_z"].values)
+        assert np.array_equal(merged["sum"].values[order], expected)
+        assert np.array_equal(merged["face_z"].values[order], np.arange(15))
+
+        # Without halo, the results at the partition boundaries are wrong.
+        partitions = self.uds.ugrid.partition_by_label(self.labels)
+        partial = [neighbor_sum(p.ugrid.grid, p["face_z"].values) for p in partitions]
+        assert not np.array_equal(np.concatenate(partial), expected)
+
     def test_partition_roundtrip(self):
         partitions = self.uds.ugrid.partition(n_part=4)
         back = pt.merge_partitions(partitions)
@@ -158,6 +302,41 @@ class TestDatasetPartition:
         merged = pt.merge_partitions([part1, part2])
         assert np.bincount(merged["face_z"] == 1).all()
 
+    def test_merge_partitions_threads(self):
+        uds = self.uds.copy()
+        uds["layered_z"] = uds["face_z"] * xr.DataArray(np.arange(3.0), dims=("layer",))
+        partitions = uds.ugrid.partition(n_part=3)
+        expected = pt.merge_partitions(partitions, n_threads=1)
+        actual = pt.merge_partitions(partitions, n_threads=4)
+        assert actual.ugrid.obj.identical(expected.ugrid.obj)
+
+    def test_merge_partitions_dask(self):
+        partitions = self.uds.ugrid.partition(n_part=3)
+        expected = pt.merge_partitions(partitions)
+        lazy = [p.chunk() for p in partitions]
+        actual = pt.merge_partitions(lazy)
+        assert isinstance(actual["face_z"].data, dask.array.Array)
+        assert actual.ugrid.obj.compute().identical(expected.ugrid.obj)
+
+    def test_merge_partitions_dtype_promotion(self):
+        partitions = self.uds.ugrid.partition(n_part=2)
+        partitions[1]["face_z"] = partitions[1]["face_z"].astype(float)
+        merged = pt.merge_partitions(partitions)
+        assert merged["face_z"].dtype == np.float64
+
+
+def test_unique_rows():
+    rng = np.random.default_rng(0)
+    array = rng.integers(0, 5, size=(100, 2))
+    _, index, inverse = np.unique(array, axis=0, return_index=True, return_inverse=True)
+    actual_index, actual_inverse = pt._unique_rows(array)
+    assert np.array_equal(actual_index, index)
+    assert np.array_equal(actual_inverse, inverse)
+
+    actual_index, actual_inverse = pt._unique_rows(np.empty((0, 2)))
+    assert actual_index.size == 0
+    assert actual_inverse.size == 0
+
 
 class TestMultiTopologyMergePartitions:
     @pytest.fixture(autouse=True)
@@ -220,3 +399,114 @@ class TestMultiTopologyMergePartitions:
             TypeError, match="All partition topologies with name second"
         ):
             pt.merge_partitions([self.datasets[0], dataset3])
+
+
+class TestMergePlan:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        grid = generate_mesh_2d(5, 3)
+        ds = xr.Dataset()
+        ds["node_z"] = xr.DataArray(np.arange(grid.n_node), dims=(grid.node_dimension,))
+        ds["edge_z"] = xr.DataArray(np.arange(grid.n_edge), dims=(grid.edge_dimension,))
+        ds["face_z"] = xr.DataArray(np.arange(grid.n_face), dims=(grid.face_dimension,))
+        self.uds = xu.UgridDataset(obj=ds, grids=[grid])
+        self.partitions = self.uds.ugrid.partition(n_part=3)
+        self.plan = pt.MergePlan.from_partitions(self.partitions)
+
+    def test_init(self):
+        plan = self.plan
+        assert plan.n_partition == 3
+        assert set(plan.dimensions) == {
+            "mesh2d_nNodes",
+            "mesh2d_nEdges",
+            "mesh2d_nFaces",
+        }
+        assert len(plan.grids) == 1
+
+        # From grids alone
+        grids = [p.ugrid.grid for p in self.partitions]
+        plan = pt.MergePlan.from_partitions(grids)
+        assert plan.n_partition == 3
+
+        with pytest.raises(TypeError, match="Expected UgridDataArray, UgridDataset"):
+            pt.MergePlan.from_partitions([1, 2])
+
+    def test_merge(self):
+        expected = pt.merge_partitions(self.partitions)
+        actual = self.plan.merge(self.partitions)
+        assert actual.ugrid.obj.identical(expected.ugrid.obj)
+        assert actual.ugrid.grid.equals(expected.ugrid.grid)
+
+        # Plain xarray objects: the topology is taken from the plan.
+        actual = self.plan.merge([p.ugrid.obj for p in self.partitions])
+        assert actual.ugrid.obj.identical(expected.ugrid.obj)
+
+        # New data on the same partitions.
+        new = [p * 2 for p in self.partitions]
+        actual = self.plan.merge(new)
+        assert actual["face_z"].equals(expected["face_z"] * 2)
+
+    def test_merge__errors(self):
+        with pytest.raises(ValueError, match="Merge plan is for 3 partitions"):
+            self.plan.merge(self.partitions[:2])
+
+        partitions = self.partitions[::-1]
+        with pytest.raises(ValueError, match="Partition 0 does not match"):
+            self.plan.merge(partitions)
+
+    def test_roundtrip(self, tmp_path):
+        path = tmp_path / "plan.nc"
+        self.plan.to_netcdf(path)
+        back = pt.MergePlan.from_netcdf(path)
+        assert back.n_partition == 3
+        for dim, indexes in self.plan.indexes.items():
+            for a, b in zip(indexes, back.indexes[dim]):
+                assert np.array_equal(a, b)
+            assert np.array_equal(self.plan.sizes[dim], back.sizes[dim])
+
+        expected = self.plan.merge(self.partitions)
+        actual = back.merge(self.partitions)
+        assert actual.ugrid.obj.identical(expected.ugrid.obj)
+
+        with pytest.raises(ValueError, match="dataset does not contain a merge plan"):
+            pt.MergePlan.from_dataset(xr.Dataset())
+
+    def test_merge_to_netcdf(self, tmp_path):
+        uds = self.uds.copy()
+        uds["layered_z"] = uds["face_z"] * xr.DataArray(np.arange(4.0), dims=("layer",))
+        partitions = uds.ugrid.partition(n_part=3)
+        paths = []
+        for i, partition in enumerate(partitions):
+            path = tmp_path / f"partition_{i}.nc"
+            partition.ugrid.to_netcdf(path)
+            paths.append(path)
+
+        expected = self.plan.merge(partitions).ugrid.to_dataset()
+        opened = [xr.open_dataset(path) for path in paths]
+        for chunks, n_threads in [(None, 1), ({"layer": 3}, 2)]:
+            path = tmp_path / f"merged-{n_threads}.nc"
+            self.plan.merge_to_netcdf(opened, path, chunks=chunks, n_threads=n_threads)
+            with xr.open_dataset(path) as back:
+                assert back["layered_z"].dims == ("mesh2d_nFaces", "layer")
+                assert back["layered_z"].equals(expected["layered_z"])
+                assert back["face_z"].equals(expected["face_z"])
+                assert back.ugrid_roles.topology == ["mesh2d"]
+
+    def test_merge_to_zarr(self, tmp_path):
+        path = tmp_path / "merged.zarr"
+        self.plan.merge_to_zarr(self.partitions, path)
+        expected = self.plan.merge(self.partitions).ugrid.to_dataset()
+        with xr.open_zarr(path) as back:
+            assert back["face_z"].equals(expected["face_z"])
+
+
+def test_default_chunks():
+    ds = xr.Dataset()
+    ds["a"] = (("time", "layer", "face"), np.ones((10, 2, 4)))
+    ds["b"] = (("face",), np.ones(4))
+    chunks = pt._default_chunks(ds, {"face": 4})
+    assert chunks == {"time": 10}
+    chunks = pt._default_chunks(ds, {"face": pt.DEFAULT_CHUNK_BYTES // 32})
+    assert chunks == {"time": 2}
+    chunks = pt._default_chunks(ds, {"face": pt.DEFAULT_CHUNK_BYTES})
+    assert chunks == {"time": 1}
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+from xugrid import (
+    BarycentricInterpolator,
+    CentroidLocatorRegridder,
+    OverlapRegridder,
+    RelativeOverlapRegridder,
+    WeightCache,
+)
+from xugrid.regrid import weight_matrix
+from xugrid.regrid.regridder import setup_grid
+
+
+@pytest.fixture(scope="function")
+def csr_matrix():
+    source_index = np.arange(10)
+    target_index = np.repeat(np.arange(5), 2)
+    weights = np.full(10, 0.5)
+    return weight_matrix.weight_matrix_csr(source_index, target_index, weights)
+
+
+def test_weight_cache_roundtrip(tmp_path, csr_matrix):
+    cache = WeightCache(tmp_path / "cache")
+    assert cache.get("abc") is None
+    cache.put("abc", csr_matrix)
+    assert "abc" in cache
+
+    actual = cache.get("abc")
+    assert isinstance(actual, weight_matrix.WeightMatrixCSR)
+    assert isinstance(actual.data, np.memmap)
+    for a, b in zip(actual, csr_matrix):
+        assert np.array_equal(a, b)
+
+    cache = WeightCache(tmp_path / "cache", mmap=False)
+    actual = cache.get("abc")
+    assert not isinstance(actual.data, np.memmap)
+
+    with pytest.raises(TypeError):
+        cache.put("def", (1, 2, 3))
+
+
+def test_weight_cache_evict(tmp_path, csr_matrix):
+    cache = WeightCache(tmp_path / "cache")
+    cache.put("a", csr_matrix)
+    entry_size = cache.size
+    cache.max_size = int(2.5 * entry_size)
+    cache.put("b", csr_matrix)
+    cache.put("c", csr_matrix)
+    assert "a" not in cache
+    assert "b" in cache
+    assert "c" in cache
+
+    cache.clear()
+    assert cache.size == 0
+
+
+def test_weight_cache_key(disk, quads_1, quads_structured):
+    source = setup_grid(disk)
+    target = setup_grid(quads_1)
+    key = WeightCache.key("OverlapRegridder", source, target)
+    assert key == WeightCache.key("OverlapRegridder", source, target)
+    assert key != WeightCache.key("OverlapRegridder", target, source)
+    assert key != WeightCache.key("BarycentricInterpolator", source, target)
+    structured = setup_grid(quads_structured)
+    assert key != WeightCache.key("OverlapRegridder", source, structured)
+
+
+@pytest.mark.parametrize(
+    "cls",
+    [
+        CentroidLocatorRegridder,
+        OverlapRegridder,
+        RelativeOverlapRegridder,
+        BarycentricInterpolator,
+    ],
+)
+def test_regridder_cache(cls, tmp_path, disk, quads_1):
+    path = tmp_path / "cache"
+    expected = cls(source=disk, target=quads_1).regrid(disk)
+
+    regridder = cls(source=disk, target=quads_1, cache=path)
+    cache = WeightCache(path)
+    key = WeightCache.key(cls.__name__, regridder._source, regridder._target)
+    assert key in cache
+    assert np.array_equal(
+        regridder.regrid(disk).values, expected.values, equal_nan=True
+    )
+
+    # Second time around, the weights are loaded from the cache.
+    regridder = cls(source=disk, target=quads_1, cache=cache)
+    assert isinstance(regridder._weights.data, np.memmap)
+    assert np.array_equal(
+        regridder.regrid(disk).values, expected.values, equal_nan=True
+    )
+
+
+def test_regridder_cache_type_error(disk, quads_1):
+    with pytest.raises(TypeError):
+        OverlapRegridder(source=disk, target=quads_1, cache=1)
@@ -1,3 +1,4 @@
+import dask.array
 import numpy as np
 import pytest
 import xarray as xr
@@ -9,6 +10,9 @@ from xugrid import (
     OverlapRegridder,
     RelativeOverlapRegridder,
 )
+from xugrid.regrid import reduce
+from xugrid.regrid.regridder import LINEAR_REGRID_FUNCTIONS, make_regrid
+from xugrid.regrid.weight_matrix import weight_matrix_csr
 
 
 @pytest.mark.parametrize(
@@ -232,3 +236,120 @@ def test_regridder_daks_arrays(
     )
     result = regridder.regrid(grid_data_dask_source_layered)
     assert result.isel(layer=0).equals(grid_data_dask_expected_layered.isel(layer=0))
+
+
+@pytest.mark.parametrize(
+    "method, relative",
+    [
+        ("mean", False),
+        ("sum", False),
+        ("first_order_conservative", True),
+        ("conductance", True),
+    ],
+)
+def test_linear_regrid(method, relative, disk, quads_1):
+    regridder_cls = RelativeOverlapRegridder if relative else OverlapRegridder
+    regridder = regridder_cls(source=disk, target=quads_1, method=method)
+    reduce_func = getattr(reduce, method)
+    size = regridder._target.size
+
+    rng = np.random.default_rng(0)
+    source = rng.random((3, disk.grid.n_face))
+    source[0, :40] = np.nan
+    source[1, ::3] = np.nan
+    source[2, :] = np.nan
+    expected = make_regrid(reduce_func)(source, regridder._weights, size)
+    actual = LINEAR_REGRID_FUNCTIONS[method](source, regridder._weights, size)
+    assert actual.shape == expected.shape
+    assert np.allclose(actual, expected, equal_nan=True)
+    assert np.isnan(actual[2]).all()
+
+    # Without NaN values
+    source = rng.random((2, disk.grid.n_face))
+    expected = make_regrid(reduce_func)(source, regridder._weights, size)
+    actual = LINEAR_REGRID_FUNCTIONS[method](source, regridder._weights, size)
+    assert np.allclose(actual, expected, equal_nan=True)
+
+
+def test_linear_regrid_missing_rows():
+    # The last target face has no weights at all.
+    A = weight_matrix_csr(
+        np.array([0, 1, 1]), np.array([0, 0, 1]), np.array([1.0, 3.0, 2.0])
+    )
+    source = np.array([[1.0, 2.0]])
+    actual = LINEAR_REGRID_FUNCTIONS["mean"](source, A, 3)
+    assert np.allclose(actual, [[7.0 / 4.0, 2.0, np.nan]], equal_nan=True)
+
+
+@pytest.mark.parametrize("method", ["mean", "sum", "max_overlap"])
+def test_regrid_chunked_topology(method, disk, disk_layered, quads_1):
+    regridder = OverlapRegridder(source=disk, target=quads_1, method=method)
+    facedim = disk.grid.face_dimension
+    source = disk_layered.copy()
+    source[0, :50] = np.nan
+    expected = regridder.regrid(source)
+    chunked = source.chunk({"layer": 2, facedim: 100})
+    actual = regridder.regrid(chunked)
+    assert isinstance(actual.data, dask.array.Array)
+    assert actual.data.chunks[0] == (2, 1)
+    assert np.allclose(actual.values, expected.values, equal_nan=True)
+
+
+@pytest.mark.parametrize(
+    "cls, method",
+    [
+        (CentroidLocatorRegridder, None),
+        (OverlapRegridder, "mean"),
+        (OverlapRegridder, "sum"),
+        (OverlapRegridder, "max_overlap"),
+        (RelativeOverlapRegridder, "first_order_conservative"),
+        (BarycentricInterpolator, None),
+    ],
+)
+def test_regrid_into(cls, method, disk, disk_layered, quads_1):
+    kwargs = {} if method is None else {"method": method}
+    regridder = cls(source=disk, target=quads_1, **kwargs)
+    source = disk_layered.copy()
+    source[0, :50] = np.nan
+    expected = regridder.regrid(source).values
+
+    out = np.full(expected.shape, -1.0)
+    actual = regridder.regrid_into(source.values, out=out)
+    assert actual is out
+    assert np.allclose(actual, expected, equal_nan=True)
+
+    # Re-use the buffer, one layer at a time.
+    for i in range(3):
+        regridder.regrid_into(source.values[i], out=out[i])
+        assert np.allclose(out[i], expected[i], equal_nan=True)
+
+    # Allocate output.
+    actual = regridder.regrid_into(source.values[0])
+    assert np.allclose(actual, expected[0], equal_nan=True)
+
+
+def test_regrid_into_structured(grid_data_a_layered, grid_data_b):
+    regridder = OverlapRegridder(source=grid_data_a_layered, target=grid_data_b)
+    source = grid_data_a_layered.astype(float)
+    expected = regridder.regrid(source).values
+    actual = regridder.regrid_into(source.values)
+    assert actual.shape == expected.shape
+    assert np.allclose(actual, expected, equal_nan=True)
+
+
+def test_regrid_into_errors(disk, quads_1):
+    regridder = OverlapRegridder(source=disk, target=quads_1)
+    source = disk.values
+    n_target = quads_1.grid.n_face
+    with pytest.raises(TypeError, match="Expected numpy.ndarray for source"):
+        regridder.regrid_into(disk)
+    with pytest.raises(ValueError, match="Expected source with trailing shape"):
+        regridder.regrid_into(source[:10])
+    with pytest.raises(TypeError, match="Expected numpy.ndarray for out"):
+        regridder.regrid_into(source, out=[0.0])
+    with pytest.raises(ValueError, match="Expected out with shape"):
+        regridder.regrid_into(source, out=np.empty((2, n_target)))
+    with pytest.raises(ValueError, match="C-contiguous array of float64"):
+        regridder.regrid_into(source, out=np.empty(n_target, dtype=np.float32))
+    with pytest.raises(ValueError, match="C-contiguous array of float64"):
+        regridder.regrid_into(source, out=np.empty((n_target, 2))[:, 0])
@@ -0,0 +1,192 @@
+import dask.array
+import numpy as np
+import pytest
+import xarray as xr
+
+import xugrid
+
+
+@pytest.fixture(scope="function")
+def disk():
+    return xugrid.data.disk()
+
+
+def linear_field(grid, time=None):
+    values = 1.0 + 2.0 * grid.face_x - 0.5 * grid.face_y
+    da = xr.DataArray(values, dims=[grid.face_dimension], name="linear")
+    if time is not None:
+        da = (da * time).transpose("time", ...)
+    return xugrid.UgridDataArray(da, grid)
+
+
+def points():
+    rng = np.random.default_rng(0)
+    return rng.uniform(-5.0, 5.0, 100), rng.uniform(-5.0, 5.0, 100)
+
+
+def test_point_sampler_errors(disk):
+    grid = disk.ugrid.grid
+    with pytest.raises(ValueError, match="shape of x does not match shape of y"):
+        xugrid.PointSampler(grid, x=[0.5, 1.5], y=[0.5])
+    with pytest.raises(ValueError, match="x and y must be 1d"):
+        xugrid.PointSampler(grid, x=[[0.5]], y=[[0.5]])
+    with pytest.raises(ValueError, match="method should be one of"):
+        xugrid.PointSampler(grid, x=[0.5], y=[0.5], method="abc")
+
+    sampler = xugrid.PointSampler(grid, x=[0.5], y=[0.5])
+    da = xr.DataArray(np.ones(3), dims=[grid.face_dimension])
+    with pytest.raises(ValueError, match="Expected 384 faces"):
+        sampler.sample(da)
+
+
+def test_point_sampler_containing(disk):
+    grid = disk.ugrid.grid
+    x, y = points()
+    sampler = xugrid.PointSampler(grid, x, y)
+    index = grid.locate_points(np.column_stack((x, y)))
+    inside = index != -1
+    assert sampler.n_point == inside.sum()
+    assert np.array_equal(sampler.point_index, np.flatnonzero(inside))
+
+    actual = sampler.sample(disk)
+    assert isinstance(actual, xr.Dataset)
+    assert np.allclose(actual["face_z"], disk["face_z"].values[index[inside]])
+    assert np.allclose(actual["mesh2d_x"], x[inside])
+    assert np.allclose(actual["mesh2d_y"], y[inside])
+    assert actual.equals(grid.sel_points(disk.ugrid.obj, x, y))
+
+
+def test_point_sampler_barycentric(disk):
+    grid = disk.ugrid.grid
+    uda = linear_field(grid)
+    x, y = points()
+    sampler = xugrid.PointSampler(grid, x, y, method="barycentric")
+    assert sampler.index.shape == sampler.weights.shape
+    assert np.allclose(sampler.weights.sum(axis=1), 1.0)
+
+    actual = sampler.sample(uda)
+    assert isinstance(actual, xr.DataArray)
+    assert actual.name == "linear"
+    # Barycentric interpolation reproduces a linear field, except near the
+    # boundary, where the containing face is sampled.
+    interpolated = (sampler.weights > 0).sum(axis=1) > 1
+    expected = 1.0 + 2.0 * sampler.xy[:, 0] - 0.5 * sampler.xy[:, 1]
+    assert interpolated.sum() > 0.8 * sampler.n_point
+    assert np.allclose(actual.values[interpolated], expected[interpolated])
+    # The same points are inside of the grid.
+    containing = xugrid.PointSampler(grid, x, y)
+    assert np.array_equal(sampler.point_index, containing.point_index)
+
+
+def test_point_sampler_time(disk):
+    grid = disk.ugrid.grid
+    time = xr.DataArray([1.0, 2.0, 3.0], coords={"time": [0, 1, 2]}, dims=["time"])
+    uda = linear_field(grid, time)
+    x, y = points()
+    sampler = xugrid.PointSampler(grid, x, y, method="barycentric")
+    expected = sampler.sample(uda.isel(time=0))
+
+    actual = sampler.sample(uda)
+    assert actual.dims == ("time", grid.face_dimension)
+    assert np.array_equal(actual["time"], [0, 1, 2])
+    assert np.allclose(actual, (expected * time).transpose(*actual.dims))
+
+    # Dask arrays are sampled lazily, chunk by chunk.
+    lazy = sampler.sample(uda.chunk({"time": 1, grid.face_dimension: 100}))
+    assert isinstance(lazy.data, dask.array.Array)
+    assert lazy.chunks[0] == (1, 1, 1)
+    assert np.allclose(lazy.compute(), actual)
+
+    # Containing is lazy as well.
+    lazy = xugrid.PointSampler(grid, x, y).sample(uda.chunk({"time": 1}))
+    assert isinstance(lazy.data, dask.array.Array)
+
+
+def test_point_sampler_dataset(disk):
+    grid = disk.ugrid.grid
+    uds = disk.copy()
+    uds["scalar"] = xr.DataArray(1.0)
+    x, y = points()
+    sampler = xugrid.PointSampler(grid, x, y, method="barycentric")
+    actual = sampler.sample(uds)
+    assert isinstance(actual, xr.Dataset)
+    assert actual["face_z"].dims == (grid.face_dimension,)
+    assert actual["scalar"] == 1.0
+    # Variables on other dimensions are left as is.
+    assert actual["node_z"].equals(uds["node_z"])
+    assert np.array_equal(actual["mesh2d_index"], sampler.point_index)
+
+
+def test_point_sampler_idw(disk):
+    grid = disk.ugrid.grid
+    uda = linear_field(grid)
+    x, y = points()
+    sampler = xugrid.PointSampler(grid, x, y, method="idw")
+    assert np.allclose(sampler.weights.sum(axis=1), 1.0)
+    assert (sampler.index[sampler.weights == 0.0] == -1).all()
+
+    # The interpolated values are bounded by the values of the sampled faces.
+    actual = sampler.sample(uda).values
+    sampled = np.where(sampler.index == -1, np.nan, uda.values[sampler.index])
+    assert (actual >= np.nanmin(sampled, axis=1) - 1.0e-9).all()
+    assert (actual <= np.nanmax(sampled, axis=1) + 1.0e-9).all()
+
+    # A point on a centroid takes the value of that face.
+    xy = grid.centroids[:3]
+    sampler = xugrid.PointSampler(grid, xy[:, 0], xy[:, 1], method="idw")
+    assert np.allclose(sampler.sample(uda), uda.values[:3])
+
+
+@pytest.mark.parametrize("method", ["barycentric", "idw"])
+def test_sel_points_method(disk, method):
+    grid = disk.ugrid.grid
+    uda = linear_field(grid)
+    x, y = points()
+    expected = xugrid.PointSampler(grid, x, y, method=method).sample(uda)
+    assert uda.ugrid.sel_points(x, y, method=method).equals(expected)
+    actual = disk.ugrid.sel_points(x, y, method=method)
+    assert np.allclose(
+        actual["face_z"], xugrid.PointSampler(grid, x, y, method).sample(disk["face_z"])
+    )
+    with pytest.raises(ValueError, match="method should be one of"):
+        uda.ugrid.sel_points(x, y, method="abc")
+
+
+def test_intersect_line_method(disk):
+    grid = disk.ugrid.grid
+    uda = linear_field(grid)
+    start = (1.0, 4.0)
+    end = (9.0, 6.5)
+    containing = uda.ugrid.intersect_line(start, end)
+    actual = uda.ugrid.intersect_line(start, end, method="barycentric")
+    assert actual.dims == containing.dims
+    for coord in ("mesh2d_x", "mesh2d_y", "mesh2d_s"):
+        assert np.array_equal(actual[coord], containing[coord])
+
+    # Away from the boundary of the disk, the linear field is reproduced at the
+    # midpoints.
+    x = actual["mesh2d_x"].values
+    y = actual["mesh2d_y"].values
+    expected = 1.0 + 2.0 * x - 0.5 * y
+    interior = np.hypot(x - 5.0, y - 5.0) < 4.0
+    assert np.allclose(actual.values[interior], expected[interior])
+    assert not np.allclose(containing.values[interior], expected[interior])
+
+    actual = disk.ugrid.intersect_line(start, end, method="idw")
+    assert actual["face_z"].sizes == containing.sizes
+    with pytest.raises(ValueError, match="method should be one of"):
+        uda.ugrid.intersect_line(start, end, method="abc")
+
+
+def test_intersect_linestring_method(disk):
+    shapely = pytest.importorskip("shapely")
+    grid = disk.ugrid.grid
+    uda = linear_field(grid)
+    linestring = shapely.geometry.LineString([[1.0, 4.0], [5.0, 5.5], [8.0, 3.0]])
+    containing = uda.ugrid.intersect_linestring(linestring)
+    actual = uda.ugrid.intersect_linestring(linestring, method="barycentric")
+    assert np.array_equal(actual["mesh2d_s"], containing["mesh2d_s"])
+    x = actual["mesh2d_x"].values
+    y = actual["mesh2d_y"].values
+    interior = np.hypot(x - 5.0, y - 5.0) < 4.0
+    assert np.allclose(actual.values[interior], (1.0 + 2.0 * x - 0.5 * y)[interior])
@@ -0,0 +1,156 @@
+import numpy as np
+import pytest
+
+import xugrid
+from xugrid.data.synthetic import generate_disk
+from xugrid.ugrid import scanline
+
+
+def locate(grid, x, y):
+    yy, xx = np.meshgrid(y, x, indexing="ij")
+    points = np.column_stack((xx.ravel(), yy.ravel()))
+    return grid.celltree.locate_points(points).reshape((y.size, x.size))
+
+
+def mixed_grid():
+    # A quadrangle and a triangle, padded with a fill value.
+    node_x = np.array([0.0, 1.0, 1.0, 0.0, 2.0])
+    node_y = np.array([0.0, 0.0, 1.0, 1.0, 0.5])
+    faces = np.array([[0, 1, 2, 3], [1, 4, 2, -1]])
+    return xugrid.Ugrid2d(node_x, node_y, -1, faces)
+
+
+def rasterize(grid, x, y, **kwargs):
+    return scanline.rasterize_faces(
+        grid.node_x,
+        grid.node_y,
+        grid.face_node_connectivity,
+        grid.fill_value,
+        x,
+        y,
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("rows_per_block", [1, 7, 256])
+def test_rasterize_faces_disk(rows_per_block):
+    vertices, triangles = generate_disk(6, 8)
+    grid = xugrid.Ugrid2d(vertices[:, 0], vertices[:, 1], -1, triangles)
+    # Offset the pixel centres to avoid centres exactly on the edges.
+    x = np.linspace(-1.1, 1.1, 101) + 1.0e-7
+    y = np.linspace(1.1, -1.1, 53) + 3.0e-7
+    actual = rasterize(grid, x, y, rows_per_block=rows_per_block)
+    assert actual.shape == (53, 101)
+    assert np.array_equal(actual, locate(grid, x, y))
+
+
+def test_rasterize_faces_fill_value():
+    grid = mixed_grid()
+    x = np.linspace(-0.05, 2.05, 43) + 1.0e-9
+    y = np.linspace(1.05, -0.05, 23) + 1.0e-9
+    actual = rasterize(grid, x, y)
+    assert np.array_equal(actual, locate(grid, x, y))
+    assert set(np.unique(actual)) == {-1, 0, 1}
+
+
+def test_rasterize_faces_unsorted():
+    grid = mixed_grid()
+    x = np.array([1.5, 0.5, 3.0, 1.25])
+    y = np.array([0.5, 0.75, -1.0])
+    expected = np.array(
+        [
+            [1, 0, -1, 1],
+            [-1, 0, -1, 1],
+            [-1, -1, -1, -1],
+        ]
+    )
+    assert np.array_equal(rasterize(grid, x, y), expected)
+
+
+def test_rasterize_faces_shared_edges():
+    # Pixel centres located on shared edges are assigned to a single face:
+    # the face above, or to the right of, the edge.
+    bounds = np.column_stack((np.arange(0.0, 3.0), np.arange(1.0, 4.0)))
+    structured = xugrid.Ugrid2d.from_structured_bounds(bounds, bounds)
+    grid = xugrid.Ugrid2d(
+        structured.node_x,
+        structured.node_y,
+        -1,
+        structured.face_node_connectivity,
+    )
+    x = np.array([0.5, 1.0, 2.0])
+    y = np.array([0.5, 1.0])
+    expected = np.array([[0, 1, 2], [3, 4, 5]])
+    assert np.array_equal(rasterize(grid, x, y), expected)
+
+
+def test_rasterize_faces_overlap():
+    # Three overlapping squares: the lowest face index is assigned.
+    node_x = np.array([0.0, 2.0, 2.0, 0.0, 1.0, 3.0, 3.0, 1.0, 0.5, 2.5, 2.5, 0.5])
+    node_y = np.array([0.0, 0.0, 2.0, 2.0, 1.0, 1.0, 3.0, 3.0, 0.2, 0.2, 2.2, 2.2])
+    faces = np.arange(12).reshape((3, 4))
+    grid = xugrid.Ugrid2d(node_x, node_y, -1, faces)
+    x = np.array([0.25, 1.5, 2.25, 2.75])
+    y = np.array([2.75, 2.1, 1.5, 0.1])
+    expected = np.array(
+        [
+            [-1, 1, 1, 1],
+            [-1, 1, 1, 1],
+            [0, 0, 1, 1],
+            [0, 0, -1, -1],
+        ]
+    )
+    assert np.array_equal(rasterize(grid, x, y), expected)
+
+
+def test_rasterize_faces_errors():
+    grid = mixed_grid()
+    with pytest.raises(ValueError, match="rows_per_block must be positive"):
+        rasterize(grid, np.ones(2), np.ones(2), rows_per_block=0)
+
+
+def test_tile_faces():
+    vertices, triangles = generate_disk(6, 8)
+    grid = xugrid.Ugrid2d(vertices[:, 0], vertices[:, 1], -1, triangles)
+    bounds = grid.face_bounds
+    x = np.linspace(-1.1, 1.1, 23)
+    y = np.linspace(1.1, -1.1, 12)
+    ychunks = (5, 5, 2)
+    xchunks = (10, 10, 3)
+    faces = scanline.tile_faces(bounds, x, y, ychunks, xchunks)
+    assert sorted(faces) == [(i, j) for i in range(3) for j in range(3)]
+    ybounds = np.cumsum((0,) + ychunks)
+    xbounds = np.cumsum((0,) + xchunks)
+    for (i, j), actual in faces.items():
+        ytile = y[ybounds[i] : ybounds[i + 1]]
+        xtile = x[xbounds[j] : xbounds[j + 1]]
+        expected = np.flatnonzero(
+            (bounds[:, 0] <= xtile.max())
+            & (bounds[:, 2] >= xtile.min())
+            & (bounds[:, 1] <= ytile.max())
+            & (bounds[:, 3] >= ytile.min())
+        )
+        assert np.array_equal(actual, expected)
+
+
+def test_rasterize_face_subset():
+    grid = mixed_grid()
+    x = np.linspace(-0.05, 2.05, 43)
+    y = np.linspace(1.05, -0.05, 23)
+    expected = rasterize(grid, x, y)
+    # Only the triangle: the quadrangle pixels are outside.
+    faces = np.array([[0, 2, 1, -1]])
+    actual = scanline.rasterize_face_subset(
+        grid.node_x[[1, 2, 4]], grid.node_y[[1, 2, 4]], faces, -1, np.array([1]), x, y
+    )
+    assert np.array_equal(actual, np.where(expected == 1, 1, -1))
+    empty = scanline.rasterize_face_subset(
+        grid.node_x,
+        grid.node_y,
+        np.empty((0, 3), dtype=int),
+        -1,
+        np.array([], dtype=int),
+        x,
+        y,
+    )
+    assert np.array_equal(empty, np.full((23, 43), -1))
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from xugrid.ugrid import spatial_ordering as so
+
+
+def grid_points(n):
+    y, x = np.meshgrid(np.arange(n), np.arange(n), indexing="ij")
+    return np.column_stack((x.ravel(), y.ravel())).astype(float)
+
+
+def test_quantize():
+    xy = np.array([[0.0, 0.0], [1.0, 0.5], [2.0, 1.0]])
+    ix, iy = so._quantize(xy, 2)
+    # Equal scaling for both axes: the extent of x determines the scale.
+    assert np.array_equal(ix, [0, 1, 3])
+    assert np.array_equal(iy, [0, 0, 1])
+
+    with pytest.raises(ValueError, match="Expected xy with shape"):
+        so._quantize(np.ones(3), 2)
+    with pytest.raises(ValueError, match="order must be in"):
+        so._quantize(xy, 17)
+
+
+def test_morton_index():
+    xy = grid_points(4)
+    keys = so.morton_index(xy, order=2)
+    assert sorted(keys) == list(range(16))
+    # Z-order of the first quadrant: (0, 0), (1, 0), (0, 1), (1, 1)
+    assert np.array_equal(keys[[0, 1, 4, 5]], [0, 1, 2, 3])
+
+
+@pytest.mark.parametrize("order", [1, 3, 5])
+def test_hilbert_index(order):
+    n = 2**order
+    xy = grid_points(n)
+    keys = so.hilbert_index(xy, order=order)
+    assert sorted(keys) == list(range(n * n))
+    # Consecutive positions along the curve are neighboring cells.
+    ordered = xy[np.argsort(keys)]
+    step = np.abs(np.diff(ordered, axis=0)).sum(axis=1)
+    assert (step == 1).all()
+
+
+def test_curve_order():
+    xy = grid_points(4)
+    order = so.curve_order(xy, "hilbert")
+    assert np.array_equal(np.sort(order), np.arange(16))
+    with pytest.raises(ValueError, match="Expected one of"):
+        so.curve_order(xy, "peano")
@@ -919,6 +919,60 @@ def test_reverse_cuthill_mckee():
     assert np.array_equal(index, [3, 2, 1, 0])
 
 
+@pytest.mark.parametrize("method", ["hilbert", "morton", "rcm"])
+def test_reorder(method):
+    grid = grid2d()
+    new, indexes = grid.reorder(method)
+    assert isinstance(new, xugrid.Ugrid2d)
+    assert new.name == grid.name
+    node_order = indexes[grid.node_dimension]
+    edge_order = indexes[grid.edge_dimension]
+    face_order = indexes[grid.face_dimension]
+    assert np.array_equal(np.sort(node_order), np.arange(grid.n_node))
+    assert np.array_equal(np.sort(edge_order), np.arange(grid.n_edge))
+    assert np.array_equal(np.sort(face_order), np.arange(grid.n_face))
+    assert np.allclose(new.node_coordinates, grid.node_coordinates[node_order])
+    assert np.allclose(new.face_coordinates, grid.face_coordinates[face_order])
+    assert np.allclose(new.edge_coordinates, grid.edge_coordinates[edge_order])
+    # The nodes are numbered in order of first occurrence in the faces.
+    faces = new.face_node_connectivity
+    first = faces[faces != new.fill_value]
+    _, index = np.unique(first, return_index=True)
+    assert np.array_equal(first[np.sort(index)], np.arange(new.n_node))
+    # The fill values are preserved.
+    assert np.array_equal(
+        faces == new.fill_value,
+        grid.face_node_connectivity[face_order] == grid.fill_value,
+    )
+    assert np.allclose(new.area, grid.area[face_order])
+
+
+def test_reorder_locality():
+    x_bounds = np.column_stack((np.arange(16.0), np.arange(1.0, 17.0)))
+    grid = xugrid.Ugrid2d.from_structured_bounds(x_bounds, x_bounds)
+    # Shuffle the faces, then restore a spatially coherent order.
+    rng = np.random.default_rng(0)
+    faces = grid.face_node_connectivity[rng.permutation(grid.n_face)]
+    shuffled = xugrid.Ugrid2d(grid.node_x, grid.node_y, -1, faces)
+
+    def mean_step(g):
+        return np.linalg.norm(np.diff(g.centroids, axis=0), axis=1).mean()
+
+    assert mean_step(shuffled) > 5.0
+    # The Hilbert curve visits every face of a 16 by 16 grid by stepping to a
+    # direct neighbor.
+    new, _ = shuffled.reorder("hilbert")
+    assert np.isclose(mean_step(new), 1.0)
+    new, _ = shuffled.reorder("morton")
+    assert mean_step(new) < 2.0
+
+
+def test_reorder_errors():
+    grid = grid2d()
+    with pytest.raises(ValueError, match="method should be one of"):
+        grid.reorder("abc")
+
+
 @requires_meshkernel
 def test_mesh():
     grid = grid2d()
@@ -1064,3 +1118,172 @@ def test_ugrid2d_rename_with_dataset():
         "two",
     ]
     assert sorted(dataset.coords) == ["__renamed_node_x", "__renamed_node_y"]
+
+
+def test_lazy_from_dataset(tmp_path):
+    grid = grid2d()
+    path = tmp_path / "grid.nc"
+    grid.to_dataset().to_netcdf(path)
+
+    with xr.open_dataset(path) as ds:
+        lazy = xugrid.Ugrid2d.from_dataset(ds, lazy=True)
+        assert lazy.is_lazy
+        # Sizes do not require loading the arrays.
+        assert lazy.n_face == grid.n_face
+        assert lazy.n_node == grid.n_node
+        assert lazy.n_max_node_per_face == grid.n_max_node_per_face
+        assert lazy.is_lazy
+
+        assert np.allclose(lazy.area, grid.area)
+        assert not lazy.is_lazy
+        assert np.array_equal(lazy.face_node_connectivity, grid.face_node_connectivity)
+        assert np.array_equal(lazy.edge_node_connectivity, grid.edge_node_connectivity)
+        assert lazy.node_x.dtype == np.float64
+        assert np.array_equal(lazy.locate_points(CENTROIDS), np.arange(grid.n_face))
+
+
+def test_lazy_dask_and_memmap(tmp_path):
+    import dask.array
+
+    grid = grid2d()
+    path = tmp_path / "faces.npy"
+    np.save(path, grid.face_node_connectivity)
+    faces = np.load(path, mmap_mode="r")
+    lazy = xugrid.Ugrid2d(
+        dask.array.from_array(grid.node_x, chunks=3),
+        dask.array.from_array(grid.node_y, chunks=3),
+        grid.fill_value,
+        faces,
+        lazy=True,
+        check_orientation=False,
+    )
+    assert lazy.n_face == grid.n_face
+    assert lazy.n_node == grid.n_node
+    assert lazy.face_node_connectivity is faces
+    assert isinstance(lazy.node_x, np.ndarray)
+    assert np.allclose(lazy.centroids, grid.centroids)
+
+    with pytest.raises(TypeError):
+        xugrid.Ugrid2d(grid.node_x, grid.node_y, grid.fill_value, [[0, 1, 2]])
+
+
+@pytest.mark.parametrize("flip_x", [False, True])
+@pytest.mark.parametrize("flip_y", [False, True])
+def test_structured_implicit(flip_x, flip_y):
+    x_bounds = np.column_stack((np.arange(0.0, 5.0), np.arange(1.0, 6.0)))
+    y_bounds = np.column_stack((np.arange(0.0, 6.0, 2.0), np.arange(2.0, 8.0, 2.0)))
+    if flip_x:
+        x_bounds = x_bounds[::-1]
+    if flip_y:
+        y_bounds = y_bounds[::-1]
+    grid = xugrid.Ugrid2d.from_structured_bounds(x_bounds, y_bounds)
+    x = xugrid.conversion.bounds_to_vertices(x_bounds)
+    y = xugrid.conversion.bounds_to_vertices(y_bounds)
+    yy, xx = np.meshgrid(y, x, indexing="ij")
+    explicit = xugrid.Ugrid2d(
+        xx.ravel(), yy.ravel(), -1, grid._structured.face_node_connectivity()
+    )
+
+    # Sizes and geometry do not materialize the topology.
+    assert grid.is_lazy
+    assert grid.n_node == 24
+    assert grid.n_face == 15
+    assert grid.n_edge == 38
+    assert np.allclose(grid.centroids, explicit.centroids)
+    assert np.allclose(grid.area, explicit.area)
+    assert np.allclose(grid.face_bounds, explicit.face_bounds)
+    assert grid.bounds == explicit.bounds
+    rng = np.random.default_rng(0)
+    points = rng.uniform(-1.0, 7.0, size=(1000, 2))
+    points[0] = np.nan
+    expected = explicit.locate_points(points)
+    assert np.array_equal(grid.locate_points(points), expected)
+    assert np.array_equal(grid.locate_points(grid.centroids), np.arange(15))
+    assert grid.is_lazy
+
+    # The faces are numbered row by row, and are counterclockwise.
+    assert np.array_equal(grid.node_x, explicit.node_x)
+    assert np.array_equal(grid.node_y, explicit.node_y)
+    assert np.array_equal(grid.face_node_connectivity, explicit.face_node_connectivity)
+    assert not grid.is_lazy
+    assert (
+        xugrid.ugrid.connectivity.area(
+            grid.face_node_connectivity, -1, grid.node_x, grid.node_y
+        )
+        > 0
+    ).all()
+    assert grid.edge_node_connectivity.shape == (38, 2)
+
+
+def test_structured_implicit_boundary():
+    x_bounds = np.column_stack((np.arange(0.0, 3.0), np.arange(1.0, 4.0)))
+    grid = xugrid.Ugrid2d.from_structured_bounds(x_bounds, x_bounds[::-1])
+    points = np.array([[0.0, 0.0], [3.0, 3.0], [1.0, 2.0], [3.1, 1.0], [-0.1, 1.0]])
+    assert np.array_equal(grid.locate_points(points), [6, -1, 1, -1, -1])
+
+
+@pytest.mark.parametrize("flip_x", [False, True])
+@pytest.mark.parametrize("flip_y", [False, True])
+def test_structured_implicit_locate_edges(flip_x, flip_y):
+    x_bounds = np.column_stack((np.arange(0.0, 3.0), np.arange(1.0, 4.0)))
+    y_bounds = np.column_stack((np.arange(0.0, 4.0, 2.0), np.arange(2.0, 6.0, 2.0)))
+    if flip_x:
+        x_bounds = x_bounds[::-1]
+    if flip_y:
+        y_bounds = y_bounds[::-1]
+    grid = xugrid.Ugrid2d.from_structured_bounds(x_bounds, y_bounds)
+    # Every vertex and every edge midpoint, including all outer edges and
+    # corners.
+    x = np.arange(0.0, 3.5, 0.5)
+    y = np.arange(0.0, 5.0, 1.0)
+    xx, yy = np.meshgrid(x, y)
+    points = np.column_stack((xx.ravel(), yy.ravel()))
+    actual = grid.locate_points(points)
+    assert grid.is_lazy
+    explicit = xugrid.Ugrid2d(grid.node_x, grid.node_y, -1, grid.face_node_connectivity)
+    assert np.array_equal(actual, explicit.locate_points(points))
+    # The upper and right boundary are outside.
+    assert (actual[(points[:, 0] == 3.0) | (points[:, 1] == 4.0)] == -1).all()
+
+
+@pytest.mark.parametrize("flip_y", [False, True])
+def test_structured_implicit_rasterize_like(flip_y):
+    x_bounds = np.column_stack((np.arange(0.0, 5.0), np.arange(1.0, 6.0)))
+    y_bounds = np.column_stack((np.arange(0.0, 6.0, 2.0), np.arange(2.0, 8.0, 2.0)))
+    if flip_y:
+        y_bounds = y_bounds[::-1]
+    grid = xugrid.Ugrid2d.from_structured_bounds(x_bounds, y_bounds)
+    x = np.linspace(-0.5, 5.5, 13)
+    y = np.linspace(6.5, -0.5, 15)
+    _, _, actual = grid.rasterize_like(x, y)
+    assert grid.is_lazy
+    explicit = xugrid.Ugrid2d(grid.node_x, grid.node_y, -1, grid.face_node_connectivity)
+    _, _, expected = explicit.rasterize_like(x, y)
+    assert np.array_equal(actual, expected)
+
+
+def test_structured_implicit_invalidated():
+    x_bounds = np.column_stack((np.arange(0.0, 3.0), np.arange(1.0, 4.0)))
+    grid = xugrid.Ugrid2d.from_structured_bounds(x_bounds, x_bounds)
+    grid.node_x = grid.node_x + 10.0
+    assert grid._structured is None
+    assert np.allclose(grid.bounds, (10.0, 0.0, 13.0, 3.0))
+    assert np.allclose(grid.centroids[0], [10.5, 0.5])
+
+
+def test_orientation_declared():
+    grid = grid2d()
+    clockwise = grid.face_node_connectivity[:, ::-1].copy()
+
+    ds = grid.to_dataset()
+    ds[f"{NAME}_face_nodes"].values = clockwise
+    for lazy in (False, True):
+        # Orientation is checked and corrected by default.
+        checked = xugrid.Ugrid2d.from_dataset(ds, lazy=lazy)
+        assert (checked.area > 0).all()
+        assert not np.array_equal(checked.face_node_connectivity, clockwise)
+
+    ds[f"{NAME}_face_nodes"].attrs["orientation"] = "counterclockwise"
+    for lazy in (False, True):
+        unchecked = xugrid.Ugrid2d.from_dataset(ds, lazy=lazy)
+        assert np.array_equal(unchecked.face_node_connectivity, clockwise)
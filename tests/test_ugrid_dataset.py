@@ -1,5 +1,6 @@
 import warnings
 
+import dask.array
 import geopandas as gpd
 import numpy as np
 import pandas as pd
@@ -286,6 +287,50 @@ class TestUgridDataArray:
         assert np.allclose(actual["x"], x)
         assert np.allclose(actual["y"], y)
 
+    @pytest.mark.parametrize("tile_size", [1, 3, (2, 3), 10])
+    def test_rasterize_tiled(self, tile_size):
+        time = xr.DataArray([0.0, 1.0, 2.0], dims=["time"])
+        uda = (self.uda * (time + 1)).transpose("time", ...)
+        expected = uda.ugrid.rasterize(resolution=0.5)
+        actual = uda.ugrid.rasterize(resolution=0.5, tile_size=tile_size)
+        assert isinstance(actual.data, dask.array.Array)
+        assert actual.dims == ("time", "y", "x")
+        assert actual.name == uda.name
+        assert actual.compute().equals(expected)
+
+        # The tasks hold only the faces of their tile, not the grid.
+        def holds_grid(task):
+            if isinstance(task, (tuple, list)):
+                return any(holds_grid(arg) for arg in task)
+            if hasattr(task, "dsk"):  # Fused tasks.
+                return any(holds_grid(arg) for arg in task.dsk.values())
+            return isinstance(task, xugrid.Ugrid2d)
+
+        graph = actual.data.__dask_graph__()
+        assert not any(holds_grid(task) for task in graph.values())
+
+        actual = uda.ugrid.rasterize_like(other=expected, tile_size=tile_size)
+        assert actual.compute().equals(expected)
+
+        # Chunks along other dimensions are preserved.
+        chunked = uda.chunk({"time": 1})
+        actual = chunked.ugrid.rasterize(resolution=0.5, tile_size=tile_size)
+        assert actual.chunks[0] == (1, 1, 1)
+        assert actual.compute().equals(expected)
+
+        # As without tiles, y and x take the position of the face dimension.
+        uda = uda.transpose("mesh2d_nFaces", "time")
+        expected = uda.ugrid.rasterize(resolution=0.5)
+        actual = uda.ugrid.rasterize(resolution=0.5, tile_size=tile_size)
+        assert actual.dims == ("y", "x", "time")
+        assert actual.compute().equals(expected)
+
+    def test_rasterize_tiled_errors(self):
+        with pytest.raises(ValueError, match="tile_size should be a positive"):
+            self.uda.ugrid.rasterize(resolution=0.5, tile_size=0)
+        with pytest.raises(ValueError, match="tile_size should be a positive"):
+            self.uda.ugrid.rasterize(resolution=0.5, tile_size=(1, 2, 3))
+
     def test_partitioning(self):
         partitions = self.uda.ugrid.partition(n_part=2)
         assert len(partitions) == 2
@@ -330,6 +375,40 @@ class TestUgridDataArray:
         actual = a.ugrid.binary_erosion()
         assert isinstance(actual, xugrid.UgridDataArray)
 
+    def test_distance_transform(self):
+        grid = self.uda.ugrid.grid
+        sources = self.uda == 0
+        sources[0] = True
+        distance, nearest = sources.ugrid.distance_transform()
+        assert isinstance(distance, xugrid.UgridDataArray)
+        assert isinstance(nearest, xugrid.UgridDataArray)
+        assert distance.dims == sources.dims
+        assert distance[0] == 0
+        assert (nearest == 0).all()
+        # Compare with the number of iterations of binary dilation.
+        _, flipped = sources.ugrid.binary_dilation(iterations=0, return_iterations=True)
+        assert np.array_equal(distance, flipped)
+
+        distance, _ = sources.ugrid.distance_transform(xy_weights=True)
+        xy = grid.centroids
+        assert np.all(distance >= np.linalg.norm(xy - xy[0], axis=1) - 1.0e-9)
+
+        node_sources = xugrid.UgridDataArray(
+            xr.DataArray(np.arange(grid.n_node) == 0, dims=[grid.node_dimension]),
+            grid,
+        )
+        distance, nearest = node_sources.ugrid.distance_transform(xy_weights=True)
+        assert distance.dims == (grid.node_dimension,)
+        assert np.allclose(distance[0], 0.0)
+        assert (nearest == 0).all()
+
+    def test_binary_iterations(self):
+        a = self.uda > 0
+        actual, flipped = a.ugrid.binary_erosion(iterations=0, return_iterations=True)
+        assert isinstance(actual, xugrid.UgridDataArray)
+        assert isinstance(flipped, xugrid.UgridDataArray)
+        assert (flipped > 0).all()
+
     def test_connected_components(self):
         actual = self.uda.ugrid.connected_components()
         assert isinstance(actual, xugrid.UgridDataArray)
@@ -339,6 +418,19 @@ class TestUgridDataArray:
         actual = self.uda.ugrid.reverse_cuthill_mckee()
         assert isinstance(actual, xugrid.UgridDataArray)
 
+    def test_reorder(self):
+        uda = self.uda.ugrid.assign_face_coords()
+        actual = uda.ugrid.reorder()
+        assert isinstance(actual, xugrid.UgridDataArray)
+        grid = actual.ugrid.grid
+        assert np.allclose(actual["mesh2d_face_x"], grid.face_x)
+        assert np.allclose(actual["mesh2d_face_y"], grid.face_y)
+
+        actual, indexes = uda.ugrid.reorder(method="rcm", return_index=True)
+        face_order = indexes["mesh2d_nFaces"]
+        expected = uda["mesh2d_face_x"].values[face_order]
+        assert np.array_equal(actual["mesh2d_face_x"], expected)
+
     def test_laplace_interpolate(self):
         uda2 = self.uda.copy()
         uda2.obj[:-2] = np.nan
@@ -346,6 +438,38 @@ class TestUgridDataArray:
         assert isinstance(actual, xugrid.UgridDataArray)
         assert np.allclose(actual, 1.0)
 
+        actual, info = uda2.ugrid.laplace_interpolate(
+            solver="amg", x0=actual, return_info=True
+        )
+        assert isinstance(actual, xugrid.UgridDataArray)
+        assert np.allclose(actual, 1.0)
+        assert info.converged
+
+    def test_laplace_interpolate_batch(self):
+        data = np.ones((2, 3, self.uda.size))
+        data[0, :, :-2] = np.nan
+        data[1, 0, 1:] = np.nan
+        data *= np.arange(1.0, 4.0)[np.newaxis, :, np.newaxis]
+        uda = xugrid.UgridDataArray(
+            xr.DataArray(data, dims=("time", "layer", self.uda.dims[0])),
+            self.uda.ugrid.grid,
+        ).transpose("time", self.uda.dims[0], "layer")
+        actual, info = uda.ugrid.laplace_interpolate(
+            direct_solve=True, return_info=True
+        )
+        assert isinstance(actual, xugrid.UgridDataArray)
+        assert actual.dims == uda.dims
+        assert len(info) == 6
+        assert np.allclose(actual.isel(time=0, layer=2), 3.0)
+        assert np.allclose(actual.isel(time=1, layer=0), 1.0)
+
+        lazy = uda.chunk({"time": 1})
+        actual_lazy = lazy.ugrid.laplace_interpolate(direct_solve=True)
+        assert isinstance(actual_lazy.data, dask.array.Array)
+        assert np.allclose(actual_lazy, actual)
+        with pytest.raises(ValueError, match="not supported for dask arrays"):
+            lazy.ugrid.laplace_interpolate(return_info=True)
+
     def test_to_dataset(self):
         uda2 = self.uda.copy()
         uda2.ugrid.obj.name = "test"
@@ -519,6 +643,17 @@ class TestUgridDataset:
         with pytest.raises(TypeError):
             self.uds.ugrid.rename(["mesh1d", "mesh2d"])
 
+    def test_reorder(self):
+        uds = self.uds.ugrid.assign_face_coords()
+        actual, indexes = uds.ugrid.reorder(return_index=True)
+        assert isinstance(actual, xugrid.UgridDataset)
+        grid = actual.ugrid.grid
+        face_order = indexes["mesh2d_nFaces"]
+        assert np.allclose(actual["mesh2d_face_x"], grid.face_x)
+        assert np.allclose(actual["mesh2d_face_y"], grid.face_y)
+        expected = uds["mesh2d_face_x"].values[face_order]
+        assert np.array_equal(actual["mesh2d_face_x"], expected)
+
     def test_from_geodataframe(self):
         xy = np.array(
             [
@@ -599,6 +734,38 @@ class TestUgridDataset:
         assert np.allclose(actual["x"], x)
         assert np.allclose(actual["y"], y)
 
+    def test_rasterize_tiled(self):
+        expected = self.uds.ugrid.rasterize(resolution=0.5)
+        actual = self.uds.ugrid.rasterize(resolution=0.5, tile_size=3)
+        assert isinstance(actual, xr.Dataset)
+        assert actual.compute().equals(expected)
+        for name in ["a", "b"]:
+            assert isinstance(actual[name].data, dask.array.Array)
+            assert actual[name].chunks == ((3, 1), (3, 1))
+            assert np.allclose(actual[name], expected[name], equal_nan=True)
+
+        # The face index of every tile is shared by the variables.
+        a_keys = set(actual["a"].data.__dask_graph__())
+        b_keys = set(actual["b"].data.__dask_graph__())
+        assert any(key[0].startswith("rasterize_tile") for key in a_keys & b_keys)
+
+        actual = self.uds.ugrid.rasterize_like(other=expected, tile_size=(2, 4))
+        for name in ["a", "b"]:
+            assert actual[name].chunks == ((2, 2), (4,))
+        assert actual.compute().equals(expected)
+
+        # Variables without the face dimension are left as is.
+        uds = self.uds.copy()
+        uds["scalar"] = xr.DataArray(1.0)
+        uds["node_z"] = xr.DataArray(
+            np.arange(uds.ugrid.grid.n_node), dims=["mesh2d_nNodes"]
+        )
+        expected = uds.ugrid.rasterize(resolution=0.5)
+        actual = uds.ugrid.rasterize(resolution=0.5, tile_size=3)
+        assert actual["scalar"] == 1.0
+        assert actual["node_z"].dims == ("mesh2d_nNodes",)
+        assert actual.compute().equals(expected)
+
     def test_intersect_line(self):
         p0 = (0.0, 0.0)
         p1 = (2.0, 2.0)
@@ -16,16 +16,18 @@ from xugrid.core.dataarray_accessor import UgridDataArrayAccessor
 from xugrid.core.dataset_accessor import UgridDatasetAccessor
 from xugrid.core.wrap import UgridDataArray, UgridDataset
 from xugrid.plot import plot
+from xugrid.regrid.cache import WeightCache
 from xugrid.regrid.regridder import (
     BarycentricInterpolator,
     CentroidLocatorRegridder,
     OverlapRegridder,
     RelativeOverlapRegridder,
 )
-from xugrid.ugrid.burn import burn_vector_geometry
+from xugrid.ugrid.burn import burn_vector_geometry, polygon_coverage
 from xugrid.ugrid.conventions import UgridRolesAccessor
-from xugrid.ugrid.partitioning import merge_partitions
+from xugrid.ugrid.partitioning import MergePlan, merge_partitions
 from xugrid.ugrid.polygonize import polygonize
+from xugrid.ugrid.sampling import PointSampler
 from xugrid.ugrid.snapping import snap_to_grid
 from xugrid.ugrid.ugrid1d import Ugrid1d
 from xugrid.ugrid.ugrid2d import Ugrid2d
@@ -4,7 +4,106 @@ from typing import Tuple, Union
 import numpy as np
 import xarray as xr
 
+# dask as optional dependency
+try:
+    import dask.array
+
+    DaskArray = dask.array.Array
+except ImportError:
+    DaskArray = ()
+
 import xugrid
+from xugrid.constants import IntArray, IntDType
+
+
+def _tile_shape(tile_size: Union[int, Tuple[int, int]]) -> Tuple[int, int]:
+    if isinstance(tile_size, (int, np.integer)):
+        tile_size = (tile_size, tile_size)
+    tile_size = tuple(int(size) for size in tile_size)
+    if len(tile_size) != 2 or min(tile_size) < 1:
+        raise ValueError(
+            "tile_size should be a positive integer or a tuple of two positive "
+            f"integers (nrow, ncol), received: {tile_size}"
+        )
+    return tile_size
+
+
+def _tiled_face_index(grid, x, y, chunks) -> DaskArray:
+    """
+    Lazily locate the pixels of every tile. Every task holds only the faces
+    overlapping its tile, rather than the entire grid.
+    """
+    tiles = grid._rasterize_tiles(x, y, *chunks)
+    name = "rasterize_tile-" + dask.base.tokenize(*tiles.values())
+    graph = {(name, i, j): task for (i, j), task in tiles.items()}
+    return dask.array.Array(graph, name, chunks=chunks, dtype=IntDType)
+
+
+def _take_tile(values, index: IntArray):
+    return values[..., index]
+
+
+def _sample_tile(values, index: IntArray):
+    return np.where(index == -1, np.nan, _take_tile(values, index))
+
+
+def _tiled_variable(variable: xr.Variable, face_dim: str, index, func) -> xr.Variable:
+    """
+    Apply func to every tile of the face index. As with isel, y and x take the
+    position of the face dimension.
+    """
+    dims = variable.dims
+    position = dims.index(face_dim)
+    variable = variable.transpose(..., face_dim)
+    data = variable.data
+    if isinstance(data, DaskArray):
+        data = data.rechunk({data.ndim - 1: -1})
+    else:
+        # A single chunk: every tile samples all values, e.g. all time steps.
+        data = dask.array.from_array(data, chunks=-1, name=False)
+    other_dims = variable.dims[:-1]
+    # Determine the dtype after filling the pixels outside of the grid.
+    dtype = func(np.zeros(1, dtype=data.dtype), np.array([-1])).dtype
+    out = dask.array.blockwise(
+        func,
+        (*other_dims, "y", "x"),
+        data,
+        (*other_dims, face_dim),
+        index,
+        ("y", "x"),
+        concatenate=True,
+        dtype=dtype,
+    )
+    tiled = xr.Variable((*other_dims, "y", "x"), out, attrs=variable.attrs)
+    return tiled.transpose(*dims[:position], "y", "x", *dims[position + 1 :])
+
+
+def _raster_tiled(
+    obj: Union[xr.DataArray, xr.Dataset], face_dim: str, index, x, y
+) -> Union[xr.DataArray, xr.Dataset]:
+    """
+    Sample the face variables per tile; pixels outside of the grid are NaN.
+    Coordinates along the face dimension are gathered as with isel. Other
+    variables are left as is.
+    """
+    coords = {
+        name: _tiled_variable(coord.variable, face_dim, index, _take_tile)
+        if face_dim in coord.dims
+        else coord.variable
+        for name, coord in obj.coords.items()
+    }
+    coords["y"] = y
+    coords["x"] = x
+    if isinstance(obj, xr.DataArray):
+        variable = _tiled_variable(obj.variable, face_dim, index, _sample_tile)
+        return xr.DataArray(variable, coords=coords, name=obj.name)
+    variables = {
+        name: _tiled_variable(da.variable, face_dim, index, _sample_tile)
+        if face_dim in da.dims
+        else da.variable
+        for name, da in obj.data_vars.items()
+    }
+    return xr.Dataset(variables, coords=coords, attrs=obj.attrs)
 
 
 class AbstractUgridAccessor(abc.ABC):
@@ -89,6 +188,25 @@ class AbstractUgridAccessor(abc.ABC):
         y = np.arange(ymax - 0.5 * d, ymin, -d)
         return x, y
 
+    @staticmethod
+    def _raster_tiled(
+        obj, grid, x, y, tile_size: Union[int, Tuple[int, int]]
+    ) -> Union[xr.DataArray, xr.Dataset]:
+        """
+        Lazily rasterize the face data of grid, tile by tile. The face index
+        of every tile is computed once, and shared by all variables. The
+        result equals that of ``_raster``, as a dask array.
+        """
+        if DaskArray == ():
+            raise ImportError("dask is required for tiled rasterization")
+        x = np.asarray(x)
+        y = np.asarray(y)
+        chunks = dask.array.core.normalize_chunks(
+            _tile_shape(tile_size), (y.size, x.size)
+        )
+        index = _tiled_face_index(grid, x, y, chunks)
+        return _raster_tiled(obj, grid.face_dimension, index, x, y)
+
     def _raster(self, x, y, index) -> xr.DataArray:
         index = index.ravel()
         indexer = xr.DataArray(
@@ -96,8 +214,18 @@ class AbstractUgridAccessor(abc.ABC):
             coords={"y": y, "x": x},
             dims=["y", "x"],
         )
-        out = self.obj.isel({self.grid.face_dimension: indexer}).where(indexer != -1)
-        return out
+        face_dim = self.grid.face_dimension
+        out = self.obj.isel({face_dim: indexer})
+        if isinstance(out, xr.DataArray):
+            return out.where(indexer != -1)
+        # Only mask the face variables: other variables are left as is.
+        return out.assign(
+            {
+                name: out[name].where(indexer != -1)
+                for name, da in self.obj.data_vars.items()
+                if face_dim in da.dims
+            }
+        )
 
     def clip_box(
         self,
@@ -123,7 +251,7 @@ class AbstractUgridAccessor(abc.ABC):
         return self.sel(x=slice(xmin, xmax), y=slice(ymin, ymax))
 
     def partition_by_label(
-        self, labels: np.ndarray
+        self, labels: np.ndarray, n_halo: int = 0
     ) -> Union["xugrid.UgridDataArray", "xugrid.UgridDataset"]:
         """
         Partition a grid by labels.
@@ -131,6 +259,13 @@ class AbstractUgridAccessor(abc.ABC):
         Parameters
         ----------
         labels: np.ndarray of integers labeling each face.
+        n_halo: int, default 0
+            The number of layers of neighboring faces of other partitions to
+            include in every partition, e.g. for neighbor-based operations
+            per partition. If larger than zero, every partition contains a
+            boolean coordinate ``{grid.name}_owned`` marking the faces owned
+            by the partition. ``xugrid.merge_partitions`` merges only the
+            owned faces. Only supported for Ugrid2d topologies.
 
         Returns
         -------
@@ -138,25 +273,42 @@ class AbstractUgridAccessor(abc.ABC):
         """
         from xugrid.ugrid import partitioning
 
-        return partitioning.partition_by_label(self.grid, self.obj, labels)
+        return partitioning.partition_by_label(self.grid, self.obj, labels, n_halo)
 
     def partition(
-        self, n_part: int
+        self,
+        n_part: int,
+        n_halo: int = 0,
+        method: str = "metis",
+        weights: np.ndarray = None,
     ) -> Union["xugrid.UgridDataArray", "xugrid.UgridDataset"]:
         """
         Partition a grid into a given number of parts.
 
+        See :meth:`xugrid.Ugrid2d.label_partitions` for the available methods.
+
         Parameters
         ----------
         n_part: integer
             The number of parts to partition the mesh.
+        n_halo: int, default 0
+            The number of layers of neighboring faces of other partitions to
+            include in every partition, e.g. for neighbor-based operations
+            per partition. If larger than zero, every partition contains a
+            boolean coordinate ``{grid.name}_owned`` marking the faces owned
+            by the partition. ``xugrid.merge_partitions`` merges only the
+            owned faces. Only supported for Ugrid2d topologies.
+        method: str, default "metis"
+            One of "metis", "hilbert", "morton", "rcb".
+        weights: np.ndarray of numbers, optional
+            The weight of every face, to balance the partitions by.
 
         Returns
         -------
         partitioned: list of partitions
         """
-        labels = self.grid.label_partitions(n_part)
-        return self.partition_by_label(labels)
+        labels = self.grid.label_partitions(n_part, method=method, weights=weights)
+        return self.partition_by_label(labels, n_halo)
 
     def to_netcdf(self, *args, **kwargs):
         """
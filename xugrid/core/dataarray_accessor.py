@@ -1,4 +1,4 @@
-from typing import Dict, List, Sequence, Tuple, Union
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import scipy.sparse
@@ -170,7 +170,7 @@ class UgridDataArrayAccessor(AbstractUgridAccessor):
         """
         return self._sel(self.obj, self.grid, x, y)
 
-    def sel_points(self, x, y):
+    def sel_points(self, x, y, method: str = "containing"):
         """
         Select points in the unstructured grid.
 
@@ -181,14 +181,23 @@ class UgridDataArrayAccessor(AbstractUgridAccessor):
         ----------
         x: ndarray of floats with shape ``(n_points,)``
         y: ndarray of floats with shape ``(n_points,)``
+        method: str, default "containing"
+            ``"containing"`` takes the value of the face containing the point.
+            ``"barycentric"`` interpolates between the face centroids.
+            ``"idw"`` interpolates the values of the containing face and its
+            neighbors by inverse distance weighting.
 
         Returns
         -------
         points: Union[xr.DataArray, xr.Dataset]
         """
-        return self.grid.sel_points(self.obj, x, y)
+        return self.grid.sel_points(self.obj, x, y, method)
 
-    def rasterize(self, resolution: float) -> xr.DataArray:
+    def rasterize(
+        self,
+        resolution: float,
+        tile_size: Optional[Union[int, Tuple[int, int]]] = None,
+    ) -> xr.DataArray:
         """
         Rasterize unstructured grid by sampling.
 
@@ -196,38 +205,63 @@ class UgridDataArrayAccessor(AbstractUgridAccessor):
         ----------
         resolution: float
             Spacing in x and y.
+        tile_size: int or tuple of two ints (nrow, ncol), optional
+            If provided, the raster is computed lazily, tile by tile: the
+            result is a dask array with a chunk per tile. Requires dask.
 
         Returns
         -------
         rasterized: xr.DataArray
         """
+        if tile_size is not None:
+            x, y = self._raster_xy(self.grid.bounds, resolution)
+            return self._raster_tiled(self.obj, self.grid, x, y, tile_size)
         x, y, index = self.grid.rasterize(resolution)
         return self._raster(x, y, index)
 
-    def rasterize_like(self, other: Union[xr.DataArray, xr.Dataset]) -> xr.DataArray:
+    def rasterize_like(
+        self,
+        other: Union[xr.DataArray, xr.Dataset],
+        tile_size: Optional[Union[int, Tuple[int, int]]] = None,
+    ) -> xr.DataArray:
         """
         Rasterize unstructured grid by sampling on the x and y coordinates
         of ``other``.
 
         Parameters
         ----------
-        resolution: float
-            Spacing in x and y.
         other: Union[xr.DataArray, xr.Dataset]
             Object to take x and y coordinates from.
+        tile_size: int or tuple of two ints (nrow, ncol), optional
+            If provided, the raster is computed lazily, tile by tile: the
+            result is a dask array with a chunk per tile. The face index of a
+            tile is computed once for all other dimensions (e.g. time).
+            Requires dask.
 
         Returns
         -------
         rasterized: xr.DataArray
+
+        Examples
+        --------
+        Rasterize to a raster that does not fit in memory, and write it tile
+        by tile to a Zarr store:
+
+        >>> raster = uda.ugrid.rasterize_like(like, tile_size=2048)
+        >>> raster.to_zarr("raster.zarr")
         """
-        x, y, index = self.grid.rasterize_like(
-            x=other["x"].values,
-            y=other["y"].values,
-        )
+        x = other["x"].values
+        y = other["y"].values
+        if tile_size is not None:
+            return self._raster_tiled(self.obj, self.grid, x, y, tile_size)
+        x, y, index = self.grid.rasterize_like(x=x, y=y)
         return self._raster(x, y, index)
 
     def intersect_line(
-        self, start: Sequence[float], end: Sequence[float]
+        self,
+        start: Sequence[float],
+        end: Sequence[float],
+        method: str = "containing",
     ) -> xr.DataArray:
         """
         Intersect a line with the grid of this data, and fetch the values of
@@ -240,15 +274,21 @@ class UgridDataArrayAccessor(AbstractUgridAccessor):
             coordinate pair (x, y), designating the start point of the line.
         end: sequence of two floats
             coordinate pair (x, y), designating the end point of the line.
+        method: str, default "containing"
+            ``"containing"`` takes the values of the intersected faces.
+            ``"barycentric"`` or ``"idw"`` interpolate the values at the
+            midpoints of the intersections, see :meth:`sel_points`.
 
         Returns
         -------
         intersection: xr.DataArray
             The length along the line is returned as the "s" coordinate.
         """
-        return self.grid.intersect_line(self.obj, start, end)
+        return self.grid.intersect_line(self.obj, start, end, method)
 
-    def intersect_linestring(self, linestring) -> xr.DataArray:
+    def intersect_linestring(
+        self, linestring, method: str = "containing"
+    ) -> xr.DataArray:
         """
         Intersect the grid along a collection of linestrings. Returns a new DataArray
         with the values for each intersected segment.
@@ -256,13 +296,17 @@ class UgridDataArrayAccessor(AbstractUgridAccessor):
         Parameters
         ----------
         linestring: shapely.LineString
+        method: str, default "containing"
+            ``"containing"`` takes the values of the intersected faces.
+            ``"barycentric"`` or ``"idw"`` interpolate the values at the
+            midpoints of the intersections, see :meth:`sel_points`.
 
         Returns
         -------
         intersection: xr.DataArray
             The length along the linestring is returned as the "s" coordinate.
         """
-        return self.grid.intersect_linestring(self.obj, linestring)
+        return self.grid.intersect_linestring(self.obj, linestring, method)
 
     @property
     def crs(self):
@@ -384,7 +428,9 @@ class UgridDataArrayAccessor(AbstractUgridAccessor):
         geometry = self.grid.to_shapely(dim)
         return gpd.GeoDataFrame(df, geometry=geometry, crs=self.grid.crs)
 
-    def _binary_iterate(self, iterations: int, mask, value, border_value):
+    def _binary_iterate(
+        self, iterations: int, mask, value, border_value, return_iterations
+    ):
         if border_value == value:
             exterior = self.grid.exterior_faces
         else:
@@ -402,7 +448,16 @@ class UgridDataArrayAccessor(AbstractUgridAccessor):
                 mask,
                 exterior,
                 border_value,
+                return_iterations,
             )
+            if return_iterations:
+                output, flipped = output
+                da = obj.copy(data=output)
+                da_flipped = obj.copy(data=flipped)
+                return (
+                    UgridDataArray(da, self.grid.copy()),
+                    UgridDataArray(da_flipped, self.grid.copy()),
+                )
             da = obj.copy(data=output)
             return UgridDataArray(da, self.grid.copy())
         elif isinstance(obj, xr.Dataset):
@@ -415,6 +470,7 @@ class UgridDataArrayAccessor(AbstractUgridAccessor):
         iterations: int = 1,
         mask=None,
         border_value=False,
+        return_iterations: bool = False,
     ):
         """
         Binary dilation can be used on a boolean array to expand the "shape" of
@@ -425,20 +481,31 @@ class UgridDataArrayAccessor(AbstractUgridAccessor):
         Parameters
         ----------
         iterations: int, default: 1
+            If smaller than 1, the dilation is repeated until the result no
+            longer changes.
         mask: 1d array of bool, optional
         border_value: bool, default value: False
+        return_iterations: bool, default False
+            Whether to also return the iteration at which every face became
+            True: zero for faces which were True already, -1 for faces which
+            remained False.
 
         Returns
         -------
         dilated: UgridDataArray
+        iterations: UgridDataArray of integers, optional
+            Only returned if ``return_iterations`` is True.
         """
-        return self._binary_iterate(iterations, mask, True, border_value)
+        return self._binary_iterate(
+            iterations, mask, True, border_value, return_iterations
+        )
 
     def binary_erosion(
         self,
         iterations: int = 1,
         mask=None,
         border_value=False,
+        return_iterations: bool = False,
     ):
         """
         Binary erosion can be used on a boolean array to shrink the "shape" of
@@ -449,14 +516,78 @@ class UgridDataArrayAccessor(AbstractUgridAccessor):
         Parameters
         ----------
         iterations: int, default: 1
+            If smaller than 1, the erosion is repeated until the result no
+            longer changes.
         mask: 1d array of bool, optional
         border_value: bool, default value: False
+        return_iterations: bool, default False
+            Whether to also return the iteration at which every face became
+            False: zero for faces which were False already, -1 for faces which
+            remained True.
 
         Returns
         -------
         eroded: UgridDataArray
+        iterations: UgridDataArray of integers, optional
+            Only returned if ``return_iterations`` is True.
+        """
+        return self._binary_iterate(
+            iterations, mask, False, border_value, return_iterations
+        )
+
+    def distance_transform(self, xy_weights: bool = False):
         """
-        return self._binary_iterate(iterations, mask, False, border_value)
+        Compute the distance along the grid to the nearest source, and the
+        index of the nearest source, for every face or node.
+
+        The sources are the True values of this boolean UgridDataArray. The
+        distance is measured along the face face connectivity for face data,
+        or along the edges for node data: by default as the number of
+        connections, e.g. the number of faces from the boundary. Runs a
+        multi-source breadth first search, or Dijkstra's algorithm if
+        ``xy_weights`` is True.
+
+        Parameters
+        ----------
+        xy_weights: bool, default False.
+            Whether to measure the distance along the connections as the
+            Euclidean distance between the centroids (for faces) or the nodes.
+            If ``False``, every connection has length 1.
+
+        Returns
+        -------
+        distance: UgridDataArray of floats
+            ``np.inf`` for faces or nodes which cannot be reached from any
+            source.
+        nearest: UgridDataArray of integers
+            Index of the nearest source, -1 if none can be reached.
+        """
+        grid = self.grid
+        da = self.obj
+        if da.ndim != 1:
+            raise NotImplementedError
+        dim = da.dims[0]
+        if dim == grid.node_dimension:
+            A = grid.node_node_connectivity
+            xy = grid.node_coordinates
+        elif grid.topology_dimension == 2 and dim == grid.face_dimension:
+            A = grid.face_face_connectivity
+            xy = grid.centroids
+        else:
+            raise ValueError(
+                "Data should be located on the nodes or faces of the grid. "
+                f"Received dimension: {dim}"
+            )
+
+        weights = None
+        if xy_weights:
+            i = np.repeat(np.arange(A.shape[0]), np.diff(A.indptr))
+            weights = np.linalg.norm(xy[A.indices] - xy[i], axis=1)
+        distance, nearest = connectivity.graph_distance(A, da.values, weights)
+        return (
+            UgridDataArray(da.copy(data=distance), grid),
+            UgridDataArray(da.copy(data=nearest), grid),
+        )
 
     def connected_components(self):
         """
@@ -497,6 +628,33 @@ class UgridDataArrayAccessor(AbstractUgridAccessor):
             reordered_grid,
         )
 
+    def reorder(self, method: str = "hilbert", return_index: bool = False):
+        """
+        Reorder the nodes, edges, and faces of the grid, and the data along
+        with them, for a spatially coherent memory layout.
+
+        See :meth:`xugrid.Ugrid2d.reorder` for the available methods.
+
+        Parameters
+        ----------
+        method: str, default "hilbert"
+            One of "hilbert", "morton", "rcm".
+        return_index: bool, default False
+            Whether to also return the permutation of every dimension.
+
+        Returns
+        -------
+        reordered: UgridDataArray
+        indexes: dict, optional
+            Only returned if ``return_index`` is True.
+        """
+        reordered_grid, indexes = self.grid.reorder(method)
+        reordered_data = self.obj.isel(indexes, missing_dims="ignore")
+        reordered = UgridDataArray(reordered_data, reordered_grid)
+        if return_index:
+            return reordered, indexes
+        return reordered
+
     def laplace_interpolate(
         self,
         xy_weights: bool = True,
@@ -507,6 +665,9 @@ class UgridDataArrayAccessor(AbstractUgridAccessor):
         options: dict = None,
         tol: float = 1.0e-5,
         maxiter: int = 250,
+        solver: Union[str, Callable] = None,
+        x0=None,
+        return_info: bool = False,
     ):
         """
         Fill gaps in ``data`` (``np.nan`` values) using Laplace interpolation.
@@ -515,11 +676,17 @@ class UgridDataArrayAccessor(AbstractUgridAccessor):
         values functioning as fixed potential boundary conditions.
 
         Note that an iterative solver method will be required for large grids.
-        In this case, some experimentation with the solver settings may be
+        The ``"amg"`` solver generally requires the fewest iterations. With the
+        ``"ilu"`` solver, some experimentation with the solver settings may be
         required to find a converging solution of sufficient accuracy. Refer to
         the documentation of :py:func:`scipy.sparse.linalg.spilu` and
         :py:func:`scipy.sparse.linalg.cg`.
 
+        Data with dimensions other than the face dimension (e.g. time or
+        layer) is interpolated slice by slice. Slices with identical nodata
+        faces share the system of equations, which is then set up only once.
+        Dask arrays are interpolated chunk by chunk, in parallel.
+
         Parameters
         ----------
         xy_weights: bool, default False.
@@ -543,16 +710,31 @@ class UgridDataArrayAccessor(AbstractUgridAccessor):
             Convergence tolerance for ``scipy.sparse.linalg.cg``.
         maxiter: int, default 250.
             Maximum number of iterations for ``scipy.sparse.linalg.cg``.
+        solver: str or callable, optional
+            One of ``"direct"``, ``"ilu"``, ``"jacobi"``, ``"amg"``, or a
+            callable ``solver(A, rhs, x0)``. See
+            :func:`xugrid.ugrid.interpolate.laplace_interpolate`. Defaults to
+            ``"direct"`` if ``direct_solve`` is True, ``"ilu"`` otherwise.
+        x0: UgridDataArray or ndarray of floats, optional
+            Initial guess for the iterative solvers, e.g. the result of a
+            previous interpolation. Must have the same shape as the data.
+        return_info: bool, default False.
+            Whether to return the convergence information as well. Not
+            supported for dask arrays.
 
         Returns
         -------
         filled: UgridDataArray of floats
+        info: SolverInfo or list of SolverInfo
+            Only returned if ``return_info`` is True. A list with an entry per
+            slice if the data has dimensions other than the face dimension.
         """
         grid = self.grid
         da = self.obj
         if grid.topology_dimension != 2:
             raise NotImplementedError
-        if len(da.dims) > 1 or da.dims[0] != grid.face_dimension:
+        face_dim = grid.face_dimension
+        if face_dim not in da.dims:
             raise NotImplementedError
 
         connectivity = grid.face_face_connectivity.copy()
@@ -563,19 +745,63 @@ class UgridDataArrayAccessor(AbstractUgridAccessor):
             j = coo.col
             connectivity.data = 1.0 / np.linalg.norm(xy[j] - xy[i], axis=1)
 
-        filled = laplace_interpolate(
+        kwargs = {
+            "use_weights": xy_weights,
+            "direct_solve": direct_solve,
+            "drop_tol": drop_tol,
+            "fill_factor": fill_factor,
+            "drop_rule": drop_rule,
+            "options": options,
+            "tol": tol,
+            "maxiter": maxiter,
+            "solver": solver,
+        }
+        # Interpolate all slices along the other dimensions at once, with the
+        # face dimension last.
+        data = da.transpose(..., face_dim)
+        if x0 is not None:
+            x0 = getattr(x0, "obj", x0)
+            if isinstance(x0, xr.DataArray):
+                x0 = x0.transpose(*da.dims)
+            else:
+                x0 = da.copy(data=np.asarray(x0))
+            x0 = x0.transpose(..., face_dim)
+
+        if data.chunks is not None:
+            if return_info:
+                raise ValueError("return_info is not supported for dask arrays")
+
+            def interpolate(values, guess=None):
+                return laplace_interpolate(connectivity, values, x0=guess, **kwargs)
+
+            # Every chunk is interpolated separately, in parallel. The face
+            # dimension must not be chunked.
+            args = [data.chunk({face_dim: -1})]
+            if x0 is not None:
+                args.append(x0.chunk({face_dim: -1}))
+            filled = xr.apply_ufunc(
+                interpolate,
+                *args,
+                input_core_dims=[[face_dim]] * len(args),
+                output_core_dims=[[face_dim]],
+                dask="parallelized",
+                output_dtypes=[float],
+                keep_attrs=True,
+            )
+            return UgridDataArray(filled.transpose(*da.dims), grid)
+
+        result = laplace_interpolate(
             connectivity=connectivity,
-            data=da.values,
-            use_weights=xy_weights,
-            direct_solve=direct_solve,
-            drop_tol=drop_tol,
-            fill_factor=fill_factor,
-            drop_rule=drop_rule,
-            options=options,
-            tol=tol,
-            maxiter=maxiter,
+            data=data.values,
+            x0=None if x0 is None else x0.values,
+            return_info=return_info,
+            **kwargs,
         )
-        da_filled = da.copy(data=filled)
+        if return_info:
+            filled, info = result
+            da_filled = data.copy(data=filled).transpose(*da.dims)
+            return UgridDataArray(da_filled, grid), info
+        da_filled = data.copy(data=result).transpose(*da.dims)
         return UgridDataArray(da_filled, grid)
 
     def to_dataset(self, optional_attributes: bool = False):
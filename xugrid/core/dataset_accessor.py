@@ -1,4 +1,4 @@
-from typing import Dict, List, Sequence, Tuple, Union
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -7,6 +7,7 @@ import xarray as xr
 # from xugrid.plot.pyvista import to_pyvista_grid
 from xugrid.core.accessorbase import AbstractUgridAccessor
 from xugrid.core.wrap import UgridDataset
+from xugrid.ugrid.ugrid2d import Ugrid2d
 from xugrid.ugrid.ugridbase import UgridType
 
 
@@ -217,7 +218,7 @@ class UgridDatasetAccessor(AbstractUgridAccessor):
             result = self._sel(result, grid, x, y)
         return result
 
-    def sel_points(self, x, y):
+    def sel_points(self, x, y, method: str = "containing"):
         """
         Select points in the unstructured grid.
 
@@ -228,6 +229,11 @@ class UgridDatasetAccessor(AbstractUgridAccessor):
         ----------
         x: ndarray of floats with shape ``(n_points,)``
         y: ndarray of floats with shape ``(n_points,)``
+        method: str, default "containing"
+            ``"containing"`` takes the value of the face containing the point.
+            ``"barycentric"`` interpolates between the face centroids.
+            ``"idw"`` interpolates the values of the containing face and its
+            neighbors by inverse distance weighting.
 
         Returns
         -------
@@ -236,10 +242,14 @@ class UgridDatasetAccessor(AbstractUgridAccessor):
         """
         result = self.obj
         for grid in self.grids:
-            result = grid.sel_points(result, x, y)
+            result = grid.sel_points(result, x, y, method)
         return result
 
-    def rasterize(self, resolution: float) -> xr.Dataset:
+    def rasterize(
+        self,
+        resolution: float,
+        tile_size: Optional[Union[int, Tuple[int, int]]] = None,
+    ) -> xr.Dataset:
         """
         Rasterize all face data on 2D unstructured grids by sampling.
 
@@ -247,43 +257,76 @@ class UgridDatasetAccessor(AbstractUgridAccessor):
         ----------
         resolution: float
             Spacing in x and y.
+        tile_size: int or tuple of two ints (nrow, ncol), optional
+            If provided, the raster is computed lazily, tile by tile: the
+            variables are dask arrays with a chunk per tile. Requires dask.
 
         Returns
         -------
         rasterized: xr.Dataset
         """
+        if tile_size is not None:
+            x, y = self._raster_xy(self.total_bounds, resolution)
+            return self._rasterize_tiled(x, y, tile_size)
         datasets = []
         for grid in self.grids:
             xx, yy, index = grid.rasterize(resolution, self.total_bounds)
             datasets.append(self._raster(xx, yy, index))
         return xr.merge(datasets)
 
-    def rasterize_like(self, other: Union[xr.DataArray, xr.Dataset]) -> xr.Dataset:
+    def rasterize_like(
+        self,
+        other: Union[xr.DataArray, xr.Dataset],
+        tile_size: Optional[Union[int, Tuple[int, int]]] = None,
+    ) -> xr.Dataset:
         """
         Rasterize unstructured all face data on 2D unstructured grids by
         sampling on the x and y coordinates of ``other``.
 
         Parameters
         ----------
-        resolution: float
-            Spacing in x and y.
         other: Union[xr.DataArray, xr.Dataset]
             Object to take x and y coordinates from.
+        tile_size: int or tuple of two ints (nrow, ncol), optional
+            If provided, the raster is computed lazily, tile by tile: the
+            variables are dask arrays with a chunk per tile. The face index of
+            a tile is computed once, and shared by all variables. Requires
+            dask.
 
         Returns
         -------
         rasterized: xr.Dataset
+
+        Examples
+        --------
+        Rasterize to a raster that does not fit in memory, and write it tile
+        by tile to a Zarr store:
+
+        >>> raster = uds.ugrid.rasterize_like(like, tile_size=2048)
+        >>> raster.to_zarr("raster.zarr")
         """
         x = other["x"].values
         y = other["y"].values
+        if tile_size is not None:
+            return self._rasterize_tiled(x, y, tile_size)
         datasets = []
         for grid in self.grids:
             xx, yy, index = grid.rasterize_like(x, y)
             datasets.append(self._raster(xx, yy, index))
         return xr.merge(datasets)
 
+    def _rasterize_tiled(self, x, y, tile_size) -> xr.Dataset:
+        result = self.obj
+        for grid in self.grids:
+            if grid.topology_dimension == 2:
+                result = self._raster_tiled(result, grid, x, y, tile_size)
+        return result
+
     def intersect_line(
-        self, start: Sequence[float], end: Sequence[float]
+        self,
+        start: Sequence[float],
+        end: Sequence[float],
+        method: str = "containing",
     ) -> xr.Dataset:
         """
         Intersect a line with the grid of this data, and fetch the values of
@@ -296,6 +339,10 @@ class UgridDatasetAccessor(AbstractUgridAccessor):
             coordinate pair (x, y), designating the start point of the line.
         end: sequence of two floats
             coordinate pair (x, y), designating the end point of the line.
+        method: str, default "containing"
+            ``"containing"`` takes the values of the intersected faces.
+            ``"barycentric"`` or ``"idw"`` interpolate the values at the
+            midpoints of the intersections, see :meth:`sel_points`.
 
         Returns
         -------
@@ -305,10 +352,12 @@ class UgridDatasetAccessor(AbstractUgridAccessor):
         """
         obj = self.obj
         for grid in self.grids:
-            obj = grid.intersect_line(obj, start, end)
+            obj = grid.intersect_line(obj, start, end, method)
         return obj
 
-    def intersect_linestring(self, linestring) -> xr.Dataset:
+    def intersect_linestring(
+        self, linestring, method: str = "containing"
+    ) -> xr.Dataset:
         """
         Intersect the grid along a collection of linestrings. Returns a new Dataset
         with the values for each intersected segment.
@@ -316,6 +365,10 @@ class UgridDatasetAccessor(AbstractUgridAccessor):
         Parameters
         ----------
         linestring: shapely.LineString
+        method: str, default "containing"
+            ``"containing"`` takes the values of the intersected faces.
+            ``"barycentric"`` or ``"idw"`` interpolate the values at the
+            midpoints of the intersections, see :meth:`sel_points`.
 
         Returns
         -------
@@ -325,7 +378,7 @@ class UgridDatasetAccessor(AbstractUgridAccessor):
         """
         obj = self.obj
         for grid in self.grids:
-            obj = grid.intersect_linestring(obj, linestring)
+            obj = grid.intersect_linestring(obj, linestring, method)
         return obj
 
     def to_dataset(self, optional_attributes: bool = False):
@@ -444,6 +497,42 @@ class UgridDatasetAccessor(AbstractUgridAccessor):
         uds = UgridDataset(self.obj, grids)
         return uds.ugrid.assign_node_coords()
 
+    def reorder(self, method: str = "hilbert", return_index: bool = False):
+        """
+        Reorder the nodes, edges, and faces of every 2D grid, and the data
+        along with them, for a spatially coherent memory layout. Other grids
+        are left as is.
+
+        See :meth:`xugrid.Ugrid2d.reorder` for the available methods.
+
+        Parameters
+        ----------
+        method: str, default "hilbert"
+            One of "hilbert", "morton", "rcm".
+        return_index: bool, default False
+            Whether to also return the permutation of every dimension.
+
+        Returns
+        -------
+        reordered: UgridDataset
+        indexes: dict, optional
+            Only returned if ``return_index`` is True.
+        """
+        grids = []
+        indexes = {}
+        for grid in self.grids:
+            if isinstance(grid, Ugrid2d):
+                grid, grid_indexes = grid.reorder(method)
+                indexes.update(grid_indexes)
+            else:
+                grid = grid.copy()
+            grids.append(grid)
+
+        reordered = UgridDataset(self.obj.isel(indexes, missing_dims="ignore"), grids)
+        if return_index:
+            return reordered, indexes
+        return reordered
+
     def to_geodataframe(
         self, dim_order=None
     ) -> "geopandas.GeoDataFrame":  # type: ignore # noqa
@@ -0,0 +1,241 @@
+"""
+Persistent on-disk cache for regridding weights.
+
+Computing the weights requires searching the source grid for every face of the
+target grid, which can dominate the cost of regridding for large meshes. The
+weights depend only on the source and target topologies and the type of
+regridder, so they can be stored once and re-used.
+
+Every entry is stored in its own directory, named after a hash of the source
+and target topology. The weight arrays are stored as ``.npy`` files, so they
+can be memory-mapped on load. Entries are evicted on a least-recently-used
+basis when the total size of the cache exceeds ``max_size``.
+"""
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+from xugrid.regrid.structured import StructuredGrid2d
+from xugrid.regrid.unstructured import UnstructuredGrid2d
+from xugrid.regrid.weight_matrix import WeightMatrixCOO, WeightMatrixCSR
+
+WEIGHT_MATRIX_TYPES = {
+    "WeightMatrixCOO": WeightMatrixCOO,
+    "WeightMatrixCSR": WeightMatrixCSR,
+}
+
+
+def _grid_arrays(grid):
+    if isinstance(grid, UnstructuredGrid2d):
+        topology = grid.ugrid_topology
+        return (
+            np.array(topology.fill_value),
+            topology.node_x,
+            topology.node_y,
+            topology.face_node_connectivity,
+        )
+    elif isinstance(grid, StructuredGrid2d):
+        return (
+            grid.xbounds.bounds,
+            grid.xbounds.index,
+            grid.ybounds.bounds,
+            grid.ybounds.index,
+        )
+    else:
+        raise TypeError(
+            "Expected UnstructuredGrid2d or StructuredGrid2d, received: "
+            f"{type(grid).__name__}"
+        )
+
+
+def _update_hash(hasher, grid) -> None:
+    hasher.update(type(grid).__name__.encode())
+    for array in _grid_arrays(grid):
+        array = np.ascontiguousarray(array)
+        hasher.update(str(array.dtype).encode())
+        hasher.update(str(array.shape).encode())
+        hasher.update(array.data)
+    return
+
+
+def _directory_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.iterdir() if f.is_file())
+
+
+class WeightCache:
+    """
+    A content-addressed, size-bounded cache of regridding weights on disk.
+
+    Parameters
+    ----------
+    path: str or Path
+        Directory to store the cached weights in. Created if it does not exist.
+    max_size: int, optional
+        Maximum total size of the cache in bytes. When exceeded, the least
+        recently used entries are removed. Defaults to no limit.
+    mmap: bool, default True
+        Whether to memory-map the weight arrays when loading them.
+
+    Examples
+    --------
+
+    >>> cache = xugrid.WeightCache("regrid-cache", max_size=2e9)
+    >>> regridder = xugrid.OverlapRegridder(source, target, cache=cache)
+
+    Constructing the regridder again for the same topologies loads the
+    weights from the cache instead of computing them.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        max_size: Optional[int] = None,
+        mmap: bool = True,
+    ):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self.mmap = mmap
+
+    @staticmethod
+    def key(kind: str, source, target) -> str:
+        """
+        Compute the cache key from the regridder kind and the source and
+        target grids.
+
+        Parameters
+        ----------
+        kind: str
+            Name of the regridder class.
+        source: UnstructuredGrid2d or StructuredGrid2d
+        target: UnstructuredGrid2d or StructuredGrid2d
+
+        Returns
+        -------
+        key: str
+        """
+        hasher = hashlib.sha256()
+        hasher.update(kind.encode())
+        _update_hash(hasher, source)
+        _update_hash(hasher, target)
+        return hasher.hexdigest()
+
+    def _entries(self):
+        return [
+            entry
+            for entry in self.path.iterdir()
+            if entry.is_dir() and (entry / "meta.json").exists()
+        ]
+
+    @property
+    def size(self) -> int:
+        """Total size of the cached entries in bytes."""
+        return sum(_directory_size(entry) for entry in self._entries())
+
+    def __contains__(self, key: str) -> bool:
+        return (self.path / key / "meta.json").exists()
+
+    def get(self, key: str) -> Union[WeightMatrixCOO, WeightMatrixCSR, None]:
+        """
+        Load the weights stored under key. Returns None if not present.
+        """
+        entry = self.path / key
+        metafile = entry / "meta.json"
+        if not metafile.exists():
+            return None
+
+        with open(metafile) as f:
+            meta = json.load(f)
+        matrix_type = WEIGHT_MATRIX_TYPES[meta["type"]]
+        mmap_mode = "r" if self.mmap else None
+        fields = {}
+        for field in matrix_type._fields:
+            if field in meta["scalars"]:
+                fields[field] = meta["scalars"][field]
+            else:
+                fields[field] = np.load(entry / f"{field}.npy", mmap_mode=mmap_mode)
+
+        # Mark this entry as recently used.
+        os.utime(metafile)
+        return matrix_type(**fields)
+
+    def put(self, key: str, weights: Union[WeightMatrixCOO, WeightMatrixCSR]) -> None:
+        """
+        Store the weights under key, then evict the least recently used
+        entries if the cache exceeds its maximum size.
+        """
+        typename = type(weights).__name__
+        if typename not in WEIGHT_MATRIX_TYPES:
+            raise TypeError(
+                f"Expected WeightMatrixCOO or WeightMatrixCSR, received: {typename}"
+            )
+
+        # Write into a temporary directory first, so that concurrent readers
+        # never find an incomplete entry.
+        entry = self.path / key
+        tmp = self.path / f".{key}.{os.getpid()}.tmp"
+        if tmp.exists():
+            shutil.rmtree(tmp)
+        tmp.mkdir()
+        scalars = {}
+        for field, value in zip(weights._fields, weights):
+            if isinstance(value, np.ndarray):
+                np.save(tmp / f"{field}.npy", value)
+            else:
+                scalars[field] = int(value)
+        with open(tmp / "meta.json", "w") as f:
+            json.dump({"type": typename, "scalars": scalars}, f)
+
+        if entry.exists():
+            shutil.rmtree(entry)
+        try:
+            tmp.rename(entry)
+        except OSError:
+            # Another process has stored the same entry in the meantime.
+            shutil.rmtree(tmp, ignore_errors=True)
+
+        self.evict()
+        return
+
+    def evict(self) -> None:
+        """
+        Remove least recently used entries until the cache size is smaller
+        than max_size.
+        """
+        if self.max_size is None:
+            return
+
+        entries = sorted(
+            self._entries(), key=lambda entry: (entry / "meta.json").stat().st_mtime_ns
+        )
+        sizes = [_directory_size(entry) for entry in entries]
+        total = sum(sizes)
+        for entry, size in zip(entries, sizes):
+            if total <= self.max_size:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+        return
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        for entry in self._entries():
+            shutil.rmtree(entry, ignore_errors=True)
+        return
+
+
+def as_weight_cache(cache: Union[WeightCache, str, os.PathLike]) -> WeightCache:
+    if isinstance(cache, WeightCache):
+        return cache
+    elif isinstance(cache, (str, os.PathLike)):
+        return WeightCache(cache)
+    else:
+        raise TypeError(
+            "cache must be WeightCache, str, or PathLike. Received: "
+            f"{type(cache).__name__}"
+        )
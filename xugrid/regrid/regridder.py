@@ -6,6 +6,7 @@ from typing import Callable, Optional, Tuple, Union
 
 import numba
 import numpy as np
+import scipy.sparse
 import xarray as xr
 
 import xugrid as xu
@@ -22,6 +23,7 @@ import xugrid
 from xugrid.constants import FloatArray
 from xugrid.core.wrap import UgridDataArray
 from xugrid.regrid import reduce
+from xugrid.regrid.cache import WeightCache, as_weight_cache
 from xugrid.regrid.structured import StructuredGrid2d
 from xugrid.regrid.unstructured import UnstructuredGrid2d
 from xugrid.regrid.weight_matrix import (
@@ -37,21 +39,191 @@ def make_regrid(func):
     """
     Uses a closure to capture func, so numba can compile it efficiently without
     function call overhead.
+
+    The returned function allocates the output. Its ``into`` attribute writes
+    into a preallocated output array of shape ``(n_extra, size)`` instead.
     """
     f = numba.njit(func, inline="always")
 
-    def _regrid(source: FloatArray, A: WeightMatrixCSR, size: int):
+    def _regrid_into(source: FloatArray, A: WeightMatrixCSR, out: FloatArray):
         n_extra = source.shape[0]
-        out = np.full((n_extra, size), np.nan)
         for extra_index in numba.prange(n_extra):
             source_flat = source[extra_index]
+            out[extra_index, :] = np.nan
             for target_index in range(A.n):
                 indices, weights = nzrange(A, target_index)
                 if len(indices) > 0:
                     out[extra_index, target_index] = f(source_flat, indices, weights)
         return out
 
-    return numba.njit(_regrid, parallel=True, cache=True)
+    regrid_into = numba.njit(_regrid_into, parallel=True, cache=True)
+
+    def _regrid(source: FloatArray, A: WeightMatrixCSR, size: int):
+        return regrid_into(source, A, np.empty((source.shape[0], size)))
+
+    _regrid.into = regrid_into
+    return _regrid
+
+
+@numba.njit(parallel=True, cache=True)
+def _linear_regrid_into(
+    source: FloatArray,
+    A: WeightMatrixCSR,
+    out: FloatArray,
+    weighted: bool,
+    normalize: bool,
+):
+    # Row by row equivalent of LinearRegrid: no temporary arrays are allocated.
+    n_extra = source.shape[0]
+    for extra_index in numba.prange(n_extra):
+        source_flat = source[extra_index]
+        out[extra_index, :] = np.nan
+        for target_index in range(A.n):
+            indices, weights = nzrange(A, target_index)
+            numerator = 0.0
+            weight_sum = 0.0
+            for source_index, w in zip(indices, weights):
+                v = source_flat[source_index]
+                if np.isnan(v):
+                    continue
+                if weighted:
+                    numerator += w * v
+                else:
+                    numerator += v
+                weight_sum += w
+            if weight_sum != 0:
+                if normalize:
+                    numerator /= weight_sum
+                out[extra_index, target_index] = numerator
+    return out
+
+
+def _scipy_csr(A: WeightMatrixCSR, shape: Tuple[int, int]) -> scipy.sparse.csr_matrix:
+    # The weight matrix may contain fewer rows than target faces, when the
+    # last target faces have no overlap with the source.
+    indptr = A.indptr
+    n_missing = shape[0] - (indptr.size - 1)
+    if n_missing > 0:
+        indptr = np.concatenate((indptr, np.full(n_missing, indptr[-1])))
+    return scipy.sparse.csr_matrix((A.data, A.indices, indptr), shape=shape)
+
+
+class LinearRegrid:
+    """
+    Regrid methods that are linear in the source values can be executed as a
+    single sparse matrix product over all extra dimensions at once, rather than
+    calling a reduction function for every target face and every extra index.
+
+    NaN values in the source are skipped by setting them to zero, and by
+    computing the sum of the weights of the valid values per target face. If
+    this sum is zero, the target face is set to NaN, like the reduction
+    functions in the reduce module do.
+
+    Since both the numerator and the sum of the weights are sums over the
+    source faces, they can be computed per chunk of source faces and added
+    afterwards. This allows regridding dask arrays that are chunked along the
+    source topology dimension(s), see ``regrid_chunked``.
+
+    Parameters
+    ----------
+    weighted: bool
+        Whether to multiply the source values by the weights. If False, the
+        values are summed.
+    normalize: bool
+        Whether to divide by the sum of the weights of the valid values.
+    """
+
+    def __init__(self, weighted: bool, normalize: bool):
+        self.weighted = weighted
+        self.normalize = normalize
+
+    def partial(
+        self, source: FloatArray, matrix: scipy.sparse.spmatrix
+    ) -> Tuple[FloatArray, FloatArray]:
+        """
+        Compute the numerator and the sum of the weights of the valid values,
+        both with shape ``(n_extra, n_target)``.
+        """
+        isnan = np.isnan(source)
+        if isnan.any():
+            values = np.where(isnan, 0.0, source)
+            weight_sum = (matrix @ (~isnan).T.astype(np.float64)).T
+        else:
+            values = source
+            weight_sum = np.broadcast_to(
+                np.asarray(matrix.sum(axis=1)).T, (source.shape[0], matrix.shape[0])
+            )
+
+        if not self.weighted:
+            matrix = matrix.copy()
+            matrix.data = np.ones_like(matrix.data)
+        numerator = (matrix @ values.T).T
+        return numerator, weight_sum
+
+    def finalize(self, numerator: FloatArray, weight_sum: FloatArray) -> FloatArray:
+        nodata = weight_sum == 0
+        if self.normalize:
+            numerator = numerator / np.where(nodata, 1.0, weight_sum)
+        out = np.where(nodata, np.nan, numerator)
+        return np.ascontiguousarray(out, dtype=np.float64)
+
+    def __call__(self, source: FloatArray, A: WeightMatrixCSR, size: int):
+        matrix = _scipy_csr(A, (size, source.shape[1]))
+        return self.finalize(*self.partial(source, matrix))
+
+    def into(self, source: FloatArray, A: WeightMatrixCSR, out: FloatArray):
+        """
+        Regrid into the preallocated out, with shape ``(n_extra, size)``.
+
+        The sparse matrix product allocates temporary arrays, which dominates
+        the cost for a small number of extra indices (e.g. a single time
+        step). Hence, this method iterates over the rows instead.
+        """
+        return _linear_regrid_into(source, A, out, self.weighted, self.normalize)
+
+    def regrid_chunked(
+        self, source: "dask.array.Array", A: WeightMatrixCSR, size: int
+    ) -> "dask.array.Array":
+        """
+        Regrid every chunk of source faces separately, and sum the partial
+        results in a tree reduction. The memory required per task is bounded
+        by the chunk size and the number of target faces, rather than by the
+        number of source faces.
+        """
+        # Slicing columns is cheap in the CSC format.
+        matrix = _scipy_csr(A, (size, source.shape[1])).tocsc()
+
+        def _partial(block, block_info=None):
+            start, end = block_info[0]["array-location"][1]
+            numerator, weight_sum = self.partial(block, matrix[:, start:end])
+            return np.concatenate((numerator, weight_sum), axis=1)[:, np.newaxis]
+
+        def _finalize(block):
+            return self.finalize(block[:, :size], block[:, size:])
+
+        n_block = len(source.chunks[1])
+        partial = dask.array.map_blocks(
+            _partial,
+            source,
+            new_axis=2,
+            chunks=(source.chunks[0], (1,) * n_block, (2 * size,)),
+            dtype=np.float64,
+            meta=np.array((), dtype=np.float64),
+        )
+        return partial.sum(axis=1).map_blocks(
+            _finalize,
+            chunks=(source.chunks[0], (size,)),
+            dtype=np.float64,
+            meta=np.array((), dtype=np.float64),
+        )
+
+
+LINEAR_REGRID_FUNCTIONS = {
+    "mean": LinearRegrid(weighted=True, normalize=True),
+    "sum": LinearRegrid(weighted=False, normalize=False),
+    "conductance": LinearRegrid(weighted=True, normalize=False),
+    "first_order_conservative": LinearRegrid(weighted=True, normalize=False),
+}
 
 
 def setup_grid(obj, **kwargs):
@@ -88,10 +260,24 @@ class BaseRegridder(abc.ABC):
         self,
         source: "xugrid.Ugrid2d",
         target: "xugrid.Ugrid2d",
+        cache: Union[WeightCache, str, None] = None,
     ):
         self._source = setup_grid(source)
         self._target = setup_grid(target)
-        self._compute_weights(self._source, self._target)
+        if cache is None:
+            self._compute_weights(self._source, self._target)
+        else:
+            self._cached_weights(as_weight_cache(cache))
+        return
+
+    def _cached_weights(self, cache: WeightCache) -> None:
+        key = cache.key(type(self).__name__, self._source, self._target)
+        weights = cache.get(key)
+        if weights is None:
+            self._compute_weights(self._source, self._target)
+            cache.put(key, self._weights)
+        else:
+            self._weights = weights
         return
 
     @abc.abstractproperty
@@ -145,7 +331,13 @@ class BaseRegridder(abc.ABC):
 
         size = self._target.size
 
-        if isinstance(source, DaskArray):
+        if isinstance(source, DaskArray) and (
+            isinstance(self._regrid, LinearRegrid) and len(source.chunks[1]) > 1
+        ):
+            # Linear methods can be regridded per chunk of source faces,
+            # without gathering the topology dimension in a single chunk.
+            out = self._regrid.regrid_chunked(source, self._weights, size)
+        elif isinstance(source, DaskArray):
             # It's possible that the topology dimensions are chunked (e.g. from
             # reading multiple partitions). The regrid operation does not
             # support this, since we might need multiple source chunks for a
@@ -175,6 +367,65 @@ class BaseRegridder(abc.ABC):
         out_shape = first_dims_shape + self._target.shape
         return out.reshape(out_shape)
 
+    def regrid_into(
+        self, source: FloatArray, out: Optional[FloatArray] = None
+    ) -> FloatArray:
+        """
+        Regrid a numpy array, writing the result into a preallocated array.
+
+        Unlike :meth:`regrid`, no xarray or UgridDataArray objects are created
+        and no output is allocated when ``out`` is provided. This minimizes the
+        overhead of regridding repeatedly, e.g. one time step at a time.
+
+        Parameters
+        ----------
+        source: np.ndarray
+            The source values. The last dimension(s) must match the source
+            topology: ``(..., n_face)`` for unstructured, or ``(..., ny, nx)``
+            for structured grids.
+        out: np.ndarray of floats, optional
+            C-contiguous output array with shape ``(..., n_face)`` or
+            ``(..., ny, nx)`` of the target topology. The leading dimensions
+            must match those of source. Allocated if not provided.
+
+        Returns
+        -------
+        out: np.ndarray of floats
+        """
+        if not isinstance(source, np.ndarray):
+            raise TypeError(
+                f"Expected numpy.ndarray for source, received: {type(source).__name__}"
+            )
+        source_grid = self._source
+        core_shape = source.shape[source.ndim - source_grid.ndim :]
+        if core_shape != source_grid.shape:
+            raise ValueError(
+                f"Expected source with trailing shape {source_grid.shape}, "
+                f"received shape: {source.shape}"
+            )
+        out_shape = source.shape[: source.ndim - source_grid.ndim] + self._target.shape
+        if out is None:
+            out = np.empty(out_shape)
+        elif not isinstance(out, np.ndarray):
+            raise TypeError(
+                f"Expected numpy.ndarray for out, received: {type(out).__name__}"
+            )
+        elif out.shape != out_shape:
+            raise ValueError(
+                f"Expected out with shape {out_shape}, received: {out.shape}"
+            )
+        elif not (
+            out.dtype == np.float64 and out.flags.c_contiguous and out.flags.writeable
+        ):
+            raise ValueError("out must be a writeable C-contiguous array of float64")
+
+        self._regrid.into(
+            source.reshape((-1, source_grid.size)),
+            self._weights,
+            out.reshape((-1, self._target.size)),
+        )
+        return out
+
     def regrid_dataarray(self, source: xr.DataArray, source_dims: Tuple[str]):
         # Do not set vectorize=True: numba will run the for loop more
         # efficiently, and guarantees a single large allocation.
@@ -197,7 +448,11 @@ class BaseRegridder(abc.ABC):
 
         Automatically regrids over additional dimensions (e.g. time).
 
-        Supports lazy evaluation for dask arrays inside the DataArray.
+        Supports lazy evaluation for dask arrays inside the DataArray. For the
+        linear methods (``"mean"``, ``"sum"``, ``"first_order_conservative"``),
+        chunks along the source topology dimension(s) are regridded separately
+        and the partial results are summed, so the source does not have to be
+        rechunked into a single chunk along these dimension(s).
 
         Parameters
         ----------
@@ -312,6 +567,24 @@ class BaseRegridder(abc.ABC):
         return cls.from_weights(dataset, target)
 
 
+@numba.njit(parallel=True, cache=True)
+def _locator_regrid_into(source: FloatArray, A: WeightMatrixCOO, out: FloatArray):
+    n_extra = source.shape[0]
+    for extra_index in numba.prange(n_extra):
+        source_flat = source[extra_index]
+        out[extra_index, :] = np.nan
+        for target_index, source_index in zip(A.row, A.col):
+            out[extra_index, target_index] = source_flat[source_index]
+    return out
+
+
+def _locator_regrid(source: FloatArray, A: WeightMatrixCOO, size: int):
+    return _locator_regrid_into(source, A, np.empty((source.shape[0], size)))
+
+
+_locator_regrid.into = _locator_regrid_into
+
+
 class CentroidLocatorRegridder(BaseRegridder):
     """
     The CentroidLocatorRegridded regrids by searching the source grid for the
@@ -325,6 +598,9 @@ class CentroidLocatorRegridder(BaseRegridder):
     source: Ugrid2d, UgridDataArray
     target: Ugrid2d, UgridDataArray
     weights: Optional[WeightMatrixCOO]
+    cache: WeightCache or str, optional
+        Cache to store and retrieve the weights. If a path is given, a
+        WeightCache is created in that directory. Default: no caching.
     """
 
     def _compute_weights(self, source, target):
@@ -333,16 +609,7 @@ class CentroidLocatorRegridder(BaseRegridder):
         self._weights = weight_matrix_coo(source_index, target_index, weight_values)
         return
 
-    @staticmethod
-    @numba.njit(parallel=True, cache=True)
-    def _regrid(source: FloatArray, A: WeightMatrixCOO, size: int):
-        n_extra = source.shape[0]
-        out = np.full((n_extra, size), np.nan)
-        for extra_index in numba.prange(n_extra):
-            source_flat = source[extra_index]
-            for target_index, source_index in zip(A.row, A.col):
-                out[extra_index, target_index] = source_flat[source_index]
-        return out
+    _regrid = staticmethod(_locator_regrid)
 
     @property
     def weights(self):
@@ -416,10 +683,16 @@ class OverlapRegridder(BaseOverlapRegridder):
     target: Ugrid2d, UgridDataArray
     method: str, function, optional
         Default value is ``"mean"``.
+    cache: WeightCache or str, optional
+        Cache to store and retrieve the weights. If a path is given, a
+        WeightCache is created in that directory. Default: no caching.
     """
 
     _JIT_FUNCTIONS = {
-        k: make_regrid(f) for k, f in reduce.ASBOLUTE_OVERLAP_METHODS.items()
+        k: LINEAR_REGRID_FUNCTIONS[k]
+        if k in LINEAR_REGRID_FUNCTIONS
+        else make_regrid(f)
+        for k, f in reduce.ASBOLUTE_OVERLAP_METHODS.items()
     }
 
     def __init__(
@@ -427,8 +700,9 @@ class OverlapRegridder(BaseOverlapRegridder):
         source: UgridDataArray,
         target: UgridDataArray,
         method: Union[str, Callable] = "mean",
+        cache: Union[WeightCache, str, None] = None,
     ):
-        super().__init__(source=source, target=target)
+        super().__init__(source=source, target=target, cache=cache)
         self._setup_regrid(method)
 
     def _compute_weights(self, source, target) -> None:
@@ -468,10 +742,16 @@ class RelativeOverlapRegridder(BaseOverlapRegridder):
     target: Ugrid2d, UgridDataArray
     method: str, function, optional
         Default value is "first_order_conservative".
+    cache: WeightCache or str, optional
+        Cache to store and retrieve the weights. If a path is given, a
+        WeightCache is created in that directory. Default: no caching.
     """
 
     _JIT_FUNCTIONS = {
-        k: make_regrid(f) for k, f in reduce.RELATIVE_OVERLAP_METHODS.items()
+        k: LINEAR_REGRID_FUNCTIONS[k]
+        if k in LINEAR_REGRID_FUNCTIONS
+        else make_regrid(f)
+        for k, f in reduce.RELATIVE_OVERLAP_METHODS.items()
     }
 
     def __init__(
@@ -479,8 +759,9 @@ class RelativeOverlapRegridder(BaseOverlapRegridder):
         source: UgridDataArray,
         target: UgridDataArray,
         method: Union[str, Callable] = "first_order_conservative",
+        cache: Union[WeightCache, str, None] = None,
     ):
-        super().__init__(source=source, target=target)
+        super().__init__(source=source, target=target, cache=cache)
         self._setup_regrid(method)
 
     def _compute_weights(self, source, target) -> None:
@@ -510,17 +791,20 @@ class BarycentricInterpolator(BaseRegridder):
     ----------
     source: Ugrid2d, UgridDataArray
     target: Ugrid2d, UgridDataArray
-
+    cache: WeightCache or str, optional
+        Cache to store and retrieve the weights. If a path is given, a
+        WeightCache is created in that directory. Default: no caching.
     """
 
-    _JIT_FUNCTIONS = {"mean": make_regrid(reduce.mean)}
+    _JIT_FUNCTIONS = {"mean": LINEAR_REGRID_FUNCTIONS["mean"]}
 
     def __init__(
         self,
         source: UgridDataArray,
         target: UgridDataArray,
+        cache: Union[WeightCache, str, None] = None,
     ):
-        super().__init__(source, target)
+        super().__init__(source, target, cache)
         # Since the weights for a target face sum up to 1.0, a weight mean is
         # appropriate, and takes care of NaN values in the source data.
         self._setup_regrid("mean")
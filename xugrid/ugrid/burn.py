@@ -1,4 +1,4 @@
-from typing import List, Union
+from typing import List, Tuple, Union
 
 import numba as nb
 import numpy as np
@@ -12,7 +12,8 @@ from numba_celltree.geometry_utils import (
 )
 
 import xugrid
-from xugrid.constants import FloatArray, IntArray, MissingOptionalModule
+from xugrid.constants import FloatArray, IntArray, IntDType, MissingOptionalModule
+from xugrid.ugrid import connectivity
 
 try:
     import shapely
@@ -140,9 +141,23 @@ def _locate_polygon(
     rings = np.cumsum([len(exterior)] + [len(interior) for interior in interiors])
     vertices = np.vstack([exterior] + interiors).astype(np.float64)
     triangles = mapbox_earcut.triangulate_float64(vertices, rings).reshape((-1, 3))
+    _, grid_indices = _locate_triangles(grid, vertices, triangles, all_touched)
+    return grid_indices
+
+
+def _locate_triangles(
+    grid: "xu.Ugrid2d",  # type: ignore # noqa
+    vertices: FloatArray,
+    triangles: IntArray,
+    all_touched: bool,
+) -> Tuple[IntArray, IntArray]:
+    """
+    Search the grid for the triangles. Returns the index of the triangle and
+    the index of the grid face for every (triangle, face) pair.
+    """
     triangle_indices, grid_indices = grid.celltree._locate_faces(vertices, triangles)
     if all_touched:
-        return grid_indices
+        return triangle_indices, grid_indices
     else:
         centroids = grid.centroids[grid_indices]
         inside = points_in_triangles(
@@ -151,7 +166,54 @@ def _locate_polygon(
             faces=triangles,
             vertices=vertices,
         )
-        return grid_indices[inside]
+        return triangle_indices[inside], grid_indices[inside]
+
+
+def _triangulate_polygons(
+    polygons: "geopandas.GeoSeries",  # type: ignore # noqa
+) -> Tuple[FloatArray, IntArray, IntArray]:
+    """
+    Break every polygon down into triangles using an "earcut" algorithm.
+
+    Returns
+    -------
+    vertices: ndarray of floats with shape ``(n_vertex, 2)``
+    triangles: ndarray of integers with shape ``(n_triangle, 3)``
+    polygon_index: ndarray of integers with shape ``(n_triangle,)``
+        The index of the polygon of every triangle.
+    """
+    import mapbox_earcut
+
+    n_polygon = len(polygons)
+    # The rings are ordered per polygon: the exterior, then the interiors.
+    rings, ring_polygon = shapely.get_rings(np.asarray(polygons), return_index=True)
+    vertices, vertex_ring = shapely.get_coordinates(rings, return_index=True)
+    vertices = np.ascontiguousarray(vertices, dtype=np.float64)
+    ring_end = np.cumsum(np.bincount(vertex_ring, minlength=len(rings)))
+    polygon_ring_end = np.cumsum(np.bincount(ring_polygon, minlength=n_polygon))
+
+    triangles = []
+    polygon_index = []
+    ring_start = 0
+    for i, end in enumerate(polygon_ring_end):
+        if end == ring_start:  # empty polygon
+            continue
+        start = ring_end[ring_start - 1] if ring_start > 0 else 0
+        ends = ring_end[ring_start:end]
+        polygon_triangles = mapbox_earcut.triangulate_float64(
+            vertices[start : ends[-1]], ends - start
+        ).reshape((-1, 3))
+        triangles.append(polygon_triangles.astype(IntDType) + start)
+        polygon_index.append(np.full(len(polygon_triangles), i))
+        ring_start = end
+
+    if len(triangles) == 0:
+        return (
+            vertices,
+            np.empty((0, 3), dtype=IntDType),
+            np.empty(0, dtype=IntDType),
+        )
+    return vertices, np.concatenate(triangles), np.concatenate(polygon_index)
 
 
 def _burn_polygons(
@@ -161,24 +223,59 @@ def _burn_polygons(
     all_touched: bool,
     output: FloatArray,
 ) -> None:
-    exterior_coordinates = [
-        shapely.get_coordinates(exterior) for exterior in polygons.exterior
-    ]
-    interior_coordinates = [
-        [shapely.get_coordinates(p_interior) for p_interior in p_interiors]
-        for p_interiors in polygons.interiors
-    ]
-    to_burn = np.empty(like.n_face, dtype=bool)
-
-    for exterior, interiors, value in zip(
-        exterior_coordinates, interior_coordinates, values
-    ):
-        to_burn = _locate_polygon(like, exterior, interiors, all_touched)
-        output[to_burn] = value
+    """
+    All polygons are triangulated first, then the grid is searched for all
+    triangles at once. Where polygons overlap, the value of the last polygon
+    is burned, as if the polygons were burned one after the other.
+    """
+    vertices, triangles, triangle_polygon = _triangulate_polygons(polygons)
+    if len(triangles) == 0:
+        return
 
+    triangle_indices, grid_indices = _locate_triangles(
+        like, vertices, triangles, all_touched
+    )
+    polygon_indices = triangle_polygon[triangle_indices]
+    # Sort by face, then by polygon: the last entry of every face is the
+    # polygon with the highest index.
+    order = np.lexsort((polygon_indices, grid_indices))
+    grid_indices = grid_indices[order]
+    polygon_indices = polygon_indices[order]
+    is_last = np.ones(grid_indices.size, dtype=bool)
+    is_last[:-1] = grid_indices[1:] != grid_indices[:-1]
+    output[grid_indices[is_last]] = np.asarray(values)[polygon_indices[is_last]]
     return
 
 
+def _polygon_coverage(
+    polygons: "geopandas.GeoSeries",  # type: ignore # noqa
+    like: "xugrid.Ugrid2d",
+    values: np.ndarray,
+) -> Tuple[FloatArray, FloatArray]:
+    """
+    Compute the area of every face covered by the polygons, and the sum of the
+    values weighted by the covered area. The triangles of the polygons are
+    clipped by the faces of the grid with the celltree.
+    """
+    area = np.zeros(like.n_face)
+    weighted = np.zeros(like.n_face)
+    vertices, triangles, triangle_polygon = _triangulate_polygons(polygons)
+    if len(triangles) == 0:
+        return area, weighted
+
+    # Polygon clipping requires counterclockwise triangles.
+    triangles = connectivity.counterclockwise(triangles, -1, vertices)
+    triangle_indices, grid_indices, overlap = like.celltree.intersect_faces(
+        vertices, triangles, -1
+    )
+    area = np.bincount(grid_indices, weights=overlap, minlength=like.n_face)
+    polygon_values = np.asarray(values, dtype=float)[triangle_polygon[triangle_indices]]
+    weighted = np.bincount(
+        grid_indices, weights=overlap * polygon_values, minlength=like.n_face
+    )
+    return area, weighted
+
+
 def _burn_points(
     points: "geopandas.GeoSeries",  # type: ignore # noqa
     like: "xugrid.Ugrid2d",
@@ -303,3 +400,77 @@ def burn_vector_geometry(
         obj=xr.DataArray(output, dims=[like.face_dimension], name=column),
         grid=like,
     )
+
+
+def polygon_coverage(
+    gdf: "geopandas.GeoDataframe",  # type: ignore # noqa
+    like: Union["xugrid.Ugrid2d", "xugrid.UgridDataArray", "xugrid.UgridDataset"],
+    column: str = None,
+    fill: Union[int, float] = np.nan,
+) -> "xugrid.UgridDataArray":
+    """
+    Compute the coverage of the faces of a Ugrid2d mesh by polygons, using the
+    exact area of overlap.
+
+    If no ``column`` argument is provided, the fraction of every face covered
+    by the polygons is returned. If a ``column`` is provided, the values are
+    aggregated per face as the mean weighted by the area of overlap.
+
+    Overlapping polygons are counted multiple times: the fraction may exceed
+    1.0 where polygons overlap.
+
+    Parameters
+    ----------
+    gdf: geopandas.GeoDataFrame
+        Polygons to compute the coverage of.
+    like: UgridDataArray, UgridDataset, or Ugrid2d
+        Grid to compute the coverage of.
+    column: str, optional
+        Name of the geodataframe column of which to aggregate the values.
+    fill: int, float, optional, default value ``np.nan``.
+        Fill value for faces not covered by any polygon, when ``column`` is
+        provided.
+
+    Returns
+    -------
+    coverage: UgridDataArray
+    """
+    import geopandas as gpd
+
+    if not isinstance(gdf, gpd.GeoDataFrame):
+        raise TypeError(f"gdf must be GeoDataFrame, received: {type(gdf).__name__}")
+    if isinstance(like, (xugrid.UgridDataArray, xugrid.UgridDataset)):
+        like = like.ugrid.grid
+    if not isinstance(like, xugrid.Ugrid2d):
+        raise TypeError(
+            "Like must be Ugrid2d, UgridDataArray, or UgridDataset;"
+            f"received: {type(like).__name__}"
+        )
+    geometry_id = shapely.get_type_id(gdf.geometry)
+    if not (geometry_id == POLYGON).all():
+        received = ", ".join(
+            [GEOM_NAMES[geom_id] for geom_id in np.unique(geometry_id)]
+        )
+        raise TypeError(
+            "GeoDataFrame contains unsupported geometry types. Can only compute "
+            f"the coverage of Polygon geometries. Received: {received}"
+        )
+
+    if column is None:
+        values = np.ones(len(gdf), dtype=float)
+    else:
+        values = gdf[column].to_numpy()
+
+    area, weighted = _polygon_coverage(gdf.geometry, like, values)
+    if column is None:
+        output = area / like.area
+    else:
+        covered = area > 0
+        output = np.full(like.n_face, fill, dtype=float)
+        output[covered] = weighted[covered] / area[covered]
+
+    name = "coverage" if column is None else column
+    return xugrid.UgridDataArray(
+        obj=xr.DataArray(output, dims=[like.face_dimension], name=name),
+        grid=like,
+    )
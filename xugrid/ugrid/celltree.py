@@ -0,0 +1,410 @@
+"""
+Partitioned construction and serialization of cell trees.
+
+Building a single CellTree2d for a very large mesh is a serial operation. The
+PartitionedCellTree splits the faces into partitions, builds a tree for every
+partition in a separate thread, and answers queries by querying every tree and
+mapping the partition face indices back to the face indices of the mesh.
+
+Both CellTree2d and PartitionedCellTree can be stored in a single .npz file,
+which can be loaded much faster than the tree can be built.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Sequence, Tuple, Union
+
+import numba as nb
+import numpy as np
+from numba_celltree import CellTree2d
+from numba_celltree.celltree import bbox_tree, cast_edges, cast_faces, cast_vertices
+from numba_celltree.constants import CellTreeData
+from numba_celltree.creation import initialize
+
+from xugrid.constants import BoolArray, FloatArray, IntArray
+
+
+@nb.njit(nogil=True, cache=True)
+def _initialize_nogil(vertices, faces, n_buckets, cells_per_leaf):
+    # numba_celltree does not release the GIL during construction. Wrapping
+    # the call in a nogil function allows building trees in multiple threads.
+    return initialize(vertices, faces, n_buckets, cells_per_leaf)
+
+
+def _assemble_celltree(
+    vertices: FloatArray,
+    faces: IntArray,
+    nodes: np.ndarray,
+    bb_indices: IntArray,
+    bb_coords: FloatArray,
+    n_buckets: int,
+    cells_per_leaf: int,
+) -> CellTree2d:
+    """
+    Create a CellTree2d from its (pre-computed) constituent arrays. The
+    vertices and faces must already be cast and counterclockwise.
+    """
+    tree = CellTree2d.__new__(CellTree2d)
+    tree.vertices = vertices
+    tree.faces = faces
+    tree.n_buckets = n_buckets
+    tree.cells_per_leaf = cells_per_leaf
+    tree.nodes = nodes
+    tree.bb_indices = bb_indices
+    tree.bb_coords = bb_coords
+    tree.bbox = bbox_tree(bb_coords)
+    tree.celltree_data = CellTreeData(
+        tree.faces,
+        tree.vertices,
+        tree.nodes,
+        tree.bb_indices,
+        tree.bb_coords,
+        tree.bbox,
+        tree.cells_per_leaf,
+    )
+    return tree
+
+
+def _sort_by_first(first: IntArray, *arrays):
+    order = np.argsort(first, kind="stable")
+    return (first[order],) + tuple(a[order] for a in arrays)
+
+
+class PartitionedCellTree:
+    """
+    A composite of cell trees, one for every partition of the faces of a mesh.
+    It provides the same query methods as ``numba_celltree.CellTree2d``.
+
+    Parameters
+    ----------
+    vertices: ndarray of floats with shape ``(n_point, 2)``
+    faces: ndarray of integers with shape ``(n_face, n_max_vert)``
+        Must be counterclockwise.
+    fill_value: int
+    indices: sequence of ndarray of integers
+        The face indices of every partition. Every face should be part of
+        exactly one partition.
+    n_threads: int, optional
+        Number of threads to use for building the trees. Defaults to the
+        number of CPUs.
+    n_buckets: int, optional, default: 4
+    cells_per_leaf: int, optional, default: 2
+    """
+
+    def __init__(
+        self,
+        vertices: FloatArray,
+        faces: IntArray,
+        fill_value: int,
+        indices: Sequence[IntArray],
+        n_threads: int = None,
+        n_buckets: int = 4,
+        cells_per_leaf: int = 2,
+    ):
+        vertices = cast_vertices(vertices, copy=True)
+        faces = cast_faces(faces, fill_value)
+        indices = [np.asarray(index) for index in indices]
+        if sum(index.size for index in indices) != len(faces):
+            raise ValueError("Every face should be part of exactly one partition")
+        # Empty partitions have no tree.
+        indices = [index for index in indices if index.size > 0]
+
+        def build(index):
+            part_faces = np.ascontiguousarray(faces[index])
+            nodes, bb_indices, bb_coords = _initialize_nogil(
+                vertices, part_faces, n_buckets, cells_per_leaf
+            )
+            return _assemble_celltree(
+                vertices,
+                part_faces,
+                nodes,
+                bb_indices,
+                bb_coords,
+                n_buckets,
+                cells_per_leaf,
+            )
+
+        if n_threads is None:
+            n_threads = os.cpu_count()
+        with ThreadPoolExecutor(max_workers=n_threads) as executor:
+            trees = list(executor.map(build, indices))
+
+        self._initialize(vertices, faces, indices, trees)
+
+    def _initialize(self, vertices, faces, indices, trees):
+        self.vertices = vertices
+        self.faces = faces
+        self.indices = indices
+        self.trees = trees
+        self.bbox = np.array(
+            [
+                min(tree.bbox[0] for tree in trees),
+                max(tree.bbox[1] for tree in trees),
+                min(tree.bbox[2] for tree in trees),
+                max(tree.bbox[3] for tree in trees),
+            ]
+        )
+
+    @classmethod
+    def from_labels(
+        cls,
+        vertices: FloatArray,
+        faces: IntArray,
+        fill_value: int,
+        labels: IntArray,
+        **kwargs,
+    ) -> "PartitionedCellTree":
+        """
+        Create a partitioned cell tree from a partition label for every face.
+        """
+        from xugrid.ugrid.partitioning import labels_to_indices
+
+        return cls(vertices, faces, fill_value, labels_to_indices(labels), **kwargs)
+
+    @property
+    def n_partition(self) -> int:
+        return len(self.trees)
+
+    def _overlaps(self, tree, xmin, xmax, ymin, ymax) -> BoolArray:
+        bbox = tree.bbox
+        return (
+            (xmax >= bbox[0])
+            & (xmin <= bbox[1])
+            & (ymax >= bbox[2])
+            & (ymin <= bbox[3])
+        )
+
+    def locate_points(self, points: FloatArray) -> IntArray:
+        """
+        Finds the index of a face that contains a point.
+
+        Parameters
+        ----------
+        points: ndarray of floats with shape ``(n_point, 2)``
+
+        Returns
+        -------
+        face_indices: ndarray of integers with shape ``(n_point,)``
+            Points not falling in any faces are marked with a value of ``-1``.
+        """
+        points = cast_vertices(points)
+        x = points[:, 0]
+        y = points[:, 1]
+        face_indices = np.full(len(points), -1)
+        for index, tree in zip(self.indices, self.trees):
+            todo = (face_indices == -1) & self._overlaps(tree, x, x, y, y)
+            if not todo.any():
+                continue
+            found = tree.locate_points(points[todo])
+            inside = found != -1
+            face_indices[np.flatnonzero(todo)[inside]] = index[found[inside]]
+        return face_indices
+
+    def compute_barycentric_weights(
+        self, points: FloatArray
+    ) -> Tuple[IntArray, FloatArray]:
+        """
+        Find in which face the points are located, and compute the barycentric
+        weight for every vertex of the face.
+
+        Parameters
+        ----------
+        points: ndarray of floats with shape ``(n_point, 2)``
+
+        Returns
+        -------
+        face_indices: ndarray of integers with shape ``(n_point,)``
+        weights: ndarray of floats with shape ``(n_point, n_max_vert)``
+        """
+        points = cast_vertices(points)
+        x = points[:, 0]
+        y = points[:, 1]
+        face_indices = np.full(len(points), -1)
+        weights = np.zeros((len(points), self.faces.shape[1]))
+        for index, tree in zip(self.indices, self.trees):
+            todo = (face_indices == -1) & self._overlaps(tree, x, x, y, y)
+            if not todo.any():
+                continue
+            found, found_weights = tree.compute_barycentric_weights(points[todo])
+            inside = found != -1
+            todo_index = np.flatnonzero(todo)[inside]
+            face_indices[todo_index] = index[found[inside]]
+            weights[todo_index] = found_weights[inside]
+        return face_indices, weights
+
+    def _query_pairs(self, method: str, *args) -> Tuple[IntArray, ...]:
+        """
+        Query every tree, map the face indices (second return value) to the
+        mesh, and sort by the first return value.
+        """
+        results = []
+        for index, tree in zip(self.indices, self.trees):
+            first, face, *other = getattr(tree, method)(*args)
+            results.append((first, index[face], *other))
+        concatenated = [np.concatenate(arrays) for arrays in zip(*results)]
+        return _sort_by_first(*concatenated)
+
+    def locate_boxes(self, bbox_coords: FloatArray) -> Tuple[IntArray, IntArray]:
+        """
+        Finds the index of a face intersecting with a bounding box.
+
+        Parameters
+        ----------
+        bbox_coords: ndarray of floats with shape ``(n_box, 4)``
+            Every row containing ``(xmin, xmax, ymin, ymax)``.
+
+        Returns
+        -------
+        bbox_indices: ndarray of integers with shape ``(n_found,)``
+        face_indices: ndarray of integers with shape ``(n_found,)``
+        """
+        return self._query_pairs("locate_boxes", bbox_coords)
+
+    def intersect_boxes(
+        self, bbox_coords: FloatArray
+    ) -> Tuple[IntArray, IntArray, FloatArray]:
+        """
+        Finds the index of a box intersecting with a face, and the area of
+        intersection.
+
+        Parameters
+        ----------
+        bbox_coords: ndarray of floats with shape ``(n_box, 4)``
+            Every row containing ``(xmin, xmax, ymin, ymax)``.
+
+        Returns
+        -------
+        bbox_indices: ndarray of integers with shape ``(n_found,)``
+        face_indices: ndarray of integers with shape ``(n_found,)``
+        area: ndarray of floats with shape ``(n_found,)``
+        """
+        return self._query_pairs("intersect_boxes", bbox_coords)
+
+    def _locate_faces(
+        self, vertices: FloatArray, faces: IntArray
+    ) -> Tuple[IntArray, IntArray]:
+        return self._query_pairs("_locate_faces", vertices, faces)
+
+    def intersect_faces(
+        self, vertices: FloatArray, faces: IntArray, fill_value: int
+    ) -> Tuple[IntArray, IntArray, FloatArray]:
+        """
+        Find the index of a face intersecting with another face, and the area
+        of intersection.
+
+        Parameters
+        ----------
+        vertices: ndarray of floats with shape ``(n_point, 2)``
+        faces: ndarray of integers with shape ``(n_face, n_max_vert)``
+        fill_value: int
+
+        Returns
+        -------
+        indices: ndarray of integers with shape ``(n_found,)``
+            Indices of the faces of the argument.
+        face_indices: ndarray of integers with shape ``(n_found,)``
+        area: ndarray of floats with shape ``(n_found,)``
+        """
+        return self._query_pairs("intersect_faces", vertices, faces, fill_value)
+
+    def intersect_edges(
+        self, edge_coords: FloatArray
+    ) -> Tuple[IntArray, IntArray, FloatArray]:
+        """
+        Find the index of a face intersecting with an edge.
+
+        Parameters
+        ----------
+        edge_coords: ndarray of floats with shape ``(n_edge, 2, 2)``
+
+        Returns
+        -------
+        edge_indices: ndarray of integers with shape ``(n_found,)``
+        face_indices: ndarray of integers with shape ``(n_found,)``
+        intersections: ndarray of floats with shape ``(n_found, 2, 2)``
+        """
+        return self._query_pairs("intersect_edges", cast_edges(edge_coords))
+
+
+CellTreeType = Union[CellTree2d, PartitionedCellTree]
+
+
+def save_celltree(tree: CellTreeType, path: Union[str, os.PathLike]) -> None:
+    """
+    Store a CellTree2d or PartitionedCellTree in a single .npz file.
+    """
+    if isinstance(tree, CellTree2d):
+        indices = [np.arange(len(tree.faces))]
+        trees = [tree]
+        partitioned = False
+    elif isinstance(tree, PartitionedCellTree):
+        indices = tree.indices
+        trees = tree.trees
+        partitioned = True
+    else:
+        raise TypeError(
+            "Expected CellTree2d or PartitionedCellTree, received: "
+            f"{type(tree).__name__}"
+        )
+
+    def offsets(arrays):
+        return np.cumsum([0] + [len(a) for a in arrays])
+
+    nodes = [t.nodes for t in trees]
+    bb_indices = [t.bb_indices for t in trees]
+    np.savez(
+        path,
+        partitioned=partitioned,
+        vertices=tree.vertices,
+        faces=tree.faces,
+        n_buckets=trees[0].n_buckets,
+        cells_per_leaf=trees[0].cells_per_leaf,
+        index=np.concatenate(indices),
+        index_offsets=offsets(indices),
+        nodes=np.concatenate(nodes),
+        node_offsets=offsets(nodes),
+        bb_indices=np.concatenate(bb_indices),
+        bb_coords=np.concatenate([t.bb_coords for t in trees]),
+        bb_offsets=offsets(bb_indices),
+    )
+    return
+
+
+def load_celltree(path: Union[str, os.PathLike]) -> CellTreeType:
+    """
+    Load a CellTree2d or PartitionedCellTree stored with ``save_celltree``.
+    """
+    with np.load(path) as npz:
+        data = dict(npz)
+
+    vertices = data["vertices"]
+    faces = data["faces"]
+    n_buckets = int(data["n_buckets"])
+    cells_per_leaf = int(data["cells_per_leaf"])
+
+    def split(name, offsets):
+        return np.split(data[name], data[offsets][1:-1])
+
+    indices = split("index", "index_offsets")
+    trees = [
+        _assemble_celltree(
+            vertices,
+            faces if not data["partitioned"] else np.ascontiguousarray(faces[index]),
+            nodes,
+            bb_indices,
+            bb_coords,
+            n_buckets,
+            cells_per_leaf,
+        )
+        for index, nodes, bb_indices, bb_coords in zip(
+            indices,
+            split("nodes", "node_offsets"),
+            split("bb_indices", "bb_offsets"),
+            split("bb_coords", "bb_offsets"),
+        )
+    ]
+    if not data["partitioned"]:
+        return trees[0]
+
+    partitioned = PartitionedCellTree.__new__(PartitionedCellTree)
+    partitioned._initialize(vertices, faces, indices, trees)
+    return partitioned
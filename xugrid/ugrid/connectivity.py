@@ -327,6 +327,31 @@ def renumber(a: IntArray, fill_value: int = None):
     return renumbered
 
 
+def first_occurrence_order(
+    conn: IntArray, n: int, fill_value: int
+) -> Tuple[IntArray, IntArray]:
+    """
+    Number the n elements referenced by the connectivity array in order of
+    their first occurrence in its rows. Unreferenced elements are numbered
+    last, in their original order.
+
+    Returns
+    -------
+    order: ndarray of integers with shape ``(n,)``
+        Original index of every renumbered element.
+    inverse: ndarray of integers with shape ``(n,)``
+        New index of every original element.
+    """
+    flat = conn.ravel()
+    flat = flat[flat != fill_value]
+    used, first = np.unique(flat, return_index=True)
+    unused = np.setdiff1d(np.arange(n), used, assume_unique=True)
+    order = np.concatenate((used[np.argsort(first)], unused)).astype(IntDType)
+    inverse = np.empty(n, dtype=IntDType)
+    inverse[order] = np.arange(n, dtype=IntDType)
+    return order, inverse
+
+
 def close_polygons(face_node_connectivity: IntArray, fill_value: int) -> IntArray:
     # Wrap around and create closed polygon: put the first node at the end of the row
     # In case of fill values, replace all fill values
@@ -376,12 +401,125 @@ def boundary_node_connectivity(
     return edge_node_connectivity[is_boundary]
 
 
+# Above this number of edges, the edges are sorted in parallel.
+PARALLEL_EDGE_THRESHOLD = 8_000_000
+
+
+def _edge_keys(edges: IntArray, n_node: int) -> IntArray:
+    """
+    Pack the sorted (smallest node first) node pairs into a single int64 key.
+    Sorting the keys is equivalent to sorting the rows lexicographically.
+    """
+    return edges[:, 0].astype(np.int64) * n_node + edges[:, 1]
+
+
+def _unique_edges_numpy(edges: IntArray, n_node: int) -> Tuple[IntArray, IntArray]:
+    keys, inverse = np.unique(_edge_keys(edges, n_node), return_inverse=True)
+    unique = np.empty((keys.size, 2), dtype=IntDType)
+    unique[:, 0] = keys // n_node
+    unique[:, 1] = keys % n_node
+    return unique, inverse
+
+
+@nb.njit(parallel=True, cache=True)
+def _unique_edges_bucketed(
+    a: IntArray, b: IntArray, n_node: int
+) -> Tuple[IntArray, IntArray]:
+    # Counting sort on the first node, then sort every bucket on the second
+    # node. The buckets are independent and can be sorted in parallel.
+    n = a.size
+    start = np.zeros(n_node + 1, dtype=np.int64)
+    for i in range(n):
+        start[a[i] + 1] += 1
+    for i in range(n_node):
+        start[i + 1] += start[i]
+
+    order = np.empty(n, dtype=np.int64)
+    position = start[:-1].copy()
+    for i in range(n):
+        node = a[i]
+        order[position[node]] = i
+        position[node] += 1
+
+    is_new = np.zeros(n, dtype=np.int64)
+    for node in nb.prange(n_node):
+        s = start[node]
+        e = start[node + 1]
+        if (e - s) > 32:
+            bucket = order[s:e]
+            order[s:e] = bucket[np.argsort(b[bucket], kind="mergesort")]
+        else:
+            # Buckets are typically small (the number of edges of a node):
+            # insertion sort.
+            for i in range(s + 1, e):
+                current = order[i]
+                key = b[current]
+                j = i
+                while j > s and b[order[j - 1]] > key:
+                    order[j] = order[j - 1]
+                    j -= 1
+                order[j] = current
+        for i in range(s, e):
+            if i == s or b[order[i]] != b[order[i - 1]]:
+                is_new[i] = 1
+
+    edge_index = np.cumsum(is_new) - 1
+    n_edge = edge_index[-1] + 1 if n > 0 else 0
+    unique = np.empty((n_edge, 2), dtype=a.dtype)
+    inverse = np.empty(n, dtype=np.int64)
+    for i in nb.prange(n):
+        k = edge_index[i]
+        original = order[i]
+        inverse[original] = k
+        if is_new[i]:
+            unique[k, 0] = a[original]
+            unique[k, 1] = b[original]
+    return unique, inverse
+
+
+def unique_edges(edges: IntArray, parallel: bool = None) -> Tuple[IntArray, IntArray]:
+    """
+    Find the unique rows of edges, with the nodes of every edge sorted
+    (smallest node first). Equivalent to ``np.unique(edges, axis=0,
+    return_inverse=True)``, but much faster: the node pairs are packed into
+    int64 keys, or bucket sorted in parallel for large numbers of edges.
+
+    Parameters
+    ----------
+    edges: ndarray of integers with shape ``(n, 2)``
+    parallel: bool, optional
+        Whether to use the parallel bucket sort. By default, it is used when
+        the number of edges exceeds ``PARALLEL_EDGE_THRESHOLD``.
+
+    Returns
+    -------
+    unique: ndarray of integers with shape ``(n_unique, 2)``
+    inverse: ndarray of integers with shape ``(n,)``
+    """
+    if len(edges) == 0:
+        return np.empty((0, 2), dtype=IntDType), np.empty(0, dtype=IntDType)
+    n_node = int(edges.max()) + 1
+    if parallel is None:
+        parallel = len(edges) > PARALLEL_EDGE_THRESHOLD
+    if parallel:
+        edges = edges.astype(IntDType, copy=False)
+        return _unique_edges_bucketed(
+            np.ascontiguousarray(edges[:, 0]), np.ascontiguousarray(edges[:, 1]), n_node
+        )
+    return _unique_edges_numpy(edges, n_node)
+
+
 def edge_connectivity(
     face_node_connectivity: IntArray,
     fill_value: int,
     edge_node_connectivity=None,
+    parallel: bool = None,
 ) -> Tuple[IntArray, IntArray]:
-    """Derive new edge_node_connectivity and face_edge_connectivity."""
+    """
+    Derive new edge_node_connectivity and face_edge_connectivity.
+
+    See :func:`unique_edges` for the parallel argument.
+    """
     prior = edge_node_connectivity
     n, m = face_node_connectivity.shape
     # Close the polygons: [0 1 2 3] -> [0 1 2 3 0]
@@ -396,12 +534,17 @@ def edge_connectivity(
     ]
     # Now find the unique rows == unique edges
     edge_node_connectivity.sort(axis=1)
-    edge_node_connectivity, inverse_indices = np.unique(
-        ar=edge_node_connectivity, return_inverse=True, axis=0
+    edge_node_connectivity, inverse_indices = unique_edges(
+        edge_node_connectivity, parallel
     )
 
     if prior is not None:  # prior edge_node_connectivity exists
-        unique, index = np.unique(np.sort(prior, axis=1), axis=0, return_index=True)
+        prior_sorted = np.sort(prior, axis=1)
+        n_node = (
+            max(prior_sorted.max(initial=0), edge_node_connectivity.max(initial=0)) + 1
+        )
+        keys, index = np.unique(_edge_keys(prior_sorted, n_node), return_index=True)
+        unique = np.column_stack((keys // n_node, keys % n_node))
         # Check whether everything looks okay:
         if not np.array_equal(unique, edge_node_connectivity):
             raise ValueError(
@@ -688,15 +831,103 @@ def triangulate(face_node_connectivity, fill_value: int = None) -> IntArray:
         raise TypeError("connectivity must be ndarray or sparse matrix")
 
 
-def _mutate(output: BoolArray, i: IntArray, j: IntArray, value: bool, mask: BoolArray):
-    a = output[i]
-    b = output[j]
-    mutate = a != b
-    output[i[mutate]] = value
-    output[j[mutate]] = value
-    if mask is not None:
-        output[mask] = not value
-    return None
+@nb.njit(cache=True)
+def _symmetric_adjacency(indptr: IntArray, indices: IntArray, n: int):
+    # Store every connection in both directions, without sorting.
+    # Duplicates are harmless for the breadth first search.
+    n_row = indptr.size - 1
+    count = np.zeros(n + 1, dtype=IntDType)
+    for i in range(n_row):
+        for k in range(indptr[i], indptr[i + 1]):
+            count[i + 1] += 1
+            count[indices[k] + 1] += 1
+    sym_indptr = np.cumsum(count)
+    sym_indices = np.empty(sym_indptr[-1], dtype=IntDType)
+    position = sym_indptr[:-1].copy()
+    for i in range(n_row):
+        for k in range(indptr[i], indptr[i + 1]):
+            j = indices[k]
+            sym_indices[position[i]] = j
+            position[i] += 1
+            sym_indices[position[j]] = i
+            position[j] += 1
+    return sym_indptr, sym_indices
+
+
+@nb.njit(cache=True)
+def _binary_frontier(
+    indptr: IntArray,
+    indices: IntArray,
+    output: BoolArray,
+    value: bool,
+    iterations: int,
+    mask: BoolArray,
+    exterior: IntArray,
+) -> IntArray:
+    # Multi-source breadth first search: only the neighbors of the elements
+    # that flipped in the previous iteration are visited. All elements flip
+    # simultaneously within an iteration, as the frontier is only extended
+    # after the iteration.
+    n = output.size
+    flipped = np.full(n, -1, dtype=IntDType)
+    front = np.empty(n, dtype=IntDType)
+    n_front = 0
+    for i in range(n):
+        if output[i] == value:
+            flipped[i] = 0
+            front[n_front] = i
+            n_front += 1
+
+    buffer = np.empty(n, dtype=IntDType)
+    iteration = 0
+    # The first iteration always applies the mask and the exterior.
+    while iteration == 0 or (
+        n_front > 0 and (iterations < 1 or iteration < iterations)
+    ):
+        iteration += 1
+        n_next = 0
+        for f in range(n_front):
+            i = front[f]
+            for k in range(indptr[i], indptr[i + 1]):
+                j = indices[k]
+                if output[j] != value:
+                    output[j] = value
+                    flipped[j] = iteration
+                    buffer[n_next] = j
+                    n_next += 1
+
+        if mask.size > 0:
+            # Masked elements never change. Those that had the value before
+            # the first iteration, or were set by the exterior in the first
+            # iteration, are reset as well.
+            if iteration <= 2:
+                for i in range(n):
+                    if mask[i]:
+                        output[i] = not value
+                        flipped[i] = -1
+            else:
+                for f in range(n_next):
+                    i = buffer[f]
+                    if mask[i]:
+                        output[i] = not value
+                        flipped[i] = -1
+
+        if iteration == 1:
+            for i in exterior:
+                if output[i] != value:
+                    output[i] = value
+                    flipped[i] = 1
+                    buffer[n_next] = i
+                    n_next += 1
+
+        n_front = 0
+        for f in range(n_next):
+            i = buffer[f]
+            if output[i] == value:
+                front[n_front] = i
+                n_front += 1
+
+    return flipped
 
 
 def _binary_iterate(
@@ -707,24 +938,34 @@ def _binary_iterate(
     mask: BoolArray,
     exterior: IntArray,
     border_value: bool,
+    return_iterations: bool = False,
 ) -> BoolArray:
     if input.dtype != np.bool_:
         raise TypeError("input dtype should be bool")
 
-    coo = connectivity.tocoo()
-    i = coo.row
-    j = coo.col
+    connectivity = connectivity.tocsr()
+    indptr, indices = _symmetric_adjacency(
+        connectivity.indptr, connectivity.indices, input.size
+    )
     output = input.copy()
-
-    # First iteration, mutate borders.
-    _mutate(output, i, j, value, mask)
-    if exterior is not None and value == border_value:
-        output[exterior] = value
-
-    # Subsequent iterations, disregard border.
-    for _ in range(iterations - 1):
-        _mutate(output, i, j, value, mask)
-
+    if mask is None:
+        mask = np.empty(0, dtype=bool)
+    # The exterior is only applied when the border value equals the value
+    # that is propagated.
+    if exterior is None or value != border_value:
+        exterior = np.empty(0, dtype=IntDType)
+
+    flipped = _binary_frontier(
+        indptr,
+        indices,
+        output,
+        value,
+        iterations,
+        np.asarray(mask, dtype=bool),
+        np.asarray(exterior, dtype=IntDType),
+    )
+    if return_iterations:
+        return output, flipped
     return output
 
 
@@ -735,9 +976,35 @@ def binary_erosion(
     mask: BoolArray = None,
     exterior: IntArray = None,
     border_value: bool = False,
+    return_iterations: bool = False,
 ) -> BoolArray:
     """
     By default, erodes inwards from the exterior.
+
+    Only the neighbors of the elements that changed in the previous iteration
+    are visited, so the cost is proportional to the number of changed elements
+    rather than the number of iterations times the number of connections.
+
+    Parameters
+    ----------
+    connectivity: scipy.sparse.csr_matrix with shape ``(n, n)``
+    input: ndarray of bool with shape ``(n,)``
+    iterations: int, default 1
+        If smaller than 1, iterate until the result no longer changes.
+    mask: ndarray of bool with shape ``(n,)``, optional
+        Elements which are not eroded: they are set to True.
+    exterior: ndarray of integers, optional
+        Indices of the exterior elements, which are set to ``border_value``.
+    border_value: bool, default False
+    return_iterations: bool, default False
+        Whether to return the iteration number at which every element flipped
+        as well: zero for elements which had the value already, -1 for
+        elements which never flipped.
+
+    Returns
+    -------
+    output: ndarray of bool with shape ``(n,)``
+    flipped: ndarray of integers with shape ``(n,)``, optional
     """
     return _binary_iterate(
         connectivity=connectivity,
@@ -747,6 +1014,7 @@ def binary_erosion(
         mask=mask,
         exterior=exterior,
         border_value=border_value,
+        return_iterations=return_iterations,
     )
 
 
@@ -757,9 +1025,35 @@ def binary_dilation(
     mask: BoolArray = None,
     exterior: IntArray = None,
     border_value: bool = False,
+    return_iterations: bool = False,
 ) -> BoolArray:
     """
     By default, does not dilate inward from the exterior.
+
+    Only the neighbors of the elements that changed in the previous iteration
+    are visited, so the cost is proportional to the number of changed elements
+    rather than the number of iterations times the number of connections.
+
+    Parameters
+    ----------
+    connectivity: scipy.sparse.csr_matrix with shape ``(n, n)``
+    input: ndarray of bool with shape ``(n,)``
+    iterations: int, default 1
+        If smaller than 1, iterate until the result no longer changes.
+    mask: ndarray of bool with shape ``(n,)``, optional
+        Elements which are not dilated into: they are set to False.
+    exterior: ndarray of integers, optional
+        Indices of the exterior elements, which are set to ``border_value``.
+    border_value: bool, default False
+    return_iterations: bool, default False
+        Whether to return the iteration number at which every element flipped
+        as well: zero for elements which had the value already, -1 for
+        elements which never flipped.
+
+    Returns
+    -------
+    output: ndarray of bool with shape ``(n,)``
+    flipped: ndarray of integers with shape ``(n,)``, optional
     """
     return _binary_iterate(
         connectivity=connectivity,
@@ -769,4 +1063,162 @@ def binary_dilation(
         mask=mask,
         exterior=exterior,
         border_value=border_value,
+        return_iterations=return_iterations,
     )
+
+
+# Distance transform
+# ------------------
+@nb.njit(inline="always")
+def _heap_push(keys, values, size, key, value):
+    # Binary min-heap stored in the keys and values arrays. Move the parents
+    # down until the position of the new entry is found.
+    i = size
+    while i > 0:
+        parent = (i - 1) >> 1
+        if keys[parent] <= key:
+            break
+        keys[i] = keys[parent]
+        values[i] = values[parent]
+        i = parent
+    keys[i] = key
+    values[i] = value
+    return size + 1
+
+
+@nb.njit(inline="always")
+def _heap_pop(keys, values, size):
+    key = keys[0]
+    value = values[0]
+    size -= 1
+    # Move the children up until the position of the last entry is found.
+    last_key = keys[size]
+    last_value = values[size]
+    i = 0
+    while True:
+        child = 2 * i + 1
+        if child >= size:
+            break
+        if child + 1 < size and keys[child + 1] < keys[child]:
+            child += 1
+        if last_key <= keys[child]:
+            break
+        keys[i] = keys[child]
+        values[i] = values[child]
+        i = child
+    keys[i] = last_key
+    values[i] = last_value
+    return key, value, size
+
+
+@nb.njit(cache=True)
+def _breadth_first_distance(indptr: IntArray, indices: IntArray, sources: IntArray):
+    n = indptr.size - 1
+    distance = np.full(n, np.inf)
+    nearest = np.full(n, -1, dtype=IntDType)
+    queue = np.empty(n, dtype=IntDType)
+    head = 0
+    tail = 0
+    for source in sources:
+        if nearest[source] == -1:
+            distance[source] = 0.0
+            nearest[source] = source
+            queue[tail] = source
+            tail += 1
+
+    while head < tail:
+        i = queue[head]
+        head += 1
+        for k in range(indptr[i], indptr[i + 1]):
+            j = indices[k]
+            if nearest[j] == -1:
+                distance[j] = distance[i] + 1.0
+                nearest[j] = nearest[i]
+                queue[tail] = j
+                tail += 1
+    return distance, nearest
+
+
+@nb.njit(cache=True)
+def _dijkstra_distance(
+    indptr: IntArray, indices: IntArray, weights: FloatArray, sources: IntArray
+):
+    n = indptr.size - 1
+    distance = np.full(n, np.inf)
+    nearest = np.full(n, -1, dtype=IntDType)
+    done = np.zeros(n, dtype=np.bool_)
+    # Lazy deletion: an element may be pushed once per incoming connection.
+    capacity = indices.size + sources.size
+    keys = np.empty(capacity, dtype=np.float64)
+    values = np.empty(capacity, dtype=IntDType)
+    size = 0
+    for source in sources:
+        if nearest[source] == -1:
+            distance[source] = 0.0
+            nearest[source] = source
+            size = _heap_push(keys, values, size, 0.0, source)
+
+    while size > 0:
+        d, i, size = _heap_pop(keys, values, size)
+        if done[i]:
+            continue
+        done[i] = True
+        for k in range(indptr[i], indptr[i + 1]):
+            j = indices[k]
+            candidate = d + weights[k]
+            if candidate < distance[j]:
+                distance[j] = candidate
+                nearest[j] = nearest[i]
+                size = _heap_push(keys, values, size, candidate, j)
+    return distance, nearest
+
+
+def graph_distance(
+    connectivity: sparse.csr_matrix,
+    sources: BoolArray,
+    weights: FloatArray = None,
+) -> Tuple[FloatArray, IntArray]:
+    """
+    Compute the distance along the connections to the nearest source with a
+    multi-source breadth first search, or with Dijkstra's algorithm if
+    weights are provided.
+
+    Parameters
+    ----------
+    connectivity: scipy.sparse.csr_matrix with shape ``(n, n)``
+    sources: ndarray of bool with shape ``(n,)``
+    weights: ndarray of floats with shape ``(n_nonzero,)``, optional
+        Non-negative length of every connection, in the order of the
+        connectivity data. If None, every connection has length 1.
+
+    Returns
+    -------
+    distance: ndarray of floats with shape ``(n,)``
+        ``np.inf`` for elements which cannot be reached from any source.
+    nearest: ndarray of integers with shape ``(n,)``
+        Index of the nearest source, -1 for elements which cannot be reached.
+    """
+    n, m = connectivity.shape
+    if n != m:
+        raise ValueError(f"connectivity is not a square matrix: ({n}, {m})")
+    sources = np.asarray(sources)
+    if sources.dtype != np.bool_:
+        raise TypeError("sources dtype should be bool")
+    if sources.shape != (n,):
+        raise ValueError(f"expected sources of shape ({n},), received: {sources.shape}")
+
+    connectivity = connectivity.tocsr()
+    indptr = connectivity.indptr
+    indices = connectivity.indices
+    source_index = np.flatnonzero(sources)
+    if weights is None:
+        return _breadth_first_distance(indptr, indices, source_index)
+
+    weights = np.asarray(weights, dtype=np.float64)
+    if weights.shape != indices.shape:
+        raise ValueError(
+            f"expected weights of shape {indices.shape}, received: {weights.shape}"
+        )
+    if (weights < 0).any():
+        raise ValueError("weights must be non-negative")
+    return _dijkstra_distance(indptr, indices, weights, source_index)
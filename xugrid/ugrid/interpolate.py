@@ -1,10 +1,184 @@
 import warnings
+from typing import Callable, NamedTuple, Optional, Union
 
 import numpy as np
 import scipy.sparse
 import scipy.sparse.linalg
 
-from xugrid.constants import FloatArray
+from xugrid.constants import BoolArray, FloatArray, IntDType
+from xugrid.ugrid.multigrid import SmoothedAggregation
+
+SOLVERS = ("direct", "ilu", "jacobi", "amg")
+
+
+class SolverInfo(NamedTuple):
+    """
+    Convergence information of the Laplace interpolation.
+
+    Attributes
+    ----------
+    converged: bool
+    n_iter: int or None
+        Number of iterations, zero for the direct solver, None for a custom
+        solver.
+    residual: float
+        Norm of the residual relative to the norm of the right-hand side.
+    """
+
+    converged: bool
+    n_iter: Optional[int]
+    residual: float
+
+
+def _laplace_system(
+    connectivity: scipy.sparse.csr_matrix,
+    variable: BoolArray,
+    use_weights: bool,
+):
+    """
+    Build the symmetric positive definite system for the variable cells. The
+    connections to cells with data move to the right-hand side: the matrix B
+    maps the data to the right-hand side. It only has entries in the columns
+    of the cells with data.
+    """
+    n = variable.size
+    coo = connectivity.tocoo()
+    i = coo.row
+    j = coo.col
+    # Create uniform weighting if sparse data is not to be used.
+    if use_weights:
+        weights = coo.data
+    else:
+        weights = np.ones(i.size)
+
+    n_variable = int(variable.sum())
+    number = np.full(n, -1, dtype=IntDType)
+    number[variable] = np.arange(n_variable)
+
+    from_variable = variable[i]
+    to_constant = from_variable & ~variable[j]
+    to_variable = from_variable & variable[j]
+    B = scipy.sparse.csr_matrix(
+        (weights[to_constant], (number[i[to_constant]], j[to_constant])),
+        shape=(n_variable, n),
+    )
+    diagonal = np.bincount(i, weights=weights, minlength=n)[variable]
+    ii = np.arange(n_variable)
+    coo_content = (
+        np.concatenate([-weights[to_variable], diagonal]),
+        (
+            np.concatenate([number[i[to_variable]], ii]),
+            np.concatenate([number[j[to_variable]], ii]),
+        ),
+    )
+    A = scipy.sparse.csr_matrix(coo_content, shape=(n_variable, n_variable))
+    return A, B
+
+
+def _ilu_preconditioner(A, drop_tol, fill_factor, drop_rule, options):
+    ilu = scipy.sparse.linalg.spilu(
+        A.tocsc(),
+        drop_tol=drop_tol,
+        fill_factor=fill_factor,
+        drop_rule=drop_rule,
+        options=options,
+    )
+    return scipy.sparse.linalg.LinearOperator(A.shape, ilu.solve)
+
+
+def _jacobi_preconditioner(A):
+    dinv = 1.0 / A.diagonal()
+    return scipy.sparse.linalg.LinearOperator(A.shape, lambda x: dinv * x)
+
+
+def _conjugate_gradient(A, rhs, x0, tol, maxiter, M):
+    n_iter = 0
+
+    def count(_):
+        nonlocal n_iter
+        n_iter += 1
+
+    x, info = scipy.sparse.linalg.cg(
+        A, rhs, x0=x0, tol=tol, maxiter=maxiter, M=M, callback=count, atol="legacy"
+    )
+    if info < 0:
+        raise ValueError("scipy.sparse.linalg.cg: illegal input or breakdown")
+    return x, n_iter, info == 0
+
+
+def _resolve_solver(solver, direct_solve):
+    if solver is None:
+        return "direct" if direct_solve else "ilu"
+    elif direct_solve and solver != "direct":
+        raise ValueError(f"direct_solve is True, but solver is: {solver}")
+    elif not (callable(solver) or solver in SOLVERS):
+        raise ValueError(
+            f"solver should be one of {SOLVERS} or a callable. Received: {solver}"
+        )
+    return solver
+
+
+def _factorize(
+    A,
+    solver,
+    tol,
+    maxiter,
+    drop_tol=None,
+    fill_factor=None,
+    drop_rule=None,
+    options=None,
+):
+    """
+    Set up the solver for the matrix A once: factorize it, or construct the
+    preconditioner. Returns a function which solves for every row of a
+    right-hand side array with shape ``(n_rhs, n)``.
+    """
+    if solver == "direct":
+        lu = scipy.sparse.linalg.splu(A.tocsc())
+
+        def solve(rhs, x0):
+            # Solve all right-hand sides at once.
+            return lu.solve(rhs.T).T, [0] * len(rhs), [True] * len(rhs)
+
+        return solve
+
+    if callable(solver):
+
+        def solve_one(rhs, x0):
+            return np.asarray(solver(A, rhs, x0), dtype=float), None, None
+
+    else:
+        if solver == "ilu":
+            M = _ilu_preconditioner(A, drop_tol, fill_factor, drop_rule, options)
+        elif solver == "jacobi":
+            M = _jacobi_preconditioner(A)
+        else:
+            M = SmoothedAggregation(A).aspreconditioner()
+
+        def solve_one(rhs, x0):
+            return _conjugate_gradient(A, rhs, x0, tol, maxiter, M)
+
+    def solve(rhs, x0):
+        x = np.empty_like(rhs)
+        n_iter = []
+        converged = []
+        for k in range(len(rhs)):
+            x[k], iterations, ok = solve_one(rhs[k], None if x0 is None else x0[k])
+            n_iter.append(iterations)
+            converged.append(ok)
+        return x, n_iter, converged
+
+    return solve
+
+
+def _solver_info(A, rhs, x, n_iter, converged, tol):
+    rhs_norm = np.linalg.norm(rhs, axis=1)
+    rhs_norm[rhs_norm == 0] = 1.0
+    residual = np.linalg.norm(rhs - (A @ x.T).T, axis=1) / rhs_norm
+    return [
+        SolverInfo(bool(r <= tol) if ok is None else ok, iterations, float(r))
+        for r, iterations, ok in zip(residual, n_iter, converged)
+    ]
 
 
 def laplace_interpolate(
@@ -18,6 +192,9 @@ def laplace_interpolate(
     options: dict = None,
     tol: float = 1.0e-5,
     maxiter: int = 250,
+    solver: Union[str, Callable] = None,
+    x0: FloatArray = None,
+    return_info: bool = False,
 ):
     """
     Fill gaps in ``data`` (``np.nan`` values) using Laplace interpolation.
@@ -25,24 +202,29 @@ def laplace_interpolate(
     This solves Laplace's equation where where there is no data, with data
     values functioning as fixed potential boundary conditions.
 
-    Note that an iterative solver method will be required for large grids. In
-    this case, some experimentation with the solver settings may be required to
-    find a converging solution of sufficient accuracy. Refer to the
-    documentation of :py:func:`scipy.sparse.linalg.spilu` and
-    :py:func:`scipy.sparse.linalg.cg`.
+    Only the cells without data are solved for. Note that an iterative solver
+    method will be required for large grids. The ``"amg"`` solver generally
+    requires the fewest iterations and its cost grows linearly with the number
+    of cells. With the ``"ilu"`` solver, some experimentation with the solver
+    settings may be required to find a converging solution of sufficient
+    accuracy. Refer to the documentation of :py:func:`scipy.sparse.linalg.spilu`
+    and :py:func:`scipy.sparse.linalg.cg`.
 
     Parameters
     ----------
     connectivity: scipy.sparse.csr_matrix with shape ``(n, n)``
         Sparse connectivity matrix containing ``n_nonzero`` indices and weight values.
-    data: ndarray of floats with shape ``(n,)``
+    data: ndarray of floats with shape ``(..., n)``
+        Leading dimensions are interpolated as separate slices. Slices with
+        the same nodata cells share the system of equations, which is set up
+        (factorized, or preconditioned) only once.
     use_weights: bool, default False.
         Wether to use the data attribute of the connectivity matrix as
         coefficients. If ``False``, defaults to uniform coefficients of 1.
     direct_solve: bool, optional, default ``False``
         Whether to use a direct or an iterative solver or a conjugate gradient
         solver. Direct methods provides an exact answer, but are unsuitable
-        for large problems.
+        for large problems. Equivalent to ``solver="direct"``.
     drop_tol: float, optional, default None.
         Drop tolerance for ``scipy.sparse.linalg.spilu`` which functions as a
         preconditioner for the conjugate gradient solver.
@@ -56,81 +238,97 @@ def laplace_interpolate(
         Convergence tolerance for ``scipy.sparse.linalg.cg``.
     maxiter: int, default 250.
         Maximum number of iterations for ``scipy.sparse.linalg.cg``.
+    solver: str or callable, optional
+        One of:
+
+        * ``"direct"``: sparse LU factorization.
+        * ``"ilu"``: conjugate gradient, preconditioned by an incomplete LU
+          factorization.
+        * ``"jacobi"``: conjugate gradient, preconditioned by the diagonal.
+        * ``"amg"``: conjugate gradient, preconditioned by a smoothed
+          aggregation algebraic multigrid V-cycle.
+
+        Alternatively, a callable ``solver(A, rhs, x0)`` returning the
+        solution ``x`` of the symmetric positive definite system ``A x = rhs``
+        for the cells without data. ``x0`` may be None.
+        Defaults to ``"direct"`` if ``direct_solve`` is True, ``"ilu"``
+        otherwise.
+    x0: ndarray of floats with the shape of ``data``, optional
+        Initial guess for the iterative solvers, e.g. the solution of a
+        previous time step. Only the values of the cells without data are used.
+    return_info: bool, default False.
+        Whether to return a :class:`SolverInfo` with the convergence
+        information as well.
 
     Returns
     -------
     filled: ndarray of floats
+    info: SolverInfo or list of SolverInfo
+        Only returned if ``return_info`` is True. A list with an entry per
+        slice (in C order) if ``data`` has more than one dimension.
     """
     # Input checks
     n, m = connectivity.shape
     if n != m:
         raise ValueError(f"connectivity is not a square matrix: ({n}, {m})")
-    if data.shape != (n,):
-        raise ValueError(f"expected data of shape ({n},), received: {data.shape}")
+    data = np.asarray(data)
+    if data.ndim == 0 or data.shape[-1] != n:
+        raise ValueError(f"expected data of shape (..., {n}), received: {data.shape}")
+    if x0 is not None:
+        x0 = np.asarray(x0, dtype=float)
+        if x0.shape != data.shape:
+            raise ValueError(f"expected x0 of shape {data.shape}, received: {x0.shape}")
+        x0 = x0.reshape((-1, n))
+    solver = _resolve_solver(solver, direct_solve)
 
     # Find the elements with data
-    variable = np.isnan(data)
-    constant = ~variable
-    if variable.all():
+    batch = data.reshape((-1, n))
+    variable = np.isnan(batch)
+    if variable.all(axis=1).any():
         raise ValueError("data is fully nodata")
-    elif constant.all():
-        return data.copy()
 
-    coo = connectivity.tocoo()
-    i = coo.row
-    j = coo.col
-
-    # Create uniform weighting if sparse data is not to be used.
-    if use_weights:
-        weights = connectivity.data
-    else:
-        weights = np.ones(i.size)
+    # Slices with the same nodata mask share the system matrix: group them,
+    # so that every unique matrix is factorized only once.
+    _, inverse, counts = np.unique(
+        np.packbits(variable, axis=1), axis=0, return_inverse=True, return_counts=True
+    )
+    groups = np.split(np.argsort(inverse, kind="stable"), np.cumsum(counts)[:-1])
 
-    # Find the connections to constant cells and the (non-)zero values in the
-    # coefficient matrix.
-    constant_j = constant[j]
-    nonzero = ~(constant[i] | constant[j])
+    filled = batch.astype(float, copy=True)
+    info = [SolverInfo(True, 0, 0.0)] * len(batch)
+    for members in groups:
+        mask = variable[members[0]]
+        if not mask.any():
+            continue
 
-    # Build the right-hand-side and the diagonal.
-    rhs_coo_content = (
-        weights[constant_j],
-        (i[constant_j], j[constant_j]),
-    )
-    rhs = -scipy.sparse.csr_matrix(rhs_coo_content, shape=(n, n)).dot(data)
-    diag_coo_content = (weights, (i, j))
-    diagonal = -scipy.sparse.csr_matrix(diag_coo_content, shape=(n, n)).sum(axis=1).A1
-    # Create the diagonal numbering.
-    ii = np.arange(n)
-
-    # Set the constant values via the diagonal and the rhs.
-    diagonal[constant] = 1.0
-    rhs[constant] = data[constant]
-    # Remove all zero values and add the diagonal.
-    weights = np.concatenate([weights[nonzero], diagonal])
-    i = np.concatenate([i[nonzero], ii])
-    j = np.concatenate([j[nonzero], ii])
-    coo_content = (weights, (i, j))
-    A = scipy.sparse.csr_matrix(coo_content, shape=(n, n))
-
-    if direct_solve:
-        x = scipy.sparse.linalg.spsolve(A, rhs)
-    else:
-        # Create preconditioner M
-        ilu = scipy.sparse.linalg.spilu(
-            A.tocsc(),
+        A, B = _laplace_system(connectivity, mask, use_weights)
+        solve = _factorize(
+            A,
+            solver,
+            tol,
+            maxiter,
             drop_tol=drop_tol,
             fill_factor=fill_factor,
             drop_rule=drop_rule,
             options=options,
         )
-        M = scipy.sparse.linalg.LinearOperator((n, n), ilu.solve)
-        # Call conjugate gradient solver
-        x, info = scipy.sparse.linalg.cg(
-            A, rhs, tol=tol, maxiter=maxiter, M=M, atol="legacy"
-        )
-        if info < 0:
-            raise ValueError("scipy.sparse.linalg.cg: illegal input or breakdown")
-        elif info > 0:
-            warnings.warn(f"Failed to converge after {maxiter} iterations")
+        # B has no entries in the columns of the cells without data: the NaN
+        # values are not used.
+        rhs = (B @ batch[members].T).T
+        guess = None if x0 is None else x0[np.ix_(members, mask)]
+        x, n_iter, converged = solve(rhs, guess)
+        filled[np.ix_(members, mask)] = x
+        for k, member_info in zip(
+            members, _solver_info(A, rhs, x, n_iter, converged, tol)
+        ):
+            info[k] = member_info
+
+    if not all(member_info.converged for member_info in info):
+        warnings.warn(f"Failed to converge after {maxiter} iterations")
 
-    return x
+    filled = filled.reshape(data.shape)
+    if return_info:
+        if data.ndim == 1:
+            return filled, info[0]
+        return filled, info
+    return filled
@@ -0,0 +1,240 @@
+"""
+Smoothed aggregation algebraic multigrid.
+
+A compact implementation for symmetric positive definite M-matrices, such as
+the graph Laplacians arising from Laplace interpolation. It is used as a
+preconditioner for the conjugate gradient method: the number of iterations is
+then (nearly) independent of the size of the grid.
+
+The hierarchy is constructed as follows:
+
+* The unknowns are greedily aggregated with their direct neighbors. Unknowns
+  without neighbors (e.g. scattered single cells without data) are not
+  aggregated: their rows are diagonal, and the smoother solves them exactly.
+* A tentative prolongator interpolates the constant vector (the near null
+  space of the Laplacian) within every aggregate.
+* The tentative prolongator is smoothed by one damped Jacobi iteration.
+* The coarse level matrix is formed by the Galerkin product ``P.T @ A @ P``.
+* Coarsening stops when a level is small enough, or when it barely shrinks.
+  The coarsest level is solved by a sparse LU factorization, or smoothed if it
+  is large or singular.
+
+See e.g.: Vanek, P., Mandel, J., & Brezina, M. (1996). Algebraic multigrid by
+smoothed aggregation for second and fourth order elliptic problems.
+Computing, 56(3), 179-196.
+"""
+from typing import List, NamedTuple
+
+import numba as nb
+import numpy as np
+import scipy.sparse
+import scipy.sparse.linalg
+
+from xugrid.constants import FloatArray, IntArray, IntDType
+
+# Levels smaller than this are solved directly.
+MAX_COARSE = 500
+MAX_LEVELS = 12
+# Stop coarsening if a level is not reduced below this fraction of its size.
+MAX_COARSENING_RATIO = 0.8
+# Coarsest levels larger than this are smoothed rather than solved directly.
+MAX_DIRECT = 20_000
+
+
+class Level(NamedTuple):
+    A: scipy.sparse.csr_matrix
+    P: scipy.sparse.csr_matrix
+    weighted_dinv: FloatArray
+
+
+@nb.njit(cache=True)
+def _aggregate(indptr: IntArray, indices: IntArray, n: int):
+    aggregate = np.full(n, -1, dtype=IntDType)
+    n_aggregate = 0
+    # First pass: form aggregates of a root and all its neighbors, if none of
+    # them has been aggregated yet. Unknowns without neighbors are skipped.
+    for i in range(n):
+        if aggregate[i] != -1:
+            continue
+        isolated = True
+        for k in range(indptr[i], indptr[i + 1]):
+            if indices[k] != i:
+                isolated = False
+                break
+        if isolated:
+            continue
+        free = True
+        for k in range(indptr[i], indptr[i + 1]):
+            if aggregate[indices[k]] != -1:
+                free = False
+                break
+        if not free:
+            continue
+        aggregate[i] = n_aggregate
+        for k in range(indptr[i], indptr[i + 1]):
+            aggregate[indices[k]] = n_aggregate
+        n_aggregate += 1
+
+    # Second pass: every remaining unknown with neighbors has a neighbor which
+    # has been aggregated in the first pass. Join its aggregate.
+    joined = aggregate.copy()
+    for i in range(n):
+        if aggregate[i] != -1:
+            continue
+        for k in range(indptr[i], indptr[i + 1]):
+            j = indices[k]
+            if aggregate[j] != -1:
+                joined[i] = aggregate[j]
+                break
+    return joined, n_aggregate
+
+
+def aggregate(A: scipy.sparse.csr_matrix):
+    """
+    Aggregate every unknown with its direct neighbors.
+
+    Returns
+    -------
+    aggregate: ndarray of integers with shape ``(n,)``
+        The aggregate number of every unknown, -1 for unknowns without
+        neighbors.
+    n_aggregate: int
+    """
+    n = A.shape[0]
+    return _aggregate(A.indptr, A.indices, n)
+
+
+def _spectral_radius_bound(A: scipy.sparse.csr_matrix, dinv: FloatArray) -> float:
+    # Gershgorin bound of the spectral radius of D^-1 A.
+    return float((abs(A).sum(axis=1).A1 * np.abs(dinv)).max())
+
+
+def _prolongator(A: scipy.sparse.csr_matrix, dinv: FloatArray, omega: float):
+    """
+    Returns the smoothed prolongator, and a boolean mask of the unknowns
+    without neighbors. These have no coarse level counterpart.
+    """
+    n = A.shape[0]
+    labels, n_aggregate = aggregate(A)
+    aggregated = labels != -1
+    rows = np.flatnonzero(aggregated)
+    columns = labels[rows]
+    size = np.bincount(columns, minlength=n_aggregate)
+    values = 1.0 / np.sqrt(size[columns])
+    T = scipy.sparse.csr_matrix((values, (rows, columns)), shape=(n, n_aggregate))
+    P = T - (omega * scipy.sparse.diags(dinv)) @ (A @ T)
+    return P.tocsr(), ~aggregated
+
+
+def _jacobi_smoother(A: scipy.sparse.csr_matrix, n_iter: int):
+    """Damped Jacobi iterations starting from zero: a symmetric operator."""
+    dinv = 1.0 / A.diagonal()
+    omega = (4.0 / 3.0) / _spectral_radius_bound(A, dinv)
+    weighted_dinv = omega * dinv
+
+    def smooth(b):
+        x = weighted_dinv * b
+        for _ in range(n_iter - 1):
+            x += weighted_dinv * (b - A @ x)
+        return x
+
+    return smooth
+
+
+def _coarse_solver(A: scipy.sparse.csr_matrix, n_smooth: int):
+    n = A.shape[0]
+    if n == 0:
+        return lambda b: b
+    if n <= MAX_DIRECT:
+        try:
+            return scipy.sparse.linalg.splu(A.tocsc()).solve
+        except RuntimeError:
+            # Exactly singular, e.g. a connected group of unknowns without any
+            # connection to the data.
+            pass
+    return _jacobi_smoother(A, 2 * n_smooth)
+
+
+class SmoothedAggregation:
+    """
+    Smoothed aggregation algebraic multigrid hierarchy.
+
+    Parameters
+    ----------
+    A: scipy.sparse matrix with shape ``(n, n)``
+        Symmetric positive definite.
+    max_coarse: int, default 500
+        Levels with fewer unknowns are not coarsened further.
+    max_levels: int, default 12
+    n_smooth: int, default 1
+        Number of damped Jacobi iterations before and after the coarse grid
+        correction.
+    """
+
+    def __init__(
+        self,
+        A,
+        max_coarse: int = MAX_COARSE,
+        max_levels: int = MAX_LEVELS,
+        n_smooth: int = 1,
+    ):
+        self.n_smooth = n_smooth
+        self.levels: List[Level] = []
+        A = scipy.sparse.csr_matrix(A)
+        while A.shape[0] > max_coarse and len(self.levels) < max_levels - 1:
+            dinv = 1.0 / A.diagonal()
+            omega = (4.0 / 3.0) / _spectral_radius_bound(A, dinv)
+            P, isolated = _prolongator(A, dinv, omega)
+            if P.shape[1] > MAX_COARSENING_RATIO * A.shape[0]:
+                # Coarsening stalls: further levels do not pay off.
+                break
+            weighted_dinv = omega * dinv
+            # The rows of unknowns without neighbors are diagonal: solve these
+            # exactly.
+            weighted_dinv[isolated] = dinv[isolated]
+            self.levels.append(Level(A, P, weighted_dinv))
+            A = (P.T @ A @ P).tocsr()
+        self.coarse_shape = A.shape
+        self.coarse_nnz = A.nnz
+        self.coarse_solve = _coarse_solver(A, n_smooth)
+
+    @property
+    def level_sizes(self) -> List[int]:
+        """Number of unknowns of every level, including the coarsest."""
+        return [level.A.shape[0] for level in self.levels] + [self.coarse_shape[0]]
+
+    @property
+    def shape(self):
+        if self.levels:
+            return self.levels[0].A.shape
+        return self.coarse_shape
+
+    @property
+    def operator_complexity(self) -> float:
+        """Ratio of the number of non-zeros of all levels to the first level."""
+        nnz = [level.A.nnz for level in self.levels] + [self.coarse_nnz]
+        return sum(nnz) / nnz[0]
+
+    def _cycle(self, i: int, b: FloatArray) -> FloatArray:
+        if i == len(self.levels):
+            return self.coarse_solve(b)
+        A, P, weighted_dinv = self.levels[i]
+        # Pre-smoothing, starting from zero.
+        x = weighted_dinv * b
+        for _ in range(self.n_smooth - 1):
+            x += weighted_dinv * (b - A @ x)
+        # Coarse grid correction.
+        x += P @ self._cycle(i + 1, P.T @ (b - A @ x))
+        # Post-smoothing: as many iterations as pre-smoothing, so that the cycle
+        # is a symmetric preconditioner.
+        for _ in range(self.n_smooth):
+            x += weighted_dinv * (b - A @ x)
+        return x
+
+    def vcycle(self, b: FloatArray) -> FloatArray:
+        """Apply a single V-cycle to ``b``, starting from zero."""
+        return self._cycle(0, np.asarray(b, dtype=float))
+
+    def aspreconditioner(self) -> scipy.sparse.linalg.LinearOperator:
+        """Return the V-cycle as a linear operator for a Krylov solver."""
+        return scipy.sparse.linalg.LinearOperator(self.shape, self.vcycle)
@@ -1,16 +1,34 @@
 """
 Create and merge partitioned UGRID topologies.
 """
+import os
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from itertools import accumulate
-from typing import List
+from typing import Dict, List, Optional, Tuple, Union
 
+import numba as nb
 import numpy as np
 import xarray as xr
+from scipy.sparse import csr_matrix
 
-from xugrid.constants import IntArray, IntDType
+# dask as optional dependency
+try:
+    import dask.array
+
+    DaskArray = dask.array.Array
+except ImportError:
+    DaskArray = ()
+
+from xugrid.constants import FloatArray, IntArray, IntDType
+from xugrid.conversion import grid_from_dataset
 from xugrid.core.wrap import UgridDataArray, UgridDataset
 from xugrid.ugrid.connectivity import renumber
+from xugrid.ugrid.spatial_ordering import CURVES, DEFAULT_ORDER
+from xugrid.ugrid.ugrid2d import Ugrid2d
+from xugrid.ugrid.ugridbase import AbstractUgrid, UgridType
+
+DEFAULT_CHUNK_BYTES = 64 * 2**20
 
 
 def labels_to_indices(labels: IntArray) -> List[IntArray]:
@@ -27,7 +45,245 @@ def labels_to_indices(labels: IntArray) -> List[IntArray]:
     return indices
 
 
-def partition_by_label(grid, obj, labels: IntArray):
+def owned_name(grid: UgridType) -> str:
+    """Name of the coordinate marking the owned elements of a partition."""
+    return f"{grid.name}_owned"
+
+
+def add_halo(adjacency: csr_matrix, index: IntArray, n_halo: int) -> IntArray:
+    """
+    Grow a selection by ``n_halo`` layers of neighbors.
+
+    Parameters
+    ----------
+    adjacency: csr_matrix
+    index: 1d array of integers
+        The selected elements.
+    n_halo: int
+        The number of layers of neighbors to add.
+
+    Returns
+    -------
+    index: 1d array of integers
+        The sorted selected elements, including the neighbors.
+    """
+    selected = np.zeros(adjacency.shape[0], dtype=bool)
+    selected[index] = True
+    frontier = np.asarray(index)
+    for _ in range(n_halo):
+        neighbors = adjacency[frontier].indices
+        frontier = np.unique(neighbors[~selected[neighbors]])
+        if frontier.size == 0:
+            break
+        selected[frontier] = True
+    return np.flatnonzero(selected)
+
+
+def _validate_weights(weights, n: int) -> Optional[FloatArray]:
+    if weights is None:
+        return None
+    weights = np.asarray(weights, dtype=np.float64)
+    if weights.shape != (n,):
+        raise ValueError(f"Expected weights of shape ({n},), received: {weights.shape}")
+    if (weights < 0).any():
+        raise ValueError("weights must be non-negative")
+    return weights
+
+
+# Number of bits of the space-filling curve keys used to bin the points.
+N_BIN_BITS = 20
+
+
+def _split_keys(
+    keys: np.ndarray, n_part: int, weights: Optional[FloatArray], key_bits: int
+) -> IntArray:
+    """
+    Label the points by splitting the sorted keys into ``n_part`` consecutive
+    groups of (nearly) equal size or weight.
+
+    Rather than sorting all keys, the keys are binned by their leading bits.
+    Only the points in the few bins that contain a split are sorted. A point
+    is assigned to the group containing the midpoint of its weight interval.
+    """
+    shift = max(0, key_bits - N_BIN_BITS)
+    bins = (keys >> np.uint64(shift)).astype(np.intp)
+    bin_weight = np.bincount(bins, weights=weights, minlength=1 << (key_bits - shift))
+    bin_end = np.cumsum(bin_weight, dtype=np.float64)
+    bin_start = bin_end - bin_weight
+    targets = bin_end[-1] * np.arange(1, n_part) / n_part
+    lower = np.searchsorted(targets, bin_start, side="right")
+    upper = np.searchsorted(targets, bin_end, side="left")
+    labels = lower[bins].astype(IntDType)
+
+    ambiguous = np.flatnonzero((lower != upper)[bins])
+    if ambiguous.size > 0:
+        order = ambiguous[np.argsort(keys[ambiguous], kind="stable")]
+        w = np.ones(order.size) if weights is None else weights[order]
+        b = bins[order]
+        before = np.cumsum(w) - w
+        # Subtract the weight of the preceding (ambiguous) bins.
+        is_first = np.ones(b.size, dtype=bool)
+        is_first[1:] = b[1:] != b[:-1]
+        group_start = np.maximum.accumulate(np.where(is_first, np.arange(b.size), 0))
+        midpoint = bin_start[b] + before - before[group_start] + 0.5 * w
+        labels[order] = np.searchsorted(targets, midpoint, side="left")
+    return labels
+
+
+@nb.njit(inline="always")
+def _swap(perm, x, y, weights, i, j):
+    perm[i], perm[j] = perm[j], perm[i]
+    x[i], x[j] = x[j], x[i]
+    y[i], y[j] = y[j], y[i]
+    weights[i], weights[j] = weights[j], weights[i]
+
+
+@nb.njit(cache=True)
+def _weighted_split(perm, x, y, weights, start, end, fraction):
+    """
+    Reorder [start:end] along the coordinate with the largest extent, such
+    that the points before the returned split have smaller or equal
+    coordinates than the points after it, and hold the given fraction of the
+    weight. This is a weighted quickselect with a three-way partition:
+    expected O(n).
+
+    The coordinates and weights are permuted along with perm, so that all
+    memory access is sequential.
+    """
+    xmin = np.inf
+    xmax = -np.inf
+    ymin = np.inf
+    ymax = -np.inf
+    total = 0.0
+    for i in range(start, end):
+        xmin = min(xmin, x[i])
+        xmax = max(xmax, x[i])
+        ymin = min(ymin, y[i])
+        ymax = max(ymax, y[i])
+        total += weights[i]
+    use_x = (xmax - xmin) >= (ymax - ymin)
+    target = total * fraction
+
+    lo = start
+    hi = end
+    accumulated = 0.0
+    while lo < hi:
+        coord = x if use_x else y
+        # Median of three pivot.
+        a = coord[lo]
+        b = coord[(lo + hi) // 2]
+        c = coord[hi - 1]
+        pivot = max(min(a, b), min(max(a, b), c))
+        # Three-way partition: [lo, lt) < pivot, [lt, gt) == pivot,
+        # [gt, hi) > pivot.
+        lt = lo
+        i = lo
+        gt = hi
+        w_less = 0.0
+        while i < gt:
+            value = coord[i]
+            if value < pivot:
+                w_less += weights[i]
+                _swap(perm, x, y, weights, lt, i)
+                lt += 1
+                i += 1
+            elif value > pivot:
+                gt -= 1
+                _swap(perm, x, y, weights, gt, i)
+            else:
+                i += 1
+
+        if accumulated + w_less >= target:
+            hi = lt
+            continue
+
+        accumulated += w_less
+        # A point goes before the split if the midpoint of its weight
+        # interval is smaller than the target.
+        i = lt
+        while i < gt and accumulated + 0.5 * weights[i] < target:
+            accumulated += weights[i]
+            i += 1
+        if i < gt:
+            return i
+        lo = gt
+    return lo
+
+
+def curve_labels(
+    xy: FloatArray,
+    n_part: int,
+    method: str = "hilbert",
+    weights: Optional[FloatArray] = None,
+) -> IntArray:
+    """
+    Label points by ordering them along a space-filling curve, and splitting
+    the curve into ``n_part`` parts of (nearly) equal size or weight.
+
+    Parameters
+    ----------
+    xy: ndarray of floats with shape ``(n_point, 2)``
+    n_part: int
+    method: str, one of "hilbert" or "morton", default "hilbert"
+    weights: ndarray of floats with shape ``(n_point,)``, optional
+
+    Returns
+    -------
+    labels: ndarray of integers with shape ``(n_point,)``
+    """
+    if method not in CURVES:
+        raise ValueError(
+            f"Expected one of {list(CURVES)} for method, received: {method}"
+        )
+    weights = _validate_weights(weights, len(xy))
+    if len(xy) == 0:
+        return np.empty(0, dtype=IntDType)
+    keys = CURVES[method](xy, DEFAULT_ORDER)
+    return _split_keys(keys, n_part, weights, 2 * DEFAULT_ORDER)
+
+
+def rcb_labels(
+    xy: FloatArray, n_part: int, weights: Optional[FloatArray] = None
+) -> IntArray:
+    """
+    Label points by recursive coordinate bisection: the points are recursively
+    split along the coordinate with the largest extent, such that both halves
+    have (nearly) equal size or weight.
+
+    Parameters
+    ----------
+    xy: ndarray of floats with shape ``(n_point, 2)``
+    n_part: int
+    weights: ndarray of floats with shape ``(n_point,)``, optional
+
+    Returns
+    -------
+    labels: ndarray of integers with shape ``(n_point,)``
+    """
+    xy = np.asarray(xy, dtype=np.float64)
+    n = len(xy)
+    weights = _validate_weights(weights, n)
+    # Copies: these are reordered in place.
+    weights = np.ones(n) if weights is None else weights.copy()
+    x = xy[:, 0].copy()
+    y = xy[:, 1].copy()
+
+    perm = np.arange(n)
+    labels = np.empty(n, dtype=IntDType)
+    stack = [(0, n, n_part, 0)]
+    while stack:
+        start, end, n_group, label = stack.pop()
+        if n_group == 1:
+            labels[perm[start:end]] = label
+            continue
+        n_left = n_group // 2
+        split = _weighted_split(perm, x, y, weights, start, end, n_left / n_group)
+        stack.append((split, end, n_group - n_left, label + n_left))
+        stack.append((start, split, n_left, label))
+    return labels
+
+
+def partition_by_label(grid, obj, labels: IntArray, n_halo: int = 0):
     """
     This function is used by UgridDataArray.partition_by_label and
     UgridDataset.partition_by_label.
@@ -37,11 +293,23 @@ def partition_by_label(grid, obj, labels: IntArray):
     grid: Ugrid1d, Ugrid2d
     obj: DataArray or Dataset
     labels: UgridDataArray of integers
+    n_halo: int, default 0
+        The number of layers of neighboring faces of other partitions to
+        include in every partition. If larger than zero, a boolean coordinate
+        named ``{grid.name}_owned`` is added, marking the faces that are owned
+        by the partition. Only supported for Ugrid2d topologies.
 
     Returns
     -------
     partitions: List of (grid, obj)
     """
+    if not isinstance(n_halo, (int, np.integer)) or n_halo < 0:
+        raise ValueError(f"n_halo must be a non-negative integer, received: {n_halo}")
+    if n_halo > 0 and not isinstance(grid, Ugrid2d):
+        raise NotImplementedError(
+            f"n_halo is only supported for Ugrid2d topologies, received: "
+            f"{type(grid).__name__}"
+        )
     if not isinstance(labels, UgridDataArray):
         raise TypeError(
             "labels must be a UgridDataArray, " f"received: {type(labels).__name__}"
@@ -66,23 +334,51 @@ def partition_by_label(grid, obj, labels: IntArray):
             f"Expected DataArray or Dataset, received: {type(obj).__name__}"
         )
 
-    indices = labels_to_indices(labels.values)
+    label_values = labels.values
+    indices = labels_to_indices(label_values)
+    if n_halo > 0:
+        adjacency = grid.face_face_connectivity
     partitions = []
-    for index in indices:
+    for label, index in enumerate(indices):
+        if n_halo > 0:
+            index = add_halo(adjacency, index, n_halo)
         new_grid, indexes = grid.topology_subset(index, return_index=True)
         new_obj = obj.isel(indexes, missing_dims="ignore")
+        if n_halo > 0:
+            owned = label_values[index] == label
+            new_obj = new_obj.assign_coords(
+                {owned_name(grid): (grid.core_dimension, owned)}
+            )
         partitions.append(obj_type(new_obj, new_grid))
 
     return partitions
 
 
+def _unique_rows(array: np.ndarray) -> Tuple[IntArray, IntArray]:
+    """
+    Equivalent to ``np.unique(array, axis=0, return_index=True,
+    return_inverse=True)[1:]``, but considerably faster: a (stable) lexsort
+    of the columns is cheaper than sorting a structured view of the rows.
+    """
+    n = len(array)
+    if n == 0:
+        return np.empty(0, dtype=IntDType), np.empty(0, dtype=IntDType)
+    order = np.lexsort(array.T[::-1])
+    rows = array[order]
+    is_first = np.empty(n, dtype=bool)
+    is_first[0] = True
+    is_first[1:] = (rows[1:] != rows[:-1]).any(axis=1)
+    index = order[is_first]
+    inverse = np.empty(n, dtype=IntDType)
+    inverse[order] = np.cumsum(is_first) - 1
+    return index, inverse
+
+
 def merge_nodes(grids):
     node_x = np.hstack([grid.node_x for grid in grids])
     node_y = np.hstack([grid.node_y for grid in grids])
     node_xy = np.column_stack((node_x, node_y))
-    _, index, inverse = np.unique(
-        node_xy, axis=0, return_index=True, return_inverse=True
-    )
+    index, inverse = _unique_rows(node_xy)
     # We want to maintain order, so create an inverse index to the new numbers.
     inverse = renumber(index)[inverse]
     # Maintain order.
@@ -101,7 +397,7 @@ def _merge_connectivity(gathered, slices):
     # Make sure identical edges are identified: [0, 1] == [1, 0]
     # As well as faces: [0, 1, 2] == [2, 1, 0]
     sorted = np.sort(gathered, axis=1)
-    _, index = np.unique(sorted, axis=0, return_index=True)
+    index, _ = _unique_rows(sorted)
     # Maintain order.
     index.sort()
     merged = gathered[index]
@@ -170,13 +466,13 @@ def validate_partition_topology(grouped, n_partition: int):
     return None
 
 
-def group_grids_by_name(partitions):
+def group_grids_by_name(partition_grids):
     grouped = defaultdict(list)
-    for partition in partitions:
-        for grid in partition.grids:
+    for grids in partition_grids:
+        for grid in grids:
             grouped[grid.name].append(grid)
 
-    validate_partition_topology(grouped, len(partitions))
+    validate_partition_topology(grouped, len(partition_grids))
     return grouped
 
 
@@ -243,7 +539,512 @@ def separate_variables(data_objects, ugrid_dims):
     return grouped, other
 
 
-def merge_partitions(partitions):
+def _allocate_variable(
+    variables: List[xr.Variable], dim: str, dim_indexes: List[IntArray]
+) -> Tuple[xr.Variable, List[tuple]]:
+    """
+    Create the merged variable. For numpy data, allocate the output once, and
+    return the tasks that fill it: one per partition. For dask data, lazily
+    concatenate the selections instead.
+    """
+    first = variables[0]
+    axis = first.dims.index(dim)
+    if any(isinstance(v.data, DaskArray) for v in variables):
+        data = dask.array.concatenate(
+            [
+                v.data[(slice(None),) * axis + (index,)]
+                for v, index in zip(variables, dim_indexes)
+            ],
+            axis=axis,
+        )
+        merged = xr.Variable(first.dims, data, first.attrs, first.encoding)
+        return merged, []
+
+    shape = list(first.shape)
+    shape[axis] = sum(len(index) for index in dim_indexes)
+    dtype = np.result_type(*[v.dtype for v in variables])
+    out = np.empty(shape, dtype=dtype)
+    tasks = []
+    start = 0
+    for v, index in zip(variables, dim_indexes):
+        end = start + len(index)
+        key = (slice(None),) * axis + (slice(start, end),)
+        tasks.append((out, key, v, dim, index))
+        start = end
+    merged = xr.Variable(first.dims, out, first.attrs, first.encoding)
+    return merged, tasks
+
+
+def _fill(task) -> None:
+    out, key, variable, dim, index = task
+    # Selecting first only loads the required values from lazily indexed
+    # (e.g. netCDF) data.
+    out[key] = variable.isel({dim: index}).values
+    return
+
+
+def _fill_variables(tasks: List[tuple], n_threads: Optional[int]) -> None:
+    if n_threads is None:
+        n_threads = os.cpu_count()
+    if n_threads > 1 and len(tasks) > 1:
+        with ThreadPoolExecutor(max_workers=n_threads) as executor:
+            # Consume the iterator to raise any exceptions.
+            list(executor.map(_fill, tasks))
+    else:
+        for task in tasks:
+            _fill(task)
+    return
+
+
+def _partition_grids(partition) -> List[UgridType]:
+    if isinstance(partition, (UgridDataArray, UgridDataset)):
+        return partition.grids
+    elif isinstance(partition, AbstractUgrid):
+        return [partition]
+    elif isinstance(partition, (list, tuple)) and all(
+        isinstance(grid, AbstractUgrid) for grid in partition
+    ):
+        return list(partition)
+    raise TypeError(
+        "Expected UgridDataArray, UgridDataset, Ugrid1d, Ugrid2d, or a sequence "
+        f"of Ugrid1d or Ugrid2d, received: {type(partition).__name__}"
+    )
+
+
+def _strip_halo(partition, grids: List[UgridType]):
+    """
+    Remove the halo of the grids of a partition, if present.
+
+    Returns the owned grids, and for every UGRID dimension of the grids with a
+    halo, the index of the owned elements into the partition.
+    """
+    if not isinstance(partition, (UgridDataArray, UgridDataset)):
+        return grids, {}
+    coords = partition.obj.coords
+    owned_grids = []
+    owned_indexes = {}
+    for grid in grids:
+        name = owned_name(grid)
+        if name in coords:
+            owned = np.flatnonzero(coords[name].values)
+            grid, grid_indexes = grid.topology_subset(owned, return_index=True)
+            owned_indexes.update(
+                {dim: np.asarray(index) for dim, index in grid_indexes.items()}
+            )
+        owned_grids.append(grid)
+    return owned_grids, owned_indexes
+
+
+def _as_dataset(partition) -> xr.Dataset:
+    if isinstance(partition, (UgridDataArray, UgridDataset)):
+        partition = partition.obj
+    if isinstance(partition, xr.DataArray):
+        return partition.to_dataset()
+    elif isinstance(partition, xr.Dataset):
+        # Drop the topology variables of plain xarray partitions: the merged
+        # grids of the plan provide them.
+        connectivity_vars = [
+            name
+            for v in partition.ugrid_roles.connectivity.values()
+            for name in v.values()
+        ]
+        return partition.drop_vars(partition.ugrid_roles.topology + connectivity_vars)
+    raise TypeError(
+        "Expected UgridDataArray, UgridDataset, DataArray, or Dataset, "
+        f"received: {type(partition).__name__}"
+    )
+
+
+def _default_chunks(obj: xr.Dataset, merged_sizes: Dict[str, int]) -> dict:
+    """
+    Chunk along the first non-UGRID dimension of the UGRID variables, such
+    that a chunk of the merged variable does not exceed DEFAULT_CHUNK_BYTES.
+    """
+    chunks = {}
+    for var in obj.data_vars.values():
+        ugrid_dims = [dim for dim in var.dims if dim in merged_sizes]
+        other_dims = [dim for dim in var.dims if dim not in merged_sizes]
+        if not ugrid_dims or not other_dims:
+            continue
+        first, *rest = other_dims
+        slice_bytes = (
+            var.dtype.itemsize
+            * merged_sizes[ugrid_dims[0]]
+            * np.prod([obj.dims[dim] for dim in rest], dtype=int)
+        )
+        size = max(1, int(DEFAULT_CHUNK_BYTES // max(slice_bytes, 1)))
+        size = min(size, obj.dims[first])
+        chunks[first] = min(size, chunks.get(first, size))
+    return chunks
+
+
+def _compute(delayed, n_threads: Optional[int]) -> None:
+    if n_threads is None:
+        n_threads = os.cpu_count()
+    if n_threads > 1:
+        delayed.compute(scheduler="threads", num_workers=n_threads)
+    else:
+        delayed.compute(scheduler="synchronous")
+    return
+
+
+class MergePlan:
+    """
+    A reusable plan to merge partitioned data into a single UgridDataset.
+
+    Merging the topologies of the partitions requires finding the duplicate
+    nodes, edges, and faces; this is the most expensive part of
+    :func:`xugrid.merge_partitions`. A MergePlan does this once, and stores the
+    merged topologies and the indexes into the partitions. It can then be
+    applied to any number of sets of partitions sharing the same partition
+    topologies, e.g. the output of successive simulation periods.
+
+    Partitions created with a halo (see the ``n_halo`` argument of
+    ``.ugrid.partition``) are merged using only the elements they own.
+
+    The plan can be stored in and loaded from a netCDF file.
+
+    Use :meth:`MergePlan.from_partitions` to create a plan.
+
+    Parameters
+    ----------
+    grids: list of Ugrid1d or Ugrid2d
+        The merged topologies.
+    indexes: dict of str to list of ndarray of integers
+        For every UGRID dimension: the indexes to take from every partition.
+    sizes: dict of str to ndarray of integers
+        For every UGRID dimension: the size of the dimension in every partition.
+
+    Examples
+    --------
+    Create a plan once, then merge the partitioned output of multiple periods:
+
+    >>> plan = xugrid.MergePlan.from_partitions(partitions)
+    >>> plan.to_netcdf("merge-plan.nc")
+    >>> for period in periods:
+    ...     paths = [f"{period}/output_{i}.nc" for i in range(plan.n_partition)]
+    ...     partitions = [xr.open_dataset(path) for path in paths]
+    ...     merged = plan.merge(partitions)
+    """
+
+    def __init__(
+        self,
+        grids: List[UgridType],
+        indexes: Dict[str, List[IntArray]],
+        sizes: Dict[str, IntArray],
+    ):
+        n_partition = set(len(index) for index in indexes.values())
+        n_partition.update(len(size) for size in sizes.values())
+        if len(n_partition) > 1:
+            raise ValueError(
+                "Number of partitions is inconsistent across dimensions: "
+                f"{n_partition}"
+            )
+        if set(indexes) != set(sizes):
+            raise ValueError("indexes and sizes must have the same dimensions")
+        self.grids = list(grids)
+        self.indexes = indexes
+        self.sizes = {dim: np.asarray(size) for dim, size in sizes.items()}
+
+    @property
+    def n_partition(self) -> int:
+        """Number of partitions the plan merges."""
+        return len(next(iter(self.indexes.values())))
+
+    @property
+    def dimensions(self) -> Tuple[str, ...]:
+        """The UGRID dimensions merged by the plan."""
+        return tuple(self.indexes)
+
+    @classmethod
+    def from_partitions(cls, partitions) -> "MergePlan":
+        """
+        Create a merge plan by merging the topologies of the partitions.
+
+        Parameters
+        ----------
+        partitions: sequence
+            Sequence of UgridDataArray, UgridDataset, Ugrid1d, Ugrid2d, or
+            sequence of Ugrid1d or Ugrid2d (for multiple topologies).
+
+        Returns
+        -------
+        plan: MergePlan
+        """
+        partitions = list(partitions)
+        partition_grids = [_partition_grids(partition) for partition in partitions]
+        grids_by_name = group_grids_by_name(partition_grids)
+        owned_grids, owned_indexes = zip(
+            *(
+                _strip_halo(partition, grids)
+                for partition, grids in zip(partitions, partition_grids)
+            )
+        )
+        owned_by_name = group_grids_by_name(owned_grids)
+
+        merged_grids = []
+        indexes = {}
+        sizes = {}
+        for name, grids in owned_by_name.items():
+            grid = grids[0]
+            merged_grid, grid_indexes = grid.merge_partitions(grids)
+            merged_grids.append(merged_grid)
+            for dim, dim_indexes in grid_indexes.items():
+                # Map the indexes into the owned part to the partition.
+                indexes[dim] = [
+                    owned[dim][index] if dim in owned else index
+                    for owned, index in zip(owned_indexes, dim_indexes)
+                ]
+                sizes[dim] = np.array(
+                    [g.dimensions[dim] for g in grids_by_name[name]], dtype=IntDType
+                )
+
+        return cls(merged_grids, indexes, sizes)
+
+    def _validate(self, data_objects: List[xr.Dataset]) -> None:
+        n = len(data_objects)
+        if n != self.n_partition:
+            raise ValueError(
+                f"Merge plan is for {self.n_partition} partitions, received: {n}"
+            )
+        for i, obj in enumerate(data_objects):
+            for dim, size in self.sizes.items():
+                if dim in obj.dims and obj.dims[dim] != size[i]:
+                    raise ValueError(
+                        f"Partition {i} does not match the merge plan: expected "
+                        f"size {size[i]} for dimension {dim}, received: "
+                        f"{obj.dims[dim]}"
+                    )
+        return
+
+    def merge(self, partitions, n_threads: Optional[int] = None) -> UgridDataset:
+        """
+        Merge the data of the partitions, without merging their topologies.
+
+        The partitions must be given in the same order as they were provided
+        to :meth:`MergePlan.from_partitions`. As the topology is taken from the
+        plan, the partitions may also be plain xarray objects, e.g. opened
+        with ``xarray.open_dataset``: only the data that is merged is loaded.
+
+        Parameters
+        ----------
+        partitions: sequence of UgridDataArray, UgridDataset, DataArray, or Dataset
+        n_threads: int, optional
+            Number of threads to fill the merged variables with. Defaults to
+            the number of CPUs.
+
+        Returns
+        -------
+        merged: UgridDataset
+        """
+        halo_coords = [owned_name(grid) for grid in self.grids]
+        data_objects = [
+            _as_dataset(partition).drop_vars(halo_coords, errors="ignore")
+            for partition in partitions
+        ]
+        self._validate(data_objects)
+        ugrid_dims = set(self.dimensions)
+        vars_by_dim, other_vars = separate_variables(data_objects, ugrid_dims)
+
+        # First, take identical non-UGRID variables from the first partition:
+        merged = data_objects[0][other_vars]
+
+        # Allocate the variables along the UGRID dimension, without the
+        # duplicates.
+        merged_variables = {}
+        tasks = []
+        for dim, dim_indexes in self.indexes.items():
+            for var in vars_by_dim[dim]:
+                variables = [obj.variables[var] for obj in data_objects]
+                merged_variables[var], var_tasks = _allocate_variable(
+                    variables, dim, dim_indexes
+                )
+                tasks.extend(var_tasks)
+
+        _fill_variables(tasks, n_threads)
+        coords = [var for var in merged_variables if var in data_objects[0].coords]
+        merged = merged.assign(merged_variables).set_coords(coords)
+        return UgridDataset(merged, [grid.copy() for grid in self.grids])
+
+    def _merge_lazy(self, partitions, chunks: Optional[dict]) -> UgridDataset:
+        if DaskArray == ():
+            raise ImportError("dask is required to merge partitions to a file")
+        data_objects = [_as_dataset(partition) for partition in partitions]
+        if chunks is None:
+            merged_sizes = {
+                dim: sum(len(index) for index in dim_indexes)
+                for dim, dim_indexes in self.indexes.items()
+            }
+            chunks = _default_chunks(data_objects[0], merged_sizes)
+        # Chunking does not load any data: every chunk is gathered from its
+        # partition only when it is written.
+        data_objects = [obj.chunk(chunks) for obj in data_objects]
+        return self.merge(data_objects)
+
+    def merge_to_netcdf(
+        self,
+        partitions,
+        path: Union[str, os.PathLike],
+        chunks: Optional[dict] = None,
+        n_threads: Optional[int] = None,
+        **kwargs,
+    ) -> None:
+        """
+        Merge the data of the partitions and write it directly to a netCDF
+        file, without materializing the merged dataset in memory.
+
+        The merged variables are written chunk by chunk: every chunk is
+        gathered from the partitions just before it is written. Peak memory
+        use is therefore proportional to the chunk size (times the number of
+        threads), rather than to the size of the merged dataset. For best
+        results, provide lazily opened partitions, e.g. opened by
+        ``xarray.open_dataset``. Requires dask.
+
+        Parameters
+        ----------
+        partitions: sequence of UgridDataArray, UgridDataset, DataArray, or Dataset
+        path: str or PathLike
+        chunks: dict, optional
+            Chunk sizes of the non-UGRID dimensions, e.g. ``{"time": 10}``.
+            Defaults to chunking along the first non-UGRID dimension of the
+            UGRID variables (e.g. time), with at most 64 MB per chunk of a
+            merged variable.
+        n_threads: int, optional
+            Number of threads to gather and write chunks with. Defaults to the
+            number of CPUs.
+        **kwargs: keyword arguments
+            Passed on to ``xarray.Dataset.to_netcdf``.
+        """
+        merged = self._merge_lazy(partitions, chunks)
+        delayed = merged.ugrid.to_dataset().to_netcdf(path, compute=False, **kwargs)
+        _compute(delayed, n_threads)
+        return
+
+    def merge_to_zarr(
+        self,
+        partitions,
+        store,
+        chunks: Optional[dict] = None,
+        n_threads: Optional[int] = None,
+        **kwargs,
+    ) -> None:
+        """
+        Merge the data of the partitions and write it directly to a Zarr
+        store, without materializing the merged dataset in memory.
+
+        Like :meth:`MergePlan.merge_to_netcdf`, but every Zarr chunk contains
+        the full UGRID dimension: the peak memory use is proportional to one
+        chunk of a merged variable (times the number of threads). Requires
+        dask.
+
+        Parameters
+        ----------
+        partitions: sequence of UgridDataArray, UgridDataset, DataArray, or Dataset
+        store: str, PathLike, or MutableMapping
+        chunks: dict, optional
+            Chunk sizes of the non-UGRID dimensions, e.g. ``{"time": 10}``.
+            Defaults to chunking along the first non-UGRID dimension of the
+            UGRID variables (e.g. time), with at most 64 MB per chunk of a
+            merged variable.
+        n_threads: int, optional
+            Number of threads to gather and write chunks with. Defaults to the
+            number of CPUs.
+        **kwargs: keyword arguments
+            Passed on to ``xarray.Dataset.to_zarr``.
+        """
+        merged = self._merge_lazy(partitions, chunks)
+        # Zarr requires regular chunks, the partitions are generally of
+        # unequal size.
+        ds = merged.ugrid.to_dataset()
+        ds = ds.chunk({dim: -1 for dim in self.dimensions if dim in ds.dims})
+        delayed = ds.to_zarr(store, compute=False, **kwargs)
+        _compute(delayed, n_threads)
+        return
+
+    def to_dataset(self) -> xr.Dataset:
+        """
+        Convert the plan to an xarray Dataset, containing the UGRID topologies
+        and for every UGRID dimension the partition number and the index into
+        the partition of every merged element.
+
+        Returns
+        -------
+        dataset: xr.Dataset
+        """
+        ds = xr.merge([grid.to_dataset() for grid in self.grids])
+        ds["merge_partition_size"] = self.n_partition
+        for dim, dim_indexes in self.indexes.items():
+            partition = np.repeat(
+                np.arange(self.n_partition, dtype=IntDType),
+                [len(index) for index in dim_indexes],
+            )
+            ds[f"{dim}_partition"] = (dim, partition)
+            ds[f"{dim}_partition_index"] = (dim, np.concatenate(dim_indexes))
+            ds[f"{dim}_partition_size"] = ("merge_partition", self.sizes[dim])
+        ds.attrs["merge_plan_dimensions"] = " ".join(self.dimensions)
+        return ds
+
+    @classmethod
+    def from_dataset(cls, dataset: xr.Dataset) -> "MergePlan":
+        """
+        Create a plan from a dataset created by :meth:`MergePlan.to_dataset`.
+
+        Parameters
+        ----------
+        dataset: xr.Dataset
+
+        Returns
+        -------
+        plan: MergePlan
+        """
+        if "merge_plan_dimensions" not in dataset.attrs:
+            raise ValueError("dataset does not contain a merge plan")
+        grids = [
+            grid_from_dataset(dataset, topology)
+            for topology in dataset.ugrid_roles.topology
+        ]
+        n_partition = int(dataset["merge_partition_size"])
+        indexes = {}
+        sizes = {}
+        for dim in dataset.attrs["merge_plan_dimensions"].split():
+            partition = dataset[f"{dim}_partition"].values
+            index = dataset[f"{dim}_partition_index"].values.astype(IntDType)
+            sections = np.searchsorted(partition, np.arange(1, n_partition))
+            indexes[dim] = np.split(index, sections)
+            sizes[dim] = dataset[f"{dim}_partition_size"].values.astype(IntDType)
+        return cls(grids, indexes, sizes)
+
+    def to_netcdf(self, path: Union[str, os.PathLike], **kwargs) -> None:
+        """
+        Write the plan to a netCDF file.
+
+        Parameters
+        ----------
+        path: str or PathLike
+        **kwargs: keyword arguments
+            Passed on to ``xarray.Dataset.to_netcdf``.
+        """
+        self.to_dataset().to_netcdf(path, **kwargs)
+        return
+
+    @classmethod
+    def from_netcdf(cls, path: Union[str, os.PathLike]) -> "MergePlan":
+        """
+        Load a plan written by :meth:`MergePlan.to_netcdf`.
+
+        Parameters
+        ----------
+        path: str or PathLike
+
+        Returns
+        -------
+        plan: MergePlan
+        """
+        with xr.open_dataset(path) as ds:
+            return cls.from_dataset(ds.load())
+
+
+def merge_partitions(partitions, n_threads: Optional[int] = None):
     """
     Merge topology and data, partitioned along UGRID dimensions, into a single
     UgridDataset.
@@ -255,9 +1056,23 @@ def merge_partitions(partitions):
     Variables are omitted from the merged result if non-UGRID dimensions do not
     match in size.
 
+    The output of every merged variable is allocated once, and filled per
+    partition by a pool of threads. Variables backed by dask arrays are merged
+    lazily.
+
+    Partitions created with a halo (see the ``n_halo`` argument of
+    ``.ugrid.partition``) contain a coordinate marking the owned elements.
+    Only the owned elements of such partitions are merged.
+
+    To merge data of partitions with the same topologies repeatedly, create a
+    :class:`xugrid.MergePlan` once instead.
+
     Parameters
     ----------
     partitions : sequence of UgridDataset or UgridDataArray
+    n_threads: int, optional
+        Number of threads to fill the merged variables with. Defaults to the
+        number of CPUs.
 
     Returns
     -------
@@ -272,38 +1087,5 @@ def merge_partitions(partitions):
     if obj_type not in (UgridDataArray, UgridDataset):
         raise TypeError(msg.format(obj_type.__name__))
 
-    # Convert to dataset for convenience
-    data_objects = [partition.obj for partition in partitions]
-    data_objects = [
-        obj.to_dataset() if isinstance(obj, xr.DataArray) else obj
-        for obj in data_objects
-    ]
-    # Collect grids
-    grids = [grid for p in partitions for grid in p.grids]
-    ugrid_dims = set(dim for grid in grids for dim in grid.dimensions)
-    grids_by_name = group_grids_by_name(partitions)
-    vars_by_dim, other_vars = separate_variables(data_objects, ugrid_dims)
-
-    # First, take identical non-UGRID variables from the first partition:
-    merged = data_objects[0][other_vars]
-
-    # Merge the UGRID topologies into one, and find the indexes to index into
-    # the data to avoid duplicates.
-    merged_grids = []
-    for grids in grids_by_name.values():
-        # First, merge the grid topology.
-        grid = grids[0]
-        merged_grid, indexes = grid.merge_partitions(grids)
-        merged_grids.append(merged_grid)
-
-        # Now remove duplicates, then concatenate along the UGRID dimension.
-        for dim, dim_indexes in indexes.items():
-            vars = vars_by_dim[dim]
-            selection = [
-                obj[vars].isel({dim: index}, missing_dims="ignore")
-                for obj, index in zip(data_objects, dim_indexes)
-            ]
-            merged_selection = xr.concat(selection, dim=dim)
-            merged.update(merged_selection)
-
-    return UgridDataset(merged, merged_grids)
+    plan = MergePlan.from_partitions(partitions)
+    return plan.merge(partitions, n_threads=n_threads)
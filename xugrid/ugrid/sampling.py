@@ -0,0 +1,305 @@
+"""
+Sampling face data at point locations.
+
+Locating the points in the grid is generally much more expensive than
+fetching the values. A PointSampler locates the points once, and stores for
+every point the faces to sample and their weights. It can then be applied to
+any data on the same topology, e.g. many variables of many output files.
+"""
+from typing import Tuple, Union
+
+import numpy as np
+import xarray as xr
+
+# dask as optional dependency
+try:
+    import dask.array
+
+    DaskArray = dask.array.Array
+except ImportError:
+    DaskArray = ()
+
+from xugrid.constants import FloatArray, FloatDType, IntArray
+from xugrid.core.wrap import UgridDataArray, UgridDataset
+from xugrid.ugrid import connectivity, voronoi
+from xugrid.ugrid.ugrid2d import Ugrid2d
+
+SAMPLING_METHODS = ("containing", "barycentric", "idw")
+# Power of the inverse distance weighting.
+IDW_POWER = 2.0
+
+
+def containing_weights(grid, points: FloatArray) -> Tuple[IntArray, FloatArray]:
+    """
+    Every point takes the value of the face that contains it.
+
+    Returns
+    -------
+    index: ndarray of integers with shape ``(n_point, 1)``
+        -1 for points outside of the grid.
+    weights: ndarray of floats with shape ``(n_point, 1)``
+    """
+    index = grid.locate_points(points)
+    weights = (index != -1).astype(FloatDType)
+    return index[:, np.newaxis], weights[:, np.newaxis]
+
+
+def barycentric_weights(grid, points: FloatArray) -> Tuple[IntArray, FloatArray]:
+    """
+    Interpolate between the face centroids: every point is located in the
+    centroidal Voronoi tesselation of the grid, and takes the barycentric
+    weights of the surrounding centroids. Points outside of the tesselation,
+    but inside the grid, take the value of the face that contains them.
+
+    Returns
+    -------
+    index: ndarray of integers with shape ``(n_point, n_max_node)``
+        -1 for unused entries.
+    weights: ndarray of floats with shape ``(n_point, n_max_node)``
+        Zero for unused entries.
+    """
+    vertices, faces, node_to_face_index = voronoi.voronoi_topology(
+        grid.node_face_connectivity,
+        grid.node_coordinates,
+        grid.centroids,
+    )
+    voronoi_grid = Ugrid2d(vertices[:, 0], vertices[:, 1], -1, faces)
+    voronoi_face, weights = voronoi_grid.compute_barycentric_weights(points)
+    index = node_to_face_index[voronoi_grid.face_node_connectivity[voronoi_face]]
+    outside = voronoi_face == -1
+    weights[outside] = 0.0
+    index[weights <= 0.0] = -1
+
+    # Points outside of the tesselation take the value of the containing face.
+    containing, containing_weight = containing_weights(grid, points[outside])
+    index[outside, :1] = containing
+    weights[outside, :1] = containing_weight
+    return index, weights
+
+
+def idw_weights(grid, points: FloatArray) -> Tuple[IntArray, FloatArray]:
+    """
+    Interpolate the values of the face containing the point and its direct
+    neighbors, weighted by the inverse squared distance to their centroids.
+
+    Returns
+    -------
+    index: ndarray of integers with shape ``(n_point, 1 + n_max_neighbor)``
+        -1 for unused entries.
+    weights: ndarray of floats with shape ``(n_point, 1 + n_max_neighbor)``
+        Zero for unused entries.
+    """
+    containing = grid.locate_points(points)
+    neighbors = connectivity.to_dense(grid.face_face_connectivity, -1)
+    index = np.column_stack((containing, neighbors[containing]))
+    index[containing == -1] = -1
+    used = index != -1
+
+    distance = np.linalg.norm(grid.centroids[index] - points[:, np.newaxis], axis=-1)
+    with np.errstate(divide="ignore"):
+        weights = np.where(used, 1.0 / distance**IDW_POWER, 0.0)
+    # A point on a centroid takes the value of that face.
+    exact = used & (distance == 0.0)
+    has_exact = exact.any(axis=1)
+    weights[has_exact] = exact[has_exact]
+    total = weights.sum(axis=1)
+    inside = total > 0.0
+    weights[inside] /= total[inside, np.newaxis]
+    index[weights <= 0.0] = -1
+    return index, weights
+
+
+WEIGHTS = {
+    "containing": containing_weights,
+    "barycentric": barycentric_weights,
+    "idw": idw_weights,
+}
+
+
+def point_weights(grid, points: FloatArray, method: str):
+    """
+    Compute the faces to sample and their weights for every point.
+
+    Parameters
+    ----------
+    grid: Ugrid2d
+    points: ndarray of floats with shape ``(n_point, 2)``
+    method: str
+        One of ``"containing"``, ``"barycentric"``, or ``"idw"``.
+
+    Returns
+    -------
+    index: ndarray of integers with shape ``(n_point, n)``
+        -1 for unused entries.
+    weights: ndarray of floats with shape ``(n_point, n)``
+        Zero for unused entries. All weights of a point are zero if it is
+        located outside of the grid.
+    """
+    if method not in WEIGHTS:
+        raise ValueError(
+            f"method should be one of {SAMPLING_METHODS}, received: {method}"
+        )
+    return WEIGHTS[method](grid, points)
+
+
+def _weighted_sum(values, index: IntArray, weights: FloatArray):
+    gathered = np.where(index == -1, 0.0, values[..., index])
+    return (gathered * weights).sum(axis=-1)
+
+
+def _sample_variable(
+    da: xr.DataArray, dim: str, index: IntArray, weights: FloatArray
+) -> xr.DataArray:
+    da = da.transpose(..., dim)
+    data = da.data
+    dtype = np.result_type(data.dtype, weights.dtype)
+    n_point = len(index)
+    if isinstance(data, DaskArray):
+        data = data.rechunk({data.ndim - 1: -1})
+        out = data.map_blocks(
+            _weighted_sum,
+            index,
+            weights,
+            chunks=(*data.chunks[:-1], (n_point,)),
+            dtype=dtype,
+        )
+    else:
+        out = _weighted_sum(np.asarray(data), index, weights)
+    coords = {name: coord for name, coord in da.coords.items() if dim not in coord.dims}
+    variable = xr.Variable(da.dims, out, attrs=da.attrs)
+    return xr.DataArray(variable, coords=coords, name=da.name)
+
+
+def sample_weighted(
+    obj: Union[xr.DataArray, xr.Dataset],
+    dim: str,
+    index: IntArray,
+    weights: FloatArray,
+) -> Union[xr.DataArray, xr.Dataset]:
+    """
+    Compute the weighted sum of the face values for every point, as a single
+    vectorized gather over all other dimensions. Dask arrays are sampled
+    lazily.
+
+    Parameters
+    ----------
+    obj: xr.DataArray or xr.Dataset
+    dim: str
+        Face dimension.
+    index: ndarray of integers with shape ``(n_point, n)``
+    weights: ndarray of floats with shape ``(n_point, n)``
+
+    Returns
+    -------
+    sampled: xr.DataArray or xr.Dataset
+        The face dimension is replaced by the points. Variables without the
+        face dimension are left as is.
+    """
+    if isinstance(obj, xr.DataArray):
+        return _sample_variable(obj, dim, index, weights)
+    variables = {
+        name: _sample_variable(da, dim, index, weights) if dim in da.dims else da
+        for name, da in obj.data_vars.items()
+    }
+    coords = {
+        name: coord for name, coord in obj.coords.items() if dim not in coord.dims
+    }
+    return xr.Dataset(variables, coords=coords, attrs=obj.attrs)
+
+
+class PointSampler:
+    """
+    Locate points in a 2D grid once, and sample the face data of any
+    UgridDataArray or UgridDataset on the same topology.
+
+    Out-of-bounds points are ignored, as in
+    :meth:`xugrid.UgridDataArrayAccessor.sel_points`.
+
+    Parameters
+    ----------
+    grid: Ugrid2d
+    x: 1d array of floats with shape ``(n_point,)``
+    y: 1d array of floats with shape ``(n_point,)``
+    method: str, default "containing"
+        ``"containing"`` takes the value of the face containing the point.
+        ``"barycentric"`` interpolates the values of the surrounding faces,
+        using the barycentric weights of the point in the centroidal Voronoi
+        tesselation. ``"idw"`` interpolates the values of the containing face
+        and its neighbors, weighted by the inverse squared distance to their
+        centroids.
+
+    Examples
+    --------
+    Locate the stations once, and sample all variables of many files:
+
+    >>> sampler = xugrid.PointSampler(grid, x=station_x, y=station_y)
+    >>> for path in paths:
+    >>>     uds = xugrid.open_dataset(path)
+    >>>     stations = sampler.sample(uds)
+    """
+
+    def __init__(
+        self,
+        grid,
+        x: FloatArray,
+        y: FloatArray,
+        method: str = "containing",
+    ):
+        x = np.atleast_1d(x)
+        y = np.atleast_1d(y)
+        if x.shape != y.shape:
+            raise ValueError("shape of x does not match shape of y")
+        if x.ndim != 1:
+            raise ValueError("x and y must be 1d")
+        xy = np.column_stack([x, y])
+        index, weights = point_weights(grid, xy, method)
+
+        # Store only the points inside of the grid.
+        valid = (weights > 0.0).any(axis=1)
+        self.grid = grid
+        self.method = method
+        self.point_index = np.flatnonzero(valid)
+        self.xy = xy[valid]
+        self.index = index[valid]
+        self.weights = weights[valid]
+
+    @property
+    def n_point(self) -> int:
+        """Number of points inside of the grid."""
+        return len(self.point_index)
+
+    def sample(self, obj) -> Union[xr.DataArray, xr.Dataset]:
+        """
+        Sample the face data at the points.
+
+        Parameters
+        ----------
+        obj: UgridDataArray, UgridDataset, xr.DataArray, or xr.Dataset
+            Data on the topology of the sampler.
+
+        Returns
+        -------
+        selection: xr.DataArray or xr.Dataset
+            The name of the topology is prefixed in the x, y coordinates.
+        """
+        grid = self.grid
+        dim = grid.face_dimension
+        if isinstance(obj, (UgridDataArray, UgridDataset)):
+            obj = obj.obj
+        if obj.sizes.get(dim, grid.n_face) != grid.n_face:
+            raise ValueError(
+                f"Expected {grid.n_face} faces along {dim}, received: "
+                f"{obj.sizes[dim]}"
+            )
+
+        if self.method == "containing":
+            selection = obj.isel({dim: self.index[:, 0]})
+        else:
+            selection = sample_weighted(obj, dim, self.index, self.weights)
+
+        coords = {
+            f"{grid.name}_index": (dim, self.point_index),
+            f"{grid.name}_x": (dim, self.xy[:, 0]),
+            f"{grid.name}_y": (dim, self.xy[:, 1]),
+        }
+        return selection.assign_coords(coords)
@@ -0,0 +1,313 @@
+"""
+Scanline rasterization of faces.
+
+Rather than locating every pixel centre in the celltree, every row of pixels
+is intersected with the edges of the faces crossing it. The pixels between
+pairs of edge crossings are then filled with the face index directly.
+
+Rows are processed in blocks. For every block, the faces whose y range
+overlaps the block are gathered per row; the rows of a block are filled in
+parallel. The temporary memory use is bounded by the block size rather than
+the size of the output raster. Large rasters can be split in tiles: only the
+faces whose bounding box overlaps a tile need to be rasterized for it.
+
+A pixel belongs to a face if its centre lies within the face, including the
+lower and left edges, excluding the upper and right edges. This ensures every
+pixel is assigned to a single face, also when the pixel centres coincide with
+the face edges. Consequently, pixel centres on the upper or right boundary of
+the grid are outside.
+
+For meshes without overlapping faces, the result is identical to locating
+every pixel centre in the celltree. Where faces overlap, a pixel is assigned to
+the lowest face index, whereas the celltree returns any of the overlapping
+faces.
+"""
+from typing import Dict, List, Tuple
+
+import numba as nb
+import numpy as np
+
+from xugrid.constants import FloatArray, FloatDType, IntArray, IntDType
+
+# Number of rows that are filled together.
+ROWS_PER_BLOCK = 256
+
+
+@nb.njit(cache=True)
+def _face_y_bounds(node_y, faces, fill_value):
+    n_face, n_max = faces.shape
+    ymin = np.empty(n_face)
+    ymax = np.empty(n_face)
+    for i in range(n_face):
+        lo = np.inf
+        hi = -np.inf
+        for j in range(n_max):
+            node = faces[i, j]
+            if node == fill_value:
+                break
+            lo = min(lo, node_y[node])
+            hi = max(hi, node_y[node])
+        ymin[i] = lo
+        ymax[i] = hi
+    return ymin, ymax
+
+
+@nb.njit(inline="always")
+def _row_crossings(node_x, node_y, faces, fill_value, face, yc, crossings):
+    n_max = faces.shape[1]
+    n_node = n_max
+    for j in range(n_max):
+        if faces[face, j] == fill_value:
+            n_node = j
+            break
+
+    n = 0
+    for j in range(n_node):
+        a = faces[face, j]
+        b = faces[face, (j + 1) % n_node]
+        ya = node_y[a]
+        yb = node_y[b]
+        # Half-open: an edge includes its lower, but not its upper vertex.
+        if (ya <= yc < yb) or (yb <= yc < ya):
+            t = (yc - ya) / (yb - ya)
+            crossings[n] = node_x[a] + t * (node_x[b] - node_x[a])
+            n += 1
+
+    # Insertion sort: there are only a few crossings.
+    for i in range(1, n):
+        value = crossings[i]
+        k = i - 1
+        while k >= 0 and crossings[k] > value:
+            crossings[k + 1] = crossings[k]
+            k -= 1
+        crossings[k + 1] = value
+    return n
+
+
+@nb.njit(parallel=True, cache=True)
+def _scanline(
+    node_x,
+    node_y,
+    faces,
+    fill_value,
+    row_start,
+    row_end,
+    xs,
+    xorder,
+    ys,
+    yorder,
+    rows_per_block,
+    out,
+):
+    n_face, n_max = faces.shape
+    n_row = ys.size
+    for start in range(0, n_row, rows_per_block):
+        end = min(start + rows_per_block, n_row)
+        n_block = end - start
+
+        # Gather the faces per row of this block, in order of face index.
+        indptr = np.zeros(n_block + 1, dtype=np.int64)
+        for face in range(n_face):
+            for row in range(max(row_start[face], start), min(row_end[face], end)):
+                indptr[row - start + 1] += 1
+        for k in range(n_block):
+            indptr[k + 1] += indptr[k]
+        indices = np.empty(indptr[-1], dtype=np.int64)
+        position = indptr[:-1].copy()
+        for face in range(n_face):
+            for row in range(max(row_start[face], start), min(row_end[face], end)):
+                indices[position[row - start]] = face
+                position[row - start] += 1
+
+        for k in nb.prange(n_block):
+            yc = ys[start + k]
+            out_row = yorder[start + k]
+            crossings = np.empty(n_max)
+            for m in range(indptr[k], indptr[k + 1]):
+                face = indices[m]
+                n = _row_crossings(
+                    node_x, node_y, faces, fill_value, face, yc, crossings
+                )
+                for c in range(0, n - 1, 2):
+                    first = np.searchsorted(xs, crossings[c], side="left")
+                    last = np.searchsorted(xs, crossings[c + 1], side="left")
+                    for col in range(first, last):
+                        # Faces are visited in order: keep the lowest index.
+                        if out[out_row, xorder[col]] == -1:
+                            out[out_row, xorder[col]] = face
+    return
+
+
+def rasterize_faces(
+    node_x: FloatArray,
+    node_y: FloatArray,
+    face_node_connectivity: IntArray,
+    fill_value: int,
+    x: FloatArray,
+    y: FloatArray,
+    rows_per_block: int = ROWS_PER_BLOCK,
+) -> IntArray:
+    """
+    Find the face in which every pixel centre of a raster is located.
+
+    Parameters
+    ----------
+    node_x: ndarray of floats with shape ``(n_node,)``
+    node_y: ndarray of floats with shape ``(n_node,)``
+    face_node_connectivity: ndarray of integers with shape ``(n_face, n_max_node)``
+    fill_value: int
+    x: ndarray of floats with shape ``(ncol,)``
+        x coordinates of the pixel centres.
+    y: ndarray of floats with shape ``(nrow,)``
+        y coordinates of the pixel centres.
+    rows_per_block: int, default 256
+        Number of rows that are processed together.
+
+    Returns
+    -------
+    face_index: ndarray of integers with shape ``(nrow, ncol)``
+        -1 for pixels outside of the faces. Where faces overlap, the lowest
+        face index.
+    """
+    if rows_per_block < 1:
+        raise ValueError(f"rows_per_block must be positive, received: {rows_per_block}")
+    x = np.asarray(x, dtype=FloatDType)
+    y = np.asarray(y, dtype=FloatDType)
+    faces = np.ascontiguousarray(face_node_connectivity, dtype=IntDType)
+    # Sort the coordinates, so that the rows and columns in a face can be found
+    # by binary search.
+    xorder = np.argsort(x, kind="stable")
+    yorder = np.argsort(y, kind="stable")
+    xs = x[xorder]
+    ys = y[yorder]
+    ymin, ymax = _face_y_bounds(node_y, faces, fill_value)
+    row_start = np.searchsorted(ys, ymin, side="left")
+    row_end = np.searchsorted(ys, ymax, side="left")
+
+    out = np.full((y.size, x.size), -1, dtype=IntDType)
+    _scanline(
+        np.asarray(node_x, dtype=FloatDType),
+        np.asarray(node_y, dtype=FloatDType),
+        faces,
+        fill_value,
+        row_start,
+        row_end,
+        xs,
+        xorder,
+        ys,
+        yorder,
+        rows_per_block,
+        out,
+    )
+    return out
+
+
+def rasterize_face_subset(
+    node_x: FloatArray,
+    node_y: FloatArray,
+    face_node_connectivity: IntArray,
+    fill_value: int,
+    face_index: IntArray,
+    x: FloatArray,
+    y: FloatArray,
+) -> IntArray:
+    """
+    Rasterize a subset of the faces of a grid, e.g. the faces overlapping a
+    tile of a raster.
+
+    Parameters
+    ----------
+    node_x: ndarray of floats with shape ``(n_node,)``
+    node_y: ndarray of floats with shape ``(n_node,)``
+    face_node_connectivity: ndarray of integers with shape ``(n_face, n_max_node)``
+        Faces of the subset, referring to node_x and node_y.
+    fill_value: int
+    face_index: ndarray of integers with shape ``(n_face,)``
+        Index of every face of the subset in the original grid, in ascending
+        order.
+    x: ndarray of floats with shape ``(ncol,)``
+    y: ndarray of floats with shape ``(nrow,)``
+
+    Returns
+    -------
+    face_index: ndarray of integers with shape ``(nrow, ncol)``
+        Index in the original grid, -1 for pixels outside of the faces.
+    """
+    if face_index.size == 0:
+        return np.full((len(y), len(x)), -1, dtype=IntDType)
+    local = rasterize_faces(node_x, node_y, face_node_connectivity, fill_value, x, y)
+    return np.where(local == -1, -1, face_index[local])
+
+
+def _chunk_extents(
+    coords: FloatArray, chunks: Tuple[int, ...]
+) -> Tuple[FloatArray, FloatArray]:
+    bounds = np.cumsum((0,) + tuple(chunks))
+    start = np.array(
+        [coords[i:j].min(initial=np.inf) for i, j in zip(bounds[:-1], bounds[1:])]
+    )
+    end = np.array(
+        [coords[i:j].max(initial=-np.inf) for i, j in zip(bounds[:-1], bounds[1:])]
+    )
+    return start, end
+
+
+def _overlapping(
+    lower: FloatArray, upper: FloatArray, start: FloatArray, end: FloatArray
+) -> List[IntArray]:
+    """
+    Find the intervals (lower, upper) overlapping every interval (start, end),
+    including the edges.
+
+    The intervals are sorted by their lower bound: only those with a lower
+    bound up to end can overlap. The running maximum of the upper bound
+    excludes the intervals which lie entirely before start.
+    """
+    order = np.argsort(lower, kind="stable")
+    upper_max = np.maximum.accumulate(upper[order])
+    first = np.searchsorted(upper_max, start, side="left")
+    last = np.searchsorted(lower[order], end, side="right")
+    overlapping = []
+    for i, j, s in zip(first, last, start):
+        candidates = order[i:j]
+        overlapping.append(np.sort(candidates[upper[candidates] >= s]))
+    return overlapping
+
+
+def tile_faces(
+    face_bounds: FloatArray,
+    x: FloatArray,
+    y: FloatArray,
+    ychunks: Tuple[int, ...],
+    xchunks: Tuple[int, ...],
+) -> Dict[Tuple[int, int], IntArray]:
+    """
+    Find the faces whose bounding box overlaps the pixel centres of every tile
+    of a raster. Only these faces can contain pixels of the tile.
+
+    Parameters
+    ----------
+    face_bounds: ndarray of floats with shape ``(n_face, 4)``
+        Columns ``minx, miny, maxx, maxy``.
+    x: ndarray of floats with shape ``(ncol,)``
+    y: ndarray of floats with shape ``(nrow,)``
+    ychunks: tuple of int
+        Number of rows of every row of tiles.
+    xchunks: tuple of int
+        Number of columns of every column of tiles.
+
+    Returns
+    -------
+    faces: dict of (int, int) to ndarray of integers
+        Face indices, in ascending order, for every tile.
+    """
+    xmin, ymin, xmax, ymax = face_bounds.T
+    ystart, yend = _chunk_extents(np.asarray(y), ychunks)
+    xstart, xend = _chunk_extents(np.asarray(x), xchunks)
+    faces = {}
+    # First select the faces per row of tiles, then per tile within the row.
+    for i, row in enumerate(_overlapping(ymin, ymax, ystart, yend)):
+        in_tile = _overlapping(xmin[row], xmax[row], xstart, xend)
+        for j, index in enumerate(in_tile):
+            faces[(i, j)] = row[index]
+    return faces
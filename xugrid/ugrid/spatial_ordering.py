@@ -0,0 +1,187 @@
+"""
+Space-filling curve ordering of points.
+
+Points are quantized on a regular 2**order by 2**order grid covering their
+bounding box, and assigned the position of their grid cell along a Morton
+(Z-order) or Hilbert curve. Sorting by this position yields a spatially
+coherent order: points that are close in the order are close in space.
+"""
+import numba as nb
+import numpy as np
+
+from xugrid.constants import FloatArray, IntArray
+
+# 2**16 by 2**16 cells: the keys fit in 32 bits. This is also the maximum.
+DEFAULT_ORDER = 16
+
+
+@nb.njit(cache=True)
+def _quantize_kernel(x, y, order):
+    n = len(x)
+    xmin = np.inf
+    xmax = -np.inf
+    ymin = np.inf
+    ymax = -np.inf
+    for i in range(n):
+        xmin = min(xmin, x[i])
+        xmax = max(xmax, x[i])
+        ymin = min(ymin, y[i])
+        ymax = max(ymax, y[i])
+    span = max(xmax - xmin, ymax - ymin)
+    scale = ((2**order) - 1) / span if span > 0 else 0.0
+    ix = np.empty(n, dtype=np.uint64)
+    iy = np.empty(n, dtype=np.uint64)
+    for i in range(n):
+        ix[i] = np.uint64((x[i] - xmin) * scale)
+        iy[i] = np.uint64((y[i] - ymin) * scale)
+    return ix, iy
+
+
+def _quantize(xy: FloatArray, order: int):
+    """
+    Map the coordinates to integers in [0, 2**order). Both axes are scaled by
+    the same factor to keep the cells square.
+    """
+    xy = np.asarray(xy, dtype=np.float64)
+    if xy.ndim != 2 or xy.shape[1] != 2:
+        raise ValueError(f"Expected xy with shape (n, 2), received: {xy.shape}")
+    if not 1 <= order <= 16:
+        raise ValueError(f"order must be in [1, 16], received: {order}")
+    return _quantize_kernel(xy[:, 0], xy[:, 1], order)
+
+
+@nb.njit(inline="always")
+def _interleave16(v):
+    # Insert a zero bit between all bits of a 16 bit integer.
+    v = (v | (v << 8)) & 0x00FF00FF
+    v = (v | (v << 4)) & 0x0F0F0F0F
+    v = (v | (v << 2)) & 0x33333333
+    v = (v | (v << 1)) & 0x55555555
+    return v
+
+
+@nb.njit(parallel=True, cache=True)
+def _morton_keys(ix, iy):
+    n = len(ix)
+    keys = np.empty(n, dtype=np.uint64)
+    for i in nb.prange(n):
+        x = _interleave16(np.int64(ix[i]))
+        y = _interleave16(np.int64(iy[i]))
+        keys[i] = np.uint64(x | (y << 1))
+    return keys
+
+
+@nb.njit(parallel=True, cache=True)
+def _hilbert_keys(ix, iy, order):
+    # Branchless computation of the Hilbert index as a parallel prefix scan
+    # over the bits of the coordinates, after:
+    # https://github.com/rawrunprotected/hilbert_curves (public domain).
+    # This is more than an order of magnitude faster than the textbook loop
+    # over the bits, which rotates the coordinates per quadrant.
+    n = len(ix)
+    keys = np.empty(n, dtype=np.uint64)
+    for k in nb.prange(n):
+        x = np.int64(ix[k]) << (16 - order)
+        y = np.int64(iy[k]) << (16 - order)
+
+        a = x ^ y
+        b = 0xFFFF ^ a
+        c = 0xFFFF ^ (x | y)
+        d = x & (y ^ 0xFFFF)
+        A = a | (b >> 1)
+        B = (a >> 1) ^ a
+        C = ((c >> 1) ^ (b & (d >> 1))) ^ c
+        D = ((a & (c >> 1)) ^ (d >> 1)) ^ d
+
+        for shift in (2, 4):
+            a = A
+            b = B
+            c = C
+            d = D
+            A = (a & (a >> shift)) ^ (b & (b >> shift))
+            B = (a & (b >> shift)) ^ (b & ((a ^ b) >> shift))
+            C ^= (a & (c >> shift)) ^ (b & (d >> shift))
+            D ^= (b & (c >> shift)) ^ ((a ^ b) & (d >> shift))
+
+        a = A
+        b = B
+        c = C
+        d = D
+        C ^= (a & (c >> 8)) ^ (b & (d >> 8))
+        D ^= (b & (c >> 8)) ^ ((a ^ b) & (d >> 8))
+
+        # Undo the transformation prefix scan, and recover the index bits.
+        a = C ^ (C >> 1)
+        b = D ^ (D >> 1)
+        i0 = x ^ y
+        i1 = b | (0xFFFF ^ (i0 | a))
+        index = (_interleave16(i1) << 1) | _interleave16(i0)
+        keys[k] = np.uint64(index >> (32 - 2 * order))
+    return keys
+
+
+def morton_index(xy: FloatArray, order: int = DEFAULT_ORDER) -> IntArray:
+    """
+    Compute the position of every point along a Morton (Z-order) curve.
+
+    Parameters
+    ----------
+    xy: ndarray of floats with shape ``(n_point, 2)``
+    order: int, default 16
+        The number of bits per axis of the quantization grid, at most 16.
+
+    Returns
+    -------
+    index: ndarray of uint64 with shape ``(n_point,)``
+    """
+    ix, iy = _quantize(xy, order)
+    return _morton_keys(ix, iy)
+
+
+def hilbert_index(xy: FloatArray, order: int = DEFAULT_ORDER) -> IntArray:
+    """
+    Compute the position of every point along a Hilbert curve.
+
+    Compared to the Morton curve, the Hilbert curve has no jumps: consecutive
+    positions are always neighboring cells, which results in more compact
+    groups of points.
+
+    Parameters
+    ----------
+    xy: ndarray of floats with shape ``(n_point, 2)``
+    order: int, default 16
+        The number of bits per axis of the quantization grid, at most 16.
+
+    Returns
+    -------
+    index: ndarray of uint64 with shape ``(n_point,)``
+    """
+    ix, iy = _quantize(xy, order)
+    return _hilbert_keys(ix, iy, order)
+
+
+CURVES = {
+    "hilbert": hilbert_index,
+    "morton": morton_index,
+}
+
+
+def curve_order(xy: FloatArray, method: str = "hilbert") -> IntArray:
+    """
+    Compute the permutation that sorts the points along a space-filling curve.
+
+    Parameters
+    ----------
+    xy: ndarray of floats with shape ``(n_point, 2)``
+    method: str, one of "hilbert" or "morton", default "hilbert"
+
+    Returns
+    -------
+    order: ndarray of integers with shape ``(n_point,)``
+    """
+    if method not in CURVES:
+        raise ValueError(
+            f"Expected one of {list(CURVES)} for method, received: {method}"
+        )
+    keys = CURVES[method](xy)
+    return np.argsort(keys, kind="stable")
@@ -0,0 +1,232 @@
+"""
+Implicit topology of a regular (rectilinear) raster.
+
+The topology of a raster is fully described by its x and y vertices: the node
+coordinates, the face node connectivity, the centroids and the area of every
+face follow arithmetically. Locating points requires a binary search per axis
+instead of a celltree search.
+
+A Ugrid2d created from structured bounds keeps such a ``StructuredTopology``
+and stores its node coordinates and face node connectivity as
+``ImplicitArray``: these are only materialized when they are accessed.
+"""
+from typing import Callable, Tuple
+
+import numpy as np
+
+from xugrid.constants import FloatArray, FloatDType, IntArray, IntDType
+
+
+class ImplicitArray:
+    """
+    An array-like whose values are computed on demand, when converted with
+    ``np.asarray``.
+
+    Parameters
+    ----------
+    func: callable
+        Returns the values as a numpy array.
+    shape: tuple of int
+    dtype: numpy dtype
+    """
+
+    def __init__(self, func: Callable[[], np.ndarray], shape: Tuple[int], dtype):
+        self.func = func
+        self.shape = shape
+        self.dtype = np.dtype(dtype)
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    @property
+    def size(self) -> int:
+        return int(np.prod(self.shape))
+
+    def __array__(self, dtype=None):
+        values = self.func()
+        if dtype is not None:
+            values = values.astype(dtype, copy=False)
+        return values
+
+    def __repr__(self):
+        return f"ImplicitArray(shape={self.shape}, dtype={self.dtype})"
+
+
+def _is_ascending(vertices: FloatArray) -> bool:
+    return vertices[-1] >= vertices[0]
+
+
+def _locate_1d(vertices: FloatArray, values: FloatArray) -> IntArray:
+    """
+    Find the cell of every value along a monotonic axis. Cells include their
+    lower bound, but not their upper bound, regardless of the order of the
+    vertices. Returns -1 for values outside of the vertices.
+    """
+    n = vertices.size - 1
+    ascending = _is_ascending(vertices)
+    if not ascending:
+        vertices = vertices[::-1]
+    index = np.searchsorted(vertices, values, side="right") - 1
+    valid = (index >= 0) & (index < n)
+    if not ascending:
+        index = n - 1 - index
+    index[~valid] = -1
+    return index
+
+
+class StructuredTopology:
+    """
+    Topology of a raster with ``ny`` rows and ``nx`` columns.
+
+    Nodes and faces are numbered row by row, following the order of the
+    vertices: face ``i * nx + j`` is located in row ``i`` and column ``j``.
+
+    Parameters
+    ----------
+    x: ndarray of floats with shape ``(nx + 1,)``
+        Monotonic x vertices.
+    y: ndarray of floats with shape ``(ny + 1,)``
+        Monotonic y vertices.
+    """
+
+    def __init__(self, x: FloatArray, y: FloatArray):
+        self.x = np.asarray(x, dtype=FloatDType)
+        self.y = np.asarray(y, dtype=FloatDType)
+
+    @property
+    def nx(self) -> int:
+        return self.x.size - 1
+
+    @property
+    def ny(self) -> int:
+        return self.y.size - 1
+
+    @property
+    def n_node(self) -> int:
+        return self.x.size * self.y.size
+
+    @property
+    def n_face(self) -> int:
+        return self.nx * self.ny
+
+    @property
+    def n_edge(self) -> int:
+        return self.nx * (self.ny + 1) + self.ny * (self.nx + 1)
+
+    def node_x(self) -> FloatArray:
+        return np.tile(self.x, self.ny + 1)
+
+    def node_y(self) -> FloatArray:
+        return np.repeat(self.y, self.nx + 1)
+
+    def face_node_connectivity(self) -> IntArray:
+        """
+        Face node connectivity, in counterclockwise order.
+
+        Returns
+        -------
+        face_node_connectivity: ndarray of integers with shape ``(n_face, 4)``
+        """
+        nx = self.nx
+        ny = self.ny
+        linear_index = np.arange(self.n_node, dtype=IntDType).reshape((ny + 1, nx + 1))
+        face_nodes = np.empty((self.n_face, 4), dtype=IntDType)
+        # These are counterclockwise for ascending x and descending y: upper
+        # right, upper left, lower left, lower right. Flipping either axis
+        # reverses the orientation.
+        face_nodes[:, 0] = linear_index[:-1, 1:].ravel()
+        face_nodes[:, 1] = linear_index[:-1, :-1].ravel()
+        face_nodes[:, 2] = linear_index[1:, :-1].ravel()
+        face_nodes[:, 3] = linear_index[1:, 1:].ravel()
+        if _is_ascending(self.x) == _is_ascending(self.y):
+            face_nodes = face_nodes[:, ::-1].copy()
+        return face_nodes
+
+    def centroids(self) -> FloatArray:
+        """
+        Returns
+        -------
+        centroids: ndarray of floats with shape ``(n_face, 2)``
+        """
+        xc = 0.5 * (self.x[:-1] + self.x[1:])
+        yc = 0.5 * (self.y[:-1] + self.y[1:])
+        return np.column_stack((np.tile(xc, self.ny), np.repeat(yc, self.nx)))
+
+    def area(self) -> FloatArray:
+        """
+        Returns
+        -------
+        area: ndarray of floats with shape ``(n_face,)``
+        """
+        return np.abs(np.multiply.outer(np.diff(self.y), np.diff(self.x))).ravel()
+
+    def face_bounds(self) -> FloatArray:
+        """
+        Returns
+        -------
+        face_bounds: ndarray of floats with shape ``(n_face, 4)``
+            Columns ``minx, miny, maxx, maxy``.
+        """
+        xmin = np.minimum(self.x[:-1], self.x[1:])
+        xmax = np.maximum(self.x[:-1], self.x[1:])
+        ymin = np.minimum(self.y[:-1], self.y[1:])
+        ymax = np.maximum(self.y[:-1], self.y[1:])
+        return np.column_stack(
+            (
+                np.tile(xmin, self.ny),
+                np.repeat(ymin, self.nx),
+                np.tile(xmax, self.ny),
+                np.repeat(ymax, self.nx),
+            )
+        )
+
+    def bounds(self) -> Tuple[float, float, float, float]:
+        return (self.x.min(), self.y.min(), self.x.max(), self.y.max())
+
+    def locate_points(self, points: FloatArray) -> IntArray:
+        """
+        Find in which face points are located.
+
+        As in the celltree, a point on an edge belongs to the face above, or
+        to the right of, the edge. Points on the upper or right boundary of the
+        raster are outside.
+
+        Parameters
+        ----------
+        points: ndarray of floats with shape ``(n_point, 2)``
+
+        Returns
+        -------
+        face_index: ndarray of integers with shape ``(n_point,)``
+            -1 for points outside of the raster.
+        """
+        points = np.asarray(points, dtype=FloatDType)
+        ix = _locate_1d(self.x, points[:, 0])
+        iy = _locate_1d(self.y, points[:, 1])
+        outside = (ix == -1) | (iy == -1)
+        face_index = (iy * self.nx + ix).astype(IntDType)
+        face_index[outside] = -1
+        return face_index
+
+    def rasterize_like(self, x: FloatArray, y: FloatArray) -> IntArray:
+        """
+        Find the face in which every pixel centre of a raster is located. The
+        columns and rows are located separately, with the same edge handling
+        as :meth:`locate_points`.
+
+        Parameters
+        ----------
+        x: ndarray of floats with shape ``(ncol,)``
+        y: ndarray of floats with shape ``(nrow,)``
+
+        Returns
+        -------
+        face_index: ndarray of integers with shape ``(nrow, ncol)``
+            -1 for pixels outside of the raster.
+        """
+        ix = _locate_1d(self.x, np.asarray(x, dtype=FloatDType))
+        iy = _locate_1d(self.y, np.asarray(y, dtype=FloatDType))
+        face_index = (iy[:, np.newaxis] * self.nx + ix).astype(IntDType)
+        face_index[(iy == -1)[:, np.newaxis] | (ix == -1)] = -1
+        return face_index
@@ -520,13 +520,13 @@ class Ugrid1d(AbstractUgrid):
     ):
         return self.sel(x=slice(xmin, xmax), y=slice(ymin, ymax))
 
-    def sel_points(obj, x, y):
+    def sel_points(self, obj, x, y, method="containing"):
         return obj
 
-    def intersect_line(self, obj, start, stop):
+    def intersect_line(self, obj, start, stop, method="containing"):
         return obj
 
-    def intersect_linestring(self, obj, linestring):
+    def intersect_linestring(self, obj, linestring, method="containing"):
         return obj
 
     def topological_sort_by_dfs(self) -> IntArray:
@@ -1,3 +1,4 @@
+import os
 from itertools import chain
 from typing import Any, Dict, Optional, Sequence, Tuple, Union
 
@@ -21,6 +22,18 @@ from xugrid.constants import (
     SparseMatrix,
 )
 from xugrid.ugrid import connectivity, conventions
+from xugrid.ugrid.celltree import (
+    PartitionedCellTree,
+    load_celltree,
+    save_celltree,
+)
+from xugrid.ugrid.scanline import (
+    rasterize_face_subset,
+    rasterize_faces,
+    tile_faces,
+)
+from xugrid.ugrid.spatial_ordering import CURVES, curve_order
+from xugrid.ugrid.structured import ImplicitArray, StructuredTopology
 from xugrid.ugrid.ugridbase import AbstractUgrid, as_pandas_index
 from xugrid.ugrid.voronoi import voronoi_topology
 
@@ -40,6 +53,11 @@ def section_coordinates(
     return coords, index[order]
 
 
+def _load_array(a: Any, dtype: type) -> np.ndarray:
+    """Load a lazy array-like (dask, xarray, etc.) into memory."""
+    return np.ascontiguousarray(np.asarray(a, dtype=dtype))
+
+
 def numeric_bound(v: Union[float, None], other: float):
     if v is None:
         return other
@@ -76,6 +94,16 @@ class Ugrid2d(AbstractUgrid):
         UGRID topology attributes. Should not be provided together with
         dataset: if other names are required, update the dataset instead.
         A name entry is ignored, as name is given explicitly.
+    lazy: bool, optional
+        Defaults to False. If True, node_x, node_y, face_node_connectivity and
+        edge_node_connectivity may be any array-like (e.g. a memory-mapped
+        array, a dask array, or a lazily loaded xarray DataArray). They are
+        only loaded into memory when first accessed, and the orientation of
+        the faces is checked only then.
+    check_orientation: bool, optional
+        Defaults to True. Whether to check the orientation of the faces and
+        reverse the node order of faces that are clockwise. Set to False only
+        if the faces are known to be counterclockwise.
     """
 
     def __init__(
@@ -91,30 +119,44 @@ class Ugrid2d(AbstractUgrid):
         projected: bool = True,
         crs: Any = None,
         attrs: Dict[str, str] = None,
+        lazy: bool = False,
+        check_orientation: bool = True,
     ):
-        self.node_x = np.ascontiguousarray(node_x)
-        self.node_y = np.ascontiguousarray(node_y)
         self.fill_value = fill_value
         self.name = name
         self.projected = projected
 
-        if isinstance(face_node_connectivity, np.ndarray):
-            face_node_connectivity = face_node_connectivity
-        elif isinstance(face_node_connectivity, (coo_matrix, csr_matrix)):
+        if isinstance(face_node_connectivity, (coo_matrix, csr_matrix)):
             face_node_connectivity = connectivity.to_dense(
                 face_node_connectivity, fill_value
             )
-        else:
+        elif not isinstance(face_node_connectivity, np.ndarray) and not (
+            lazy and hasattr(face_node_connectivity, "shape")
+        ):
             raise TypeError(
                 "face_node_connectivity should be an array of integers or a sparse matrix"
             )
 
-        self.face_node_connectivity = connectivity.counterclockwise(
-            face_node_connectivity, self.fill_value, self.node_coordinates
-        )
+        if lazy:
+            # Store the (lazy) arrays as given; they are loaded on first access.
+            self._node_x = node_x
+            self._node_y = node_y
+            self._face_node_connectivity = face_node_connectivity
+            self._orientation_checked = not check_orientation
+        else:
+            self._node_x = np.ascontiguousarray(node_x)
+            self._node_y = np.ascontiguousarray(node_y)
+            if check_orientation:
+                face_node_connectivity = connectivity.counterclockwise(
+                    face_node_connectivity, self.fill_value, self.node_coordinates
+                )
+            self._face_node_connectivity = face_node_connectivity
+            self._orientation_checked = True
 
         self._initialize_indexes_attrs(name, dataset, indexes, attrs)
         self._dataset = dataset
+        # Implicit topology of a regular raster, see from_structured_bounds.
+        self._structured = None
 
         # Optional attributes, deferred initialization
         # Meshkernel
@@ -227,14 +269,29 @@ class Ugrid2d(AbstractUgrid):
         )
 
     @classmethod
-    def from_dataset(cls, dataset: xr.Dataset, topology: str = None):
+    def from_dataset(
+        cls, dataset: xr.Dataset, topology: str = None, lazy: bool = False
+    ):
         """
         Extract the 2D UGRID topology information from an xarray Dataset.
 
+        The orientation of the faces is not checked if the face node
+        connectivity variable has an ``orientation`` attribute with value
+        ``"counterclockwise"``.
+
         Parameters
         ----------
         dataset: xr.Dataset
             Dataset containing topology information stored according to UGRID conventions.
+        topology: str, optional
+            Name of the topology variable. Required if the dataset contains
+            multiple topologies.
+        lazy: bool, optional
+            Defaults to False. If True, the node coordinates and the
+            connectivity arrays are not loaded into memory until they are
+            first needed, e.g. to compute the area, the centroids, or the
+            celltree. This is useful for huge meshes stored in netCDF or zarr
+            files, when only part of the topology is required.
 
         Returns
         -------
@@ -262,22 +319,31 @@ class Ugrid2d(AbstractUgrid):
 
         x_index = coordinates["node_coordinates"][0][0]
         y_index = coordinates["node_coordinates"][1][0]
-        node_x_coordinates = ds[x_index].astype(FloatDType).values
-        node_y_coordinates = ds[y_index].astype(FloatDType).values
-
         face_nodes = connectivity["face_node_connectivity"]
+        edge_nodes = connectivity.get("edge_node_connectivity")
         fill_value = ds[face_nodes].encoding.get("_FillValue", -1)
-        face_node_connectivity = cls._prepare_connectivity(
-            ds[face_nodes], fill_value, dtype=IntDType
-        ).values
+        check_orientation = (
+            ds[face_nodes].attrs.get("orientation") != "counterclockwise"
+        )
 
-        edge_nodes = connectivity.get("edge_node_connectivity")
-        if edge_nodes:
-            edge_node_connectivity = cls._prepare_connectivity(
-                ds[edge_nodes], fill_value, dtype=IntDType
-            ).values
+        if lazy:
+            # The DataArrays are converted on first access.
+            node_x_coordinates = ds[x_index]
+            node_y_coordinates = ds[y_index]
+            face_node_connectivity = ds[face_nodes]
+            edge_node_connectivity = ds[edge_nodes] if edge_nodes else None
         else:
-            edge_node_connectivity = None
+            node_x_coordinates = ds[x_index].astype(FloatDType).values
+            node_y_coordinates = ds[y_index].astype(FloatDType).values
+            face_node_connectivity = cls._prepare_connectivity(
+                ds[face_nodes], fill_value, dtype=IntDType
+            ).values
+            if edge_nodes:
+                edge_node_connectivity = cls._prepare_connectivity(
+                    ds[edge_nodes], fill_value, dtype=IntDType
+                ).values
+            else:
+                edge_node_connectivity = None
 
         indexes["node_x"] = x_index
         indexes["node_y"] = y_index
@@ -294,6 +360,8 @@ class Ugrid2d(AbstractUgrid):
             indexes=indexes,
             projected=projected,
             crs=None,
+            lazy=lazy,
+            check_orientation=check_orientation,
         )
 
     def _get_name_and_attrs(self, name: str):
@@ -375,6 +443,84 @@ class Ugrid2d(AbstractUgrid):
         dataset[self.name].attrs = self._filtered_attrs(dataset)
         return dataset
 
+    # The node coordinates and the face node connectivity may be stored lazily,
+    # in which case they are loaded on first access.
+    @property
+    def is_lazy(self) -> bool:
+        """
+        Whether any of the node coordinates or the face node connectivity have
+        not been loaded into memory yet.
+        """
+        return not (
+            isinstance(self._node_x, np.ndarray)
+            and isinstance(self._node_y, np.ndarray)
+            and isinstance(self._face_node_connectivity, np.ndarray)
+            and self._orientation_checked
+        )
+
+    @property
+    def node_x(self) -> FloatArray:
+        """x-coordinate of the nodes (vertices)"""
+        if not isinstance(self._node_x, np.ndarray):
+            self._node_x = _load_array(self._node_x, FloatDType)
+        return self._node_x
+
+    @node_x.setter
+    def node_x(self, value):
+        self._node_x = value
+        self._structured = None
+
+    @property
+    def node_y(self) -> FloatArray:
+        """y-coordinate of the nodes (vertices)"""
+        if not isinstance(self._node_y, np.ndarray):
+            self._node_y = _load_array(self._node_y, FloatDType)
+        return self._node_y
+
+    @node_y.setter
+    def node_y(self, value):
+        self._node_y = value
+        self._structured = None
+
+    @property
+    def face_node_connectivity(self) -> IntArray:
+        """
+        Face to node connectivity. Every face consists of up to
+        n_max_node_per_face nodes, in counterclockwise order.
+
+        Returns
+        -------
+        connectivity: ndarray of integers with shape ``(n_face, n_max_node_per_face)``.
+        """
+        if not isinstance(self._face_node_connectivity, np.ndarray):
+            self._face_node_connectivity = self._load_connectivity(
+                self._face_node_connectivity
+            )
+        if not self._orientation_checked:
+            self._face_node_connectivity = connectivity.counterclockwise(
+                self._face_node_connectivity, self.fill_value, self.node_coordinates
+            )
+            self._orientation_checked = True
+        return self._face_node_connectivity
+
+    @face_node_connectivity.setter
+    def face_node_connectivity(self, value):
+        self._face_node_connectivity = value
+        self._orientation_checked = True
+        self._structured = None
+
+    def _load_connectivity(self, value) -> IntArray:
+        if isinstance(value, xr.DataArray):
+            return self._prepare_connectivity(
+                value, self.fill_value, dtype=IntDType
+            ).values
+        return _load_array(value, IntDType)
+
+    @property
+    def n_node(self) -> int:
+        """Number of nodes (vertices) in the UGRID topology"""
+        return self._node_x.size
+
     # These are all optional/derived UGRID attributes. They are not computed by
     # default, only when called upon.
     @property
@@ -382,7 +528,14 @@ class Ugrid2d(AbstractUgrid):
         """
         Return the number of faces in the UGRID2D topology.
         """
-        return self.face_node_connectivity.shape[0]
+        return self._face_node_connectivity.shape[0]
+
+    @property
+    def n_edge(self) -> int:
+        """Return the number of edges in the UGRID2D topology."""
+        if self._edge_node_connectivity is None and self._structured is not None:
+            return self._structured.n_edge
+        return self.edge_node_connectivity.shape[0]
 
     @property
     def n_max_node_per_face(self) -> int:
@@ -390,7 +543,7 @@ class Ugrid2d(AbstractUgrid):
         Return the maximum number of nodes that a face can contain in the
         UGRID2D topology.
         """
-        return self.face_node_connectivity.shape[1]
+        return self._face_node_connectivity.shape[1]
 
     @property
     def n_node_per_face(self) -> IntArray:
@@ -421,6 +574,10 @@ class Ugrid2d(AbstractUgrid):
         return self._attrs["face_dimension"]
 
     def _edge_connectivity(self):
+        if not isinstance(self._edge_node_connectivity, (np.ndarray, type(None))):
+            self._edge_node_connectivity = self._load_connectivity(
+                self._edge_node_connectivity
+            )
         (
             self._edge_node_connectivity,
             self._face_edge_connectivity,
@@ -442,6 +599,10 @@ class Ugrid2d(AbstractUgrid):
         """
         if self._edge_node_connectivity is None:
             self._edge_connectivity()
+        elif not isinstance(self._edge_node_connectivity, np.ndarray):
+            self._edge_node_connectivity = self._load_connectivity(
+                self._edge_node_connectivity
+            )
         return self._edge_node_connectivity
 
     @edge_node_connectivity.setter
@@ -487,7 +648,9 @@ class Ugrid2d(AbstractUgrid):
         -------
         centroids: ndarray of floats with shape ``(n_face, 2)``
         """
-        if self._centroids is None:
+        if self._centroids is None and self._structured is not None:
+            self._centroids = self._structured.centroids()
+        elif self._centroids is None:
             self._centroids = connectivity.centroids(
                 self.face_node_connectivity,
                 self.fill_value,
@@ -509,7 +672,9 @@ class Ugrid2d(AbstractUgrid):
 
     @property
     def area(self) -> FloatArray:
-        if self._area is None:
+        if self._area is None and self._structured is not None:
+            self._area = self._structured.area()
+        elif self._area is None:
             self._area = connectivity.area(
                 self.face_node_connectivity,
                 self.fill_value,
@@ -528,6 +693,8 @@ class Ugrid2d(AbstractUgrid):
         -------
         face_bounds: np.ndarray of shape (n_face, 4)
         """
+        if self._structured is not None:
+            return self._structured.face_bounds()
         x = self.node_x[self.face_node_connectivity]
         y = self.node_y[self.face_node_connectivity]
         isfill = self.face_node_connectivity == self.fill_value
@@ -542,6 +709,13 @@ class Ugrid2d(AbstractUgrid):
             ]
         )
 
+    @property
+    def bounds(self) -> Tuple[float, float, float, float]:
+        """Returns a tuple with the node bounds: xmin, ymin, xmax, ymax"""
+        if self._xmin is None and self._structured is not None:
+            self._xmin, self._ymin, self._xmax, self._ymax = self._structured.bounds()
+        return super().bounds
+
     @property
     def face_x(self):
         """x-coordinate of centroid of every face"""
@@ -776,6 +950,10 @@ class Ugrid2d(AbstractUgrid):
         Initializes the celltree if needed, and returns celltree.
 
         A celltree is a search structure for spatial lookups in unstructured grids.
+
+        For large grids, see :meth:`build_celltree` to build the celltree in
+        parallel, and :meth:`save_celltree` and :meth:`load_celltree` to store
+        and re-use it.
         """
         if self._celltree is None:
             self._celltree = CellTree2d(
@@ -783,6 +961,88 @@ class Ugrid2d(AbstractUgrid):
             )
         return self._celltree
 
+    def build_celltree(
+        self,
+        n_part: int = None,
+        labels: IntArray = None,
+        n_threads: int = None,
+    ):
+        """
+        Build the celltree in parallel, by building a separate tree for every
+        partition of the faces. The partitioned celltree answers the same
+        queries as a single celltree.
+
+        The faces are split by ``labels`` if provided, e.g. from
+        :meth:`label_partitions`. Otherwise, the faces are split spatially by
+        recursive coordinate bisection of the face centroids.
+
+        Parameters
+        ----------
+        n_part: int, optional
+            Number of partitions for the spatial split. Defaults to the number
+            of threads.
+        labels: ndarray of integers with shape ``(n_face,)``, optional
+            Partition label for every face.
+        n_threads: int, optional
+            Number of threads to use. Defaults to the number of CPUs.
+
+        Returns
+        -------
+        celltree: PartitionedCellTree
+        """
+        from xugrid.ugrid.partitioning import labels_to_indices
+
+        if labels is not None:
+            if n_part is not None:
+                raise ValueError("Provide either n_part or labels, not both.")
+            labels = np.asarray(labels)
+            if labels.shape != (self.n_face,):
+                raise ValueError(
+                    f"Expected labels of shape ({self.n_face},), received: "
+                    f"{labels.shape}"
+                )
+        else:
+            if n_part is None:
+                n_part = n_threads if n_threads is not None else os.cpu_count()
+            labels = self.label_partitions(n_part, method="rcb").values
+        indices = labels_to_indices(labels)
+
+        self._celltree = PartitionedCellTree(
+            self.node_coordinates,
+            self.face_node_connectivity,
+            self.fill_value,
+            indices,
+            n_threads=n_threads,
+        )
+        return self._celltree
+
+    def save_celltree(self, path: Union[str, os.PathLike]) -> None:
+        """
+        Store the celltree in a ``.npz`` file. The celltree is built first if
+        needed.
+
+        Parameters
+        ----------
+        path: str or PathLike
+        """
+        save_celltree(self.celltree, path)
+
+    def load_celltree(self, path: Union[str, os.PathLike]) -> None:
+        """
+        Load a celltree stored with :meth:`save_celltree`. This is much faster
+        than building the celltree for large grids.
+
+        Parameters
+        ----------
+        path: str or PathLike
+        """
+        tree = load_celltree(path)
+        if tree.faces.shape != self.face_node_connectivity.shape or (
+            tree.vertices.shape != (self.n_node, 2)
+        ):
+            raise ValueError("The stored celltree does not match this grid")
+        self._celltree = tree
+
     def validate_edge_node_connectivity(self):
         """
         Mark valid edges, by comparing face_node_connectivity and
@@ -861,6 +1121,8 @@ class Ugrid2d(AbstractUgrid):
         -------
         face_index: ndarray of integers with shape ``(n_points,)``
         """
+        if self._structured is not None:
+            return self._structured.locate_points(points)
         return self.celltree.locate_points(points)
 
     def intersect_edges(self, edges: FloatArray):
@@ -932,6 +1194,11 @@ class Ugrid2d(AbstractUgrid):
         """
         Rasterize unstructured grid by sampling on the x and y coordinates.
 
+        The faces are rasterized row by row: the pixels between the crossings
+        of the row with the edges of a face are assigned to the face. Pixel
+        centres located on an edge shared by two faces are assigned to the
+        face above, or to the right of, the edge.
+
         Parameters
         ----------
         x: 1d array of floats with shape ``(ncol,)``
@@ -941,13 +1208,77 @@ class Ugrid2d(AbstractUgrid):
         -------
         x: 1d array of floats with shape ``(ncol,)``
         y: 1d array of floats with shape ``(nrow,)``
-        face_index: 1d array of integers with shape ``(nrow * ncol,)``
+        face_index: 2d array of integers with shape ``(nrow, ncol)``
         """
-        yy, xx = np.meshgrid(y, x, indexing="ij")
-        nodes = np.column_stack([xx.ravel(), yy.ravel()])
-        index = self.celltree.locate_points(nodes).reshape((y.size, x.size))
+        if self._structured is not None:
+            index = self._structured.rasterize_like(x, y)
+        else:
+            index = rasterize_faces(
+                self.node_x,
+                self.node_y,
+                self.face_node_connectivity,
+                self.fill_value,
+                x,
+                y,
+            )
         return x, y, index
 
+    def _rasterize_tiles(
+        self,
+        x: FloatArray,
+        y: FloatArray,
+        ychunks: Tuple[int, ...],
+        xchunks: Tuple[int, ...],
+    ) -> Dict[Tuple[int, int], tuple]:
+        """
+        Prepare the rasterization of every tile of a raster, as a function
+        with its arguments. The arguments contain only the faces whose bounding
+        box overlaps the tile, so that a tile can be rasterized without the
+        entire grid. Every tile yields the same face index as ``rasterize_like``.
+
+        Parameters
+        ----------
+        x: 1d array of floats with shape ``(ncol,)``
+        y: 1d array of floats with shape ``(nrow,)``
+        ychunks: tuple of int
+            Number of rows of every row of tiles.
+        xchunks: tuple of int
+            Number of columns of every column of tiles.
+
+        Returns
+        -------
+        tiles: dict of (int, int) to tuple
+            The function and its arguments for every tile.
+        """
+        ybounds = np.cumsum((0,) + tuple(ychunks))
+        xbounds = np.cumsum((0,) + tuple(xchunks))
+        yslices = [slice(i, j) for i, j in zip(ybounds[:-1], ybounds[1:])]
+        xslices = [slice(i, j) for i, j in zip(xbounds[:-1], xbounds[1:])]
+
+        if self._structured is not None:
+            return {
+                (i, j): (self._structured.rasterize_like, x[xs], y[ys])
+                for i, ys in enumerate(yslices)
+                for j, xs in enumerate(xslices)
+            }
+
+        tiles = {}
+        faces = tile_faces(self.face_bounds, x, y, ychunks, xchunks)
+        for (i, j), face_index in faces.items():
+            subset = self.face_node_connectivity[face_index]
+            node_index = np.unique(subset[subset != self.fill_value])
+            tiles[(i, j)] = (
+                rasterize_face_subset,
+                self.node_x[node_index],
+                self.node_y[node_index],
+                connectivity.renumber(subset, self.fill_value),
+                self.fill_value,
+                face_index,
+                x[xslices[j]],
+                y[yslices[i]],
+            )
+        return tiles
+
     def rasterize(
         self,
         resolution: float,
@@ -1184,18 +1515,49 @@ class Ugrid2d(AbstractUgrid):
         new_obj = obj.isel(indexes)
         return new_obj, grid
 
+    def _sample_section(self, obj, face_index: IntArray, xy: FloatArray, method: str):
+        """
+        Fetch the values of the intersected faces, or interpolate the values
+        at the section points.
+        """
+        from xugrid.ugrid.sampling import (
+            SAMPLING_METHODS,
+            point_weights,
+            sample_weighted,
+        )
+
+        if method not in SAMPLING_METHODS:
+            raise ValueError(
+                f"method should be one of {SAMPLING_METHODS}, received: {method}"
+            )
+        dim = self.face_dimension
+        if method == "containing":
+            return obj.isel({dim: face_index})
+        index, weights = point_weights(self, xy, method)
+        # The section points lie within the intersected faces. Should locating
+        # them fail (e.g. due to round-off), use the intersected face.
+        missing = ~(weights > 0.0).any(axis=1)
+        index[missing] = -1
+        index[missing, 0] = face_index[missing]
+        weights[missing, 0] = 1.0
+        return sample_weighted(obj, dim, index, weights)
+
     def _sel_line(
         self,
         obj,
         start,
         end,
+        method: str = "containing",
     ):
         edges = np.array([[start, end]])
         _, index, xy = self.intersect_edges(edges)
         coords, index = section_coordinates(
             edges, xy, self.face_dimension, index, self.name
         )
-        return obj.isel({self.face_dimension: index}).assign_coords(coords)
+        xy_mid = np.column_stack(
+            (coords[f"{self.name}_x"][1], coords[f"{self.name}_y"][1])
+        )
+        return self._sample_section(obj, index, xy_mid, method).assign_coords(coords)
 
     def _sel_yline(
         self,
@@ -1229,7 +1591,7 @@ class Ugrid2d(AbstractUgrid):
         ystop = numeric_bound(y.stop, ymax)
         return self._sel_line(obj, start=(x, ystart), end=(x, ystop))
 
-    def sel_points(self, obj, x: FloatArray, y: FloatArray):
+    def sel_points(self, obj, x: FloatArray, y: FloatArray, method: str = "containing"):
         """
         Select points in the unstructured grid.
 
@@ -1241,31 +1603,29 @@ class Ugrid2d(AbstractUgrid):
         x: 1d array of floats with shape ``(n_points,)``
         y: 1d array of floats with shape ``(n_points,)``
         obj: xr.DataArray or xr.Dataset
+        method: str, default "containing"
+            ``"containing"`` takes the value of the face containing the point.
+            ``"barycentric"`` interpolates between the face centroids.
+            ``"idw"`` interpolates the values of the containing face and its
+            neighbors by inverse distance weighting. See
+            :class:`xugrid.PointSampler`.
 
         Returns
         -------
         selection: xr.DataArray or xr.Dataset
             The name of the topology is prefixed in the x, y coordinates.
         """
-        x = np.atleast_1d(x)
-        y = np.atleast_1d(y)
-        if x.shape != y.shape:
-            raise ValueError("shape of x does not match shape of y")
-        if x.ndim != 1:
-            raise ValueError("x and y must be 1d")
-        dim = self.face_dimension
-        xy = np.column_stack([x, y])
-        index = self.locate_points(xy)
-        valid = index != -1
-        index = index[valid]
-        coords = {
-            f"{self.name}_index": (dim, np.arange(len(valid))[valid]),
-            f"{self.name}_x": (dim, xy[valid, 0]),
-            f"{self.name}_y": (dim, xy[valid, 1]),
-        }
-        return obj.isel({dim: index}).assign_coords(coords)
+        from xugrid.ugrid.sampling import PointSampler
+
+        return PointSampler(self, x, y, method).sample(obj)
 
-    def intersect_line(self, obj, start: Sequence[float], end: Sequence[float]):
+    def intersect_line(
+        self,
+        obj,
+        start: Sequence[float],
+        end: Sequence[float],
+        method: str = "containing",
+    ):
         """
         Intersect a line with this grid, and fetch the values of the
         intersected faces.
@@ -1277,6 +1637,10 @@ class Ugrid2d(AbstractUgrid):
             coordinate pair (x, y), designating the start point of the line.
         end: sequence of two floats
             coordinate pair (x, y), designating the end point of the line.
+        method: str, default "containing"
+            ``"containing"`` takes the values of the intersected faces.
+            ``"barycentric"`` or ``"idw"`` interpolate the values at the
+            midpoints of the intersections, see :meth:`sel_points`.
 
         Returns
         -------
@@ -1286,10 +1650,13 @@ class Ugrid2d(AbstractUgrid):
         """
         if (len(start) != 2) or (len(end) != 2):
             raise ValueError("Start and end coordinate pairs must have length two")
-        return self._sel_line(obj, start, end)
+        return self._sel_line(obj, start, end, method)
 
     def intersect_linestring(
-        self, obj: Union[xr.DataArray, xr.Dataset], linestring: "shapely.geometry.LineString"  # type: ignore # noqa
+        self,
+        obj: Union[xr.DataArray, xr.Dataset],
+        linestring: "shapely.geometry.LineString",  # type: ignore # noqa
+        method: str = "containing",
     ) -> Union[xr.DataArray, xr.Dataset]:
         """
         Intersect linestrings with this grid, and fetch the values of the
@@ -1299,6 +1666,10 @@ class Ugrid2d(AbstractUgrid):
         ----------
         obj: xr.DataArray or xr.Dataset
         linestring: shapely.geometry.lineString
+        method: str, default "containing"
+            ``"containing"`` takes the values of the intersected faces.
+            ``"barycentric"`` or ``"idw"`` interpolate the values at the
+            midpoints of the intersections, see :meth:`sel_points`.
 
         Returns
         -------
@@ -1337,7 +1708,8 @@ class Ugrid2d(AbstractUgrid):
             f"{self.name}_x": (facedim, intersection_centroid[:, 0]),
             f"{self.name}_y": (facedim, intersection_centroid[:, 1]),
         }
-        return obj.isel({facedim: face_index}).assign_coords(coords)
+        selection = self._sample_section(obj, face_index, intersection_centroid, method)
+        return selection.assign_coords(coords)
 
     def sel(self, obj, x=None, y=None):
         """
@@ -1385,52 +1757,107 @@ class Ugrid2d(AbstractUgrid):
             )
         return f(obj, x, y)
 
-    def label_partitions(self, n_part: int) -> "xugrid.UgridDataArray":
+    def label_partitions(
+        self, n_part: int, method: str = "metis", weights: FloatArray = None
+    ) -> "xugrid.UgridDataArray":
         """
-        Generate partition labesl for this grid topology using METIS:
-        https://github.com/KarypisLab/METIS
+        Generate partition labels for this grid topology.
+
+        The following methods are available:
 
-        This method utilizes the pymetis Python bindings:
-        https://github.com/inducer/pymetis
+        * ``"metis"``: graph partitioning of the face connectivity using METIS:
+          https://github.com/KarypisLab/METIS. This minimizes the number of
+          edges shared between partitions. It requires the pymetis Python
+          bindings: https://github.com/inducer/pymetis
+        * ``"hilbert"``: sort the face centroids along a Hilbert curve, and
+          split the curve into parts.
+        * ``"morton"``: sort the face centroids along a Morton (Z-order)
+          curve, and split the curve into parts.
+        * ``"rcb"``: recursive coordinate bisection of the face centroids.
+
+        The spatial methods do not require pymetis, and are considerably faster
+        for large grids.
 
         Parameters
         ----------
         n_part: integer
             The number of parts to partition the mesh.
+        method: str, default "metis"
+            One of "metis", "hilbert", "morton", "rcb".
+        weights: ndarray of numbers with shape ``(n_face,)``, optional
+            The weight of every face. The partitions are balanced by total
+            weight rather than number of faces. For METIS, the weights must
+            be integers.
 
         Returns
         -------
         partition_labels: UgridDataArray of integers
         """
-        import pymetis
+        from xugrid.ugrid import partitioning
+
+        if n_part < 1:
+            raise ValueError(f"n_part should be larger than 0, received: {n_part}")
+
+        if method == "metis":
+            try:
+                import pymetis
+            except ImportError as e:
+                raise ImportError(
+                    "pymetis is required for method='metis'. Use one of the "
+                    "spatial methods 'hilbert', 'morton', or 'rcb' instead."
+                ) from e
+
+            vweights = None
+            if weights is not None:
+                weights = np.asarray(weights)
+                if not np.issubdtype(weights.dtype, np.integer):
+                    raise TypeError(
+                        "METIS requires integer weights, received: " f"{weights.dtype}"
+                    )
+                vweights = partitioning._validate_weights(weights, self.n_face)
+                vweights = vweights.astype(np.int64)
+
+            adjacency_matrix = self.face_face_connectivity
+            _, partition_index = pymetis.part_graph(
+                nparts=n_part,
+                xadj=adjacency_matrix.indptr,
+                adjncy=adjacency_matrix.indices,
+                vweights=vweights,
+            )
+            labels = np.array(partition_index)
+        elif method in ("hilbert", "morton"):
+            labels = partitioning.curve_labels(self.centroids, n_part, method, weights)
+        elif method == "rcb":
+            labels = partitioning.rcb_labels(self.centroids, n_part, weights)
+        else:
+            raise ValueError(
+                'method should be one of "metis", "hilbert", "morton", "rcb". '
+                f"Received: {method}"
+            )
 
-        adjacency_matrix = self.face_face_connectivity
-        _, partition_index = pymetis.part_graph(
-            nparts=n_part,
-            xadj=adjacency_matrix.indptr,
-            adjncy=adjacency_matrix.indices,
-        )
         return xugrid.UgridDataArray(
             obj=xr.DataArray(
-                data=np.array(partition_index),
+                data=labels,
                 dims=(self.core_dimension,),
                 name="labels",
             ),
             grid=self,
         )
 
-    def partition(self, n_part: int):
+    def partition(self, n_part: int, method: str = "metis", weights: FloatArray = None):
         """
-        Partition this grid topology using METIS:
-        https://github.com/KarypisLab/METIS
+        Partition this grid topology.
 
-        This method utilizes the pymetis Python bindings:
-        https://github.com/inducer/pymetis
+        See :meth:`label_partitions` for the available methods.
 
         Parameters
         ----------
         n_part: integer
             The number of parts to partition the mesh.
+        method: str, default "metis"
+            One of "metis", "hilbert", "morton", "rcb".
+        weights: ndarray of numbers with shape ``(n_face,)``, optional
+            The weight of every face, to balance the partitions by.
 
         Returns
         -------
@@ -1438,7 +1865,7 @@ class Ugrid2d(AbstractUgrid):
         """
         from xugrid.ugrid.partitioning import labels_to_indices
 
-        labels = self.label_partitions(n_part)
+        labels = self.label_partitions(n_part, method, weights)
         indices = labels_to_indices(labels.values)
         return [self.topology_subset(index) for index in indices]
 
@@ -1588,6 +2015,86 @@ class Ugrid2d(AbstractUgrid):
         )
         return reordered_grid, reordering
 
+    def reorder(self, method: str = "hilbert"):
+        """
+        Reorder the faces, nodes, and edges for a spatially coherent memory
+        layout.
+
+        The faces are reordered by one of the following methods:
+
+        * ``"hilbert"``: sort the face centroids along a Hilbert curve.
+        * ``"morton"``: sort the face centroids along a Morton (Z-order)
+          curve.
+        * ``"rcm"``: reverse Cuthill-McKee ordering of the face connectivity,
+          minimizing the bandwidth of the face face connectivity.
+
+        Nodes and edges are then numbered in order of their first occurrence in
+        the reordered faces, so that neighboring faces refer to nearby nodes
+        and edges. Faces that are close in space end up close in memory, which
+        benefits e.g. celltree queries, sparse matrix products, and plotting.
+
+        Parameters
+        ----------
+        method: str, default "hilbert"
+            One of "hilbert", "morton", "rcm".
+
+        Returns
+        -------
+        reordered: Ugrid2d
+        indexes: dict
+            Dictionary with keys node dimension, edge dimension, face dimension
+            and values their respective permutation: ``reordered`` element
+            ``i`` is the original element ``index[i]``. Data can be reordered
+            with ``obj.isel(indexes)``.
+        """
+        if method in CURVES:
+            face_order = curve_order(self.centroids, method)
+        elif method == "rcm":
+            face_order = reverse_cuthill_mckee(
+                graph=self.face_face_connectivity,
+                symmetric_mode=True,
+            ).astype(IntDType)
+        else:
+            raise ValueError(
+                'method should be one of "hilbert", "morton", "rcm". '
+                f"Received: {method}"
+            )
+
+        faces = self.face_node_connectivity[face_order]
+        node_order, node_inverse = connectivity.first_occurrence_order(
+            faces, self.n_node, self.fill_value
+        )
+        new_faces = faces.copy()
+        valid = faces != self.fill_value
+        new_faces[valid] = node_inverse[faces[valid]]
+
+        face_edges = self.face_edge_connectivity[face_order]
+        edge_order, _ = connectivity.first_occurrence_order(
+            face_edges, self.n_edge, self.fill_value
+        )
+        new_edges = node_inverse[self.edge_node_connectivity[edge_order]]
+
+        grid = self.__class__(
+            self.node_x[node_order],
+            self.node_y[node_order],
+            self.fill_value,
+            new_faces,
+            name=self.name,
+            edge_node_connectivity=new_edges,
+            indexes=self._indexes,
+            projected=self.projected,
+            crs=self.crs,
+            attrs=self._attrs,
+            # A permutation does not change the orientation of the faces.
+            check_orientation=False,
+        )
+        indexes = {
+            self.node_dimension: node_order,
+            self.edge_dimension: edge_order,
+            self.face_dimension: face_order,
+        }
+        return grid, indexes
+
     def refine_polygon(
         self,
         polygon: "shapely.geometry.Polygon",  # type: ignore # noqa
@@ -1672,23 +2179,38 @@ class Ugrid2d(AbstractUgrid):
         x_bounds: np.ndarray,
         y_bounds: np.ndarray,
     ) -> "Ugrid2d":
-        nx, _ = x_bounds.shape
-        ny, _ = y_bounds.shape
-        nfaces = ny * nx
+        """
+        Create a Ugrid2d topology from the bounds of a regular raster.
+
+        The node coordinates and the face node connectivity are not stored
+        explicitly: they are computed when first accessed. The centroids, the
+        area, the bounds, and the location of points are computed from the
+        raster vertices directly, without materializing the topology.
+
+        Parameters
+        ----------
+        x_bounds: ndarray of floats with shape ``(nx, 2)``
+        y_bounds: ndarray of floats with shape ``(ny, 2)``
+
+        Returns
+        -------
+        grid: Ugrid2d
+        """
         x = conversion.bounds_to_vertices(x_bounds)
         y = conversion.bounds_to_vertices(y_bounds)
-
-        # Compute all vertices, these are the ugrid nodes
-        node_y, node_x = (a.ravel() for a in np.meshgrid(y, x, indexing="ij"))
-        linear_index = np.arange(node_x.size, dtype=IntDType).reshape((ny + 1, nx + 1))
-        # Allocate face_node_connectivity
-        face_nodes = np.empty((nfaces, 4), dtype=IntDType)
-        # Set connectivity in counterclockwise manner
-        face_nodes[:, 0] = linear_index[:-1, 1:].ravel()  # upper right
-        face_nodes[:, 1] = linear_index[:-1, :-1].ravel()  # upper left
-        face_nodes[:, 2] = linear_index[1:, :-1].ravel()  # lower left
-        face_nodes[:, 3] = linear_index[1:, 1:].ravel()  # lower right
-        return Ugrid2d(node_x, node_y, -1, face_nodes)
+        topology = StructuredTopology(x, y)
+        grid = Ugrid2d(
+            ImplicitArray(topology.node_x, (topology.n_node,), FloatDType),
+            ImplicitArray(topology.node_y, (topology.n_node,), FloatDType),
+            -1,
+            ImplicitArray(
+                topology.face_node_connectivity, (topology.n_face, 4), IntDType
+            ),
+            lazy=True,
+            check_orientation=False,
+        )
+        grid._structured = topology
+        return grid
 
     @staticmethod
     def from_structured(